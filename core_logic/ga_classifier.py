@@ -0,0 +1,125 @@
+# core_logic/ga_classifier.py
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional
+from fitz import Document as FitzDocument, Rect # type: ignore
+
+from data_model.pdf_binder_index import PdfBinderIndex, PdfPageIndexEntry
+from data_model.structure_model import AnnotProperties, LegendProperties
+
+GA_SCORE_THRESHOLD = 0.5 # Pages scoring at least this are likely GAs
+
+# Score of each signal; a page's score is their sum, clamped to [0, 1]
+TITLE_GA_SCORE = 0.35
+TITLE_NOT_GA_SCORE = -0.25
+MARKUP_ANNOTS_SCORE = 0.45 # For MARKUP_ANNOTS_FOR_FULL_SCORE or more legend subject annotations
+MARKUP_ANNOTS_FOR_FULL_SCORE = 5
+LEGEND_TEMPLATES_SCORE = -0.5 # The legend page holds the template annotations, it is not a GA
+PAPER_SIZE_SCORES = dict(A0=0.2, A1=0.2, A2=0.1, A3=-0.1, A4=-0.2)
+
+# Title block words, matched whole and case insensitive
+GA_TITLE_PATTERN = re.compile(r"\b(GENERAL\s+ARRANGEMENT|G\.?A\.?|FLOOR\s+PLAN|SLAB\s+PLAN|SLAB\s+LAYOUT|LEVEL\s+\w+\s+PLAN|PLAN\s+(AT\s+)?LEVEL)\b", re.IGNORECASE)
+NOT_GA_TITLE_PATTERN = re.compile(r"\b(SECTIONS?|ELEVATIONS?|DETAILS?|SCHEDULES?|GENERAL\s+NOTES|COVER\s+SHEET|DRAWING\s+(LIST|REGISTER))\b", re.IGNORECASE)
+
+# Title blocks are along the bottom or the right edge of the sheet, as fractions of the page
+TITLE_BLOCK_BOTTOM_FROM = 0.8
+TITLE_BLOCK_RIGHT_FROM = 0.75
+
+# Fewer pages are read in this process, starting worker processes would take longer
+INLINE_PAGE_COUNT = 16
+
+
+@dataclass
+class GaPageScore:
+    page_index: int
+    score: float
+    reasons: List[str] = field(default_factory=list) # e.g. ["title 'GENERAL ARRANGEMENT'", "A1 sheet"]
+
+    @property
+    def is_likely_ga(self) -> bool:
+        return self.score >= GA_SCORE_THRESHOLD
+
+
+def legend_subjects() -> Dict[str, str]:
+    """The markup subjects of the legend (column_under, slab...), each with its template subject."""
+    legend = LegendProperties()
+    return {
+        getattr(legend, f_field.name).subject: getattr(legend, f_field.name).template_subject_name
+        for f_field in fields(legend) if isinstance(getattr(legend, f_field.name), AnnotProperties)
+    }
+
+
+def read_title_block_texts(pdf_path: str, page_indices: List[int]) -> Dict[int, str]:
+    """The text in the title block strips of each page. Runs in a worker process for large binders."""
+    texts = {}
+    document = FitzDocument(pdf_path)
+    try:
+        for page_index in page_indices:
+            page = document[page_index]
+            page_rect = page.rect
+            bottom_strip = Rect(page_rect.x0, page_rect.y0 + page_rect.height * TITLE_BLOCK_BOTTOM_FROM, page_rect.x1, page_rect.y1)
+            right_strip = Rect(page_rect.x0 + page_rect.width * TITLE_BLOCK_RIGHT_FROM, page_rect.y0, page_rect.x1, page_rect.y1)
+            texts[page_index] = page.get_text("text", clip=bottom_strip) + "\n" + page.get_text("text", clip=right_strip)
+    finally:
+        document.close()
+    return texts
+
+
+def score_page(entry: PdfPageIndexEntry, title_text: str, subjects: Dict[str, str]) -> GaPageScore:
+    score = 0.0
+    reasons = []
+
+    ga_title = GA_TITLE_PATTERN.search(title_text)
+    if ga_title:
+        score += TITLE_GA_SCORE
+        reasons.append(f"title '{' '.join(ga_title.group(0).split())}'")
+    else:
+        not_ga_title = NOT_GA_TITLE_PATTERN.search(title_text)
+        if not_ga_title:
+            score += TITLE_NOT_GA_SCORE
+            reasons.append(f"title '{' '.join(not_ga_title.group(0).split())}'")
+
+    template_count = sum(entry.annot_subjects.get(template_subject, 0) for template_subject in subjects.values())
+    markup_count = sum(entry.annot_subjects.get(subject, 0) for subject in subjects)
+    if template_count:
+        score += LEGEND_TEMPLATES_SCORE
+        reasons.append(f"{template_count} legend templates")
+    elif markup_count:
+        score += MARKUP_ANNOTS_SCORE * min(1.0, markup_count / MARKUP_ANNOTS_FOR_FULL_SCORE)
+        reasons.append(f"{markup_count} markups")
+
+    paper_size_score = PAPER_SIZE_SCORES.get(entry.paper_size_key, 0.0)
+    if paper_size_score:
+        score += paper_size_score
+        reasons.append(f"{entry.paper_size_key} sheet")
+
+    return GaPageScore(page_index=entry.page_index, score=round(min(1.0, max(0.0, score)), 2), reasons=reasons)
+
+
+def classify_binder_pages(pdf_path: str, max_workers: Optional[int] = None) -> List[GaPageScore]:
+    """
+    Scores how likely each page of a PDF binder is a GA, from its title block text, its legend
+    subject annotations and its paper size.
+
+    The annotations and paper sizes come from the binder's PdfBinderIndex; only the title
+    block text is read from the PDF, split across worker processes for large binders.
+    """
+    binder_index = PdfBinderIndex.for_binder(pdf_path)
+    page_indices = [entry.page_index for entry in binder_index.pages]
+
+    if len(page_indices) <= INLINE_PAGE_COUNT:
+        title_texts = read_title_block_texts(pdf_path, page_indices)
+    else:
+        max_workers = max_workers or max(1, min(8, (os.cpu_count() or 2) - 1))
+        # Contiguous chunks, so each worker opens the binder once and reads neighbouring pages
+        chunk_size = -(-len(page_indices) // (max_workers * 2))
+        chunks = [page_indices[i:i + chunk_size] for i in range(0, len(page_indices), chunk_size)]
+        title_texts = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for chunk_texts in pool.map(read_title_block_texts, [pdf_path] * len(chunks), chunks):
+                title_texts.update(chunk_texts)
+
+    subjects = legend_subjects()
+    return [score_page(entry, title_texts.get(entry.page_index, ""), subjects) for entry in binder_index.pages]
@@ -5,6 +5,9 @@ from typing import List, Dict, Any, Tuple
 from fitz import Document as FitzDocument, Page as FitzPage # type: ignore
 
 from data_model.pdf_properties import PdfPageProperties
+from data_model.pdf_binder_index import PdfBinderIndex
+from data_model.lazy_pdf import LazyPdfDocument
+from core_logic.ga_classifier import GaPageScore, classify_binder_pages
 from data_model.floor_data import FloorData
 from data_model.structure_model import StructureModel, GaPage # For type hinting if needed
 
@@ -24,18 +27,25 @@ class PDFProcessor:
             return created_floor_data_list
 
         try:
-            doc: FitzDocument = FitzDocument(pdf_binder_path)
+            # Page sizes come from the binder's index, the binder is only read if it changed
+            binder_index = PdfBinderIndex.for_binder(pdf_binder_path)
         except Exception as e:
             print(f"Error opening PDF binder '{pdf_binder_path}': {e}")
             return created_floor_data_list
 
-        for i, fitz_page in enumerate(doc):
+        # The floors keep their GA pages, loaded when first used
+        doc = self.structure_model.pdf_document
+        if not (isinstance(doc, LazyPdfDocument) and doc.path == os.path.abspath(pdf_binder_path)):
+            doc = LazyPdfDocument(pdf_binder_path)
+
+        for i in range(binder_index.page_count):
             page_num = i + 1
+            fitz_page = doc.page(i)
             # Create PdfPageProperties for this page
             # Scale and paper size might come from GUI settings or be defaults
-            pdf_props = PdfPageProperties(
-                page=fitz_page, 
-                page_index=i,
+            pdf_props = binder_index.page_properties(
+                i,
+                page=fitz_page,
                 page_name=f"BinderPage_{page_num}", # Default name
                 drawing_scale=self.structure_model.gui_data.drawing_scale_1_to,
                 paper_size_key='A1' # Or from GUI settings
@@ -66,7 +76,29 @@ class PDFProcessor:
             )
             created_floor_data_list.append(fd)
             
-        doc.close()
         print(f"Processed {len(created_floor_data_list)} pages from PDF binder '{pdf_binder_path}'.")
         return created_floor_data_list
 
+    def detect_ga_pages(self, select_likely_gas: bool = True) -> List[GaPageScore]:
+        """
+        Scores each page of the active PDF binder as a likely GA, keeps the scores on its
+        ModelPage and, with `select_likely_gas`, selects the likely GAs. Pages already
+        selected by hand stay selected.
+        """
+        pdf_document = self.structure_model.pdf_document
+        if not pdf_document:
+            print("No PDF binder loaded to detect GA pages in.")
+            return []
+
+        scores = classify_binder_pages(os.path.abspath(pdf_document.name))
+        scores_by_index = {page_score.page_index: page_score for page_score in scores}
+        for model_page in self.structure_model.all_pdf_pages:
+            page_score = scores_by_index.get(model_page.page_properties.page_index) if model_page.page_properties else None
+            if page_score is None:
+                continue
+            model_page.ga_score = page_score.score
+            model_page.ga_score_reasons = page_score.reasons
+            if select_likely_gas and page_score.is_likely_ga:
+                model_page.is_selected_ga = True
+        print(f"Detected {sum(page_score.is_likely_ga for page_score in scores)} likely GA pages of {len(scores)} in '{pdf_document.name}'.")
+        return scores
@@ -8,6 +8,7 @@ import re
 from data_model.structure_model import StructureModel # StructureModel imports GUIData
 from data_model.floor_data import FloorsData # Import FloorsData
 from gui.gui_data import GUIData, SETTINGS_DEFAULT, PDF_BINDERS_DIR_NAME
+from core_logic.session_store import ProjectSessionStore
 
 if TYPE_CHECKING:
     from PyQt6.QtWidgets import QMessageBox # For type hinting parent
@@ -15,7 +16,9 @@ if TYPE_CHECKING:
 # --- Constants for directory names ---
 RAM_CONCEPT_DIR_NAME = "RAM_CONCEPT"
 PICKLED_DATA_DIR_NAME = "pickled_project_data"
-PICKLED_DATA_FILENAME = "project_session.pkl"
+PICKLED_DATA_FILENAME = "project_session.pkl" # Legacy whole-model pickle, read if there is no session store yet
+SESSION_STORE_FILENAME = "project_session.db"
+THUMBNAIL_CACHE_DIR_NAME = "thumbnails" # PDF page thumbnails, in PICKLED_DATA_DIR_NAME
 FILE_TEMPLATES_DIR_NAME = "file_templates"
 # PDF_BINDERS_DIR_NAME is imported from gui_data
 
@@ -23,6 +26,8 @@ class ProjectManager:
     def __init__(self, structure_model_instance: StructureModel, gui_parent=None):
         self.model = structure_model_instance # This is StructureModel instance
         self.gui_parent = gui_parent # For showing messages
+        self._session_store: Optional[ProjectSessionStore] = None
+        self._is_session_backed_up = False
 
     def _show_message(self, level: str, title: str, message: str):
         """Helper to show messages, ideally via GUI if parent is set."""
@@ -71,42 +76,67 @@ class ProjectManager:
             return None
         return os.path.join(self.model.gui_data.root_directory, PICKLED_DATA_DIR_NAME, PICKLED_DATA_FILENAME)    
 
+    def get_session_store_path(self) -> Optional[str]:
+        if not self.model.gui_data.root_directory:
+            return None
+        return os.path.join(self.model.gui_data.root_directory, PICKLED_DATA_DIR_NAME, SESSION_STORE_FILENAME)
+
+    def get_thumbnail_cache_path(self) -> Optional[str]:
+        if not self.model.gui_data.root_directory:
+            return None
+        return os.path.join(self.model.gui_data.root_directory, PICKLED_DATA_DIR_NAME, THUMBNAIL_CACHE_DIR_NAME)
+
+    def _get_session_store(self) -> Optional[ProjectSessionStore]:
+        """The store of the current root directory; kept between saves, as it knows what was last saved."""
+        session_path = self.get_session_store_path()
+        if not session_path:
+            return None
+        if self._session_store is None or self._session_store.path != session_path:
+            self._session_store = ProjectSessionStore(session_path)
+            self._is_session_backed_up = False
+        return self._session_store
+
     def save_project_data(self) -> bool:
-        pickle_path = self.get_pickle_data_path()
-        if not pickle_path:
+        session_store = self._get_session_store()
+        if not session_store:
             self._show_message("warning", "Save Error", "Project root directory not set. Cannot save.")
             return False
 
-        pickle_dir = os.path.dirname(pickle_path)
-        if not os.path.exists(pickle_dir):
+        session_dir = os.path.dirname(session_store.path)
+        if not os.path.exists(session_dir):
             try:
-                os.makedirs(pickle_dir)
+                os.makedirs(session_dir)
             except Exception as e:
-                self._show_message("critical", "Save Error", f"Could not create directory for project data:\n{pickle_dir}\nError: {e}")
+                self._show_message("critical", "Save Error", f"Could not create directory for project data:\n{session_dir}\nError: {e}")
                 return False
 
-        if os.path.exists(pickle_path):
-            self.backup_project_file(self.model.gui_data.root_directory, pickle_path, "project_session_autosave")
+        # One backup per session rather than per save, the store only rewrites what changed
+        if session_store.exists() and not self._is_session_backed_up:
+            self.backup_project_file(self.model.gui_data.root_directory, session_store.path, "project_session_autosave")
+            self._is_session_backed_up = True
 
         try:
             # Ensure included_files in gui_data is up-to-date before saving
             self.model.update_gui_included_files_from_floors()
-            
-            with open(pickle_path, 'wb') as f:
-                pickle.dump(self.model, f) # self.model is StructureModel, which contains GUIData
-            print(f"Project data saved to '{pickle_path}'.")
+
+            n_written = session_store.save(self.model)
+            print(f"Project data saved to '{session_store.path}' ({n_written} changed).")
             return True
         except Exception as e:
-            self._show_message("critical", "Pickle Save Error", f"Could not save project data to:\n{pickle_path}\nError: {e}")
+            self._show_message("critical", "Save Error", f"Could not save project data to:\n{session_store.path}\nError: {e}")
             return False
 
     def load_project_data(self) -> Tuple[bool, Optional[StructureModel]]:
         pickle_path = self.get_pickle_data_path()
+        session_store = self._get_session_store()
         
         current_root_dir_from_gui = None
         if self.model and self.model.gui_data and self.model.gui_data.root_directory:
             current_root_dir_from_gui = self.model.gui_data.root_directory
 
+        is_session_stored = bool(session_store and session_store.exists())
+        if is_session_stored:
+            pickle_path = session_store.path
         if not pickle_path or not os.path.exists(pickle_path):
             print(f"No project data file found at '{pickle_path}'. Starting with defaults for current root.")    
             # Create a new StructureModel with default GUIData, preserving current root if available
@@ -119,8 +149,12 @@ class ProjectManager:
             return False, new_model
 
         try:
-            with open(pickle_path, 'rb') as f:
-                loaded_model: StructureModel = pickle.load(f)
+            if is_session_stored:
+                loaded_model: StructureModel = session_store.load()
+            else:
+                # Projects saved before the session store; the next save writes the store
+                with open(pickle_path, 'rb') as f:
+                    loaded_model: StructureModel = pickle.load(f)
 
             if not isinstance(loaded_model, StructureModel):
                 raise TypeError("Loaded data is not a compatible StructureModel instance.")
@@ -156,8 +190,10 @@ class ProjectManager:
                  loaded_gui_data_dict['ROOT_DIRECTORY'] = current_root_dir_from_gui
 
 
-            # Re-initialize gui_data from the potentially merged dictionary
-            loaded_model.gui_data = GUIData.from_dict(loaded_gui_data_dict)
+            # Re-initialize gui_data from the potentially merged dictionary; kept if unchanged, so it is not saved again
+            merged_gui_data = GUIData.from_dict(loaded_gui_data_dict)
+            if merged_gui_data != loaded_model.gui_data:
+                loaded_model.gui_data = merged_gui_data
             
             # Ensure floors_data and its parent links are correctly set up
             if loaded_model.floors_data is None:
@@ -178,7 +214,9 @@ class ProjectManager:
             # Synchronize FloorData.is_included with gui_data.included_files (gui_data is source of truth after load)
             model_included_ram_names = set(loaded_model.gui_data.included_files or [])
             for fd_obj in loaded_model.floors_data.floors.values():
-                setattr(fd_obj, 'is_included', fd_obj.ram_model_name in model_included_ram_names)
+                is_included = fd_obj.ram_model_name in model_included_ram_names
+                if getattr(fd_obj, 'is_included', None) != is_included: # Only real changes mark the floor dirty
+                    setattr(fd_obj, 'is_included', is_included)
 
             # The StructureModel.__setstate__ will handle reloading the PDF document
             # based on paths in the now-populated loaded_model.gui_data.
@@ -196,6 +234,7 @@ class ProjectManager:
             elif loaded_model.pdf_document: # If no valid path but doc exists, clear it
                 loaded_model.pdf_document = None
                 loaded_model.all_pdf_pages.clear()
+                loaded_model.mark_dirty()
 
 
             print(f"Project data loaded from '{pickle_path}'.")
@@ -441,4 +480,5 @@ class ProjectManager:
             if self.model.pdf_document: self.model.pdf_document.close()
             self.model.pdf_document = None 
             self.model.all_pdf_pages.clear()
+            self.model.mark_dirty()
             print("ProjectManager: Cleared PDF document in model as no active/valid PDF path.")
@@ -0,0 +1,259 @@
+# core_logic/session_store.py
+import hashlib
+import importlib
+import io
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from data_model.structure_model import StructureModel
+
+SESSION_STORE_FORMAT_VERSION = 1
+
+# Entity kinds, each stored as one row keyed by (kind, key)
+MODEL_KIND = "model"
+SETTINGS_KIND = "settings"
+FLOORS_KIND = "floors"
+FLOOR_KIND = "floor"
+PAGE_KIND = "page"
+
+EntityKey = Tuple[str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    type_name TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _type_name(obj) -> str:
+    return f"{type(obj).__module__}:{type(obj).__qualname__}"
+
+
+def _resolve_type(type_name: str) -> type:
+    module_name, qualified_name = type_name.split(":")
+    resolved = importlib.import_module(module_name)
+    for name in qualified_name.split("."):
+        resolved = getattr(resolved, name)
+    return resolved
+
+
+def _get_state(obj) -> dict:
+    """What pickle would store for `obj`, e.g. FloorData without its live fitz page or parent links."""
+    return dict(obj.__getstate__())
+
+
+def _set_state(obj, state: dict):
+    if hasattr(type(obj), "__setstate__"):
+        obj.__setstate__(state)
+    else:
+        obj.__dict__.update(state)
+
+
+def _entity_ref(kind: str, key: str):
+    """Stands for a reference to another stored entity; `_EntityUnpickler` resolves it."""
+    raise RuntimeError("Project session entity references are resolved by _EntityUnpickler")
+
+
+class _EntityPickler(pickle.Pickler):
+    """Pickles references to other stored entities (a wall's level_over floor, a page's model...) as their key."""
+
+    def __init__(self, file, entity_keys: Dict[int, EntityKey]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.entity_keys = entity_keys
+
+    def reducer_override(self, obj):
+        # Unlike persistent_id, not called for str, int, list, dict... which most of the state is
+        key = self.entity_keys.get(id(obj))
+        if key is None:
+            return NotImplemented
+        return _entity_ref, key
+
+
+class _EntityUnpickler(pickle.Unpickler):
+    def __init__(self, file, entities: Dict[EntityKey, object]):
+        super().__init__(file)
+        self.entities = entities
+
+    def find_class(self, module_name: str, name: str):
+        if module_name == __name__ and name == _entity_ref.__name__:
+            return lambda kind, key: self.entities[(kind, key)]
+        return super().find_class(module_name, name)
+
+
+class ProjectSessionStore:
+    """
+    Stores a StructureModel in a SQLite file with one row per entity: the model itself, its
+    GUIData settings, the floor collection, each FloorData and each ModelPage.
+
+    `save` only pickles the entities marked dirty (see DirtyTracked) since the last save or load,
+    each on its own with references to other entities stored as their key, and writes those whose
+    pickle changed in one transaction. Editing one floor of a project with hundreds of floors and
+    pages pickles and writes one row, instead of re-pickling and rewriting the whole model.
+
+        store = ProjectSessionStore(session_path)
+        if store.exists():
+            model = store.load()
+        ...
+        store.save(model)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Digest of each row as last saved or loaded, so entities marked dirty but unchanged are not rewritten
+        self._saved: Dict[EntityKey, bytes] = {}
+        # Member keys of the collection rows (model pages, floors) as last saved or loaded
+        self._saved_members: Dict[EntityKey, List[str]] = {}
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    @staticmethod
+    def _entities(model: "StructureModel") -> Dict[EntityKey, object]:
+        """Every stored entity of `model`, in save order."""
+        entities: Dict[EntityKey, object] = {
+            (MODEL_KIND, ""): model,
+            (SETTINGS_KIND, ""): model.gui_data,
+        }
+        if model.floors_data is not None:
+            entities[(FLOORS_KIND, "")] = model.floors_data
+            for floor_key, floor in model.floors_data.floors.items():
+                entities[(FLOOR_KIND, floor_key)] = floor
+        for position, page in enumerate(model.all_pdf_pages):
+            entities[(PAGE_KIND, str(position))] = page
+        return entities
+
+    @staticmethod
+    def _members(model: "StructureModel") -> Dict[EntityKey, List[str]]:
+        """
+        The member keys of the collection rows. Collections are stored as the order of their members,
+        which are rows of their own, so adding or removing a floor rewrites the floor order rather
+        than every floor.
+        """
+        members = {(MODEL_KIND, ""): [str(position) for position in range(len(model.all_pdf_pages))]}
+        if model.floors_data is not None:
+            members[(FLOORS_KIND, "")] = list(model.floors_data.floors)
+        return members
+
+    def dirty_entities(self, model: "StructureModel") -> Dict[EntityKey, Tuple[str, bytes, bytes]]:
+        """The rows of `model` that differ from the store, as (type_name, digest, data)."""
+        entities = self._entities(model)
+        entity_keys = {id(obj): key for key, obj in entities.items()}
+        members = self._members(model)
+
+        dirty = {}
+        for key, obj in entities.items():
+            is_marked_dirty = key not in self._saved or obj.is_dirty or (key in members and members[key] != self._saved_members.get(key))
+            if not is_marked_dirty:
+                continue
+
+            state = _get_state(obj)
+            if key[0] == MODEL_KIND:
+                state.pop("gui_data", None)
+                state.pop("floors_data", None)
+                state["all_pdf_pages"] = members[key]
+            elif key[0] == FLOORS_KIND:
+                state["floors"] = members[key]
+
+            buffer = io.BytesIO()
+            _EntityPickler(buffer, entity_keys).dump(state)
+            data = buffer.getvalue()
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            # Fallback check, e.g. for a value set to what it was
+            if self._saved.get(key) != digest:
+                dirty[key] = (_type_name(obj), digest, data)
+        return dirty
+
+    def save(self, model: "StructureModel") -> int:
+        """Writes the entities of `model` that changed since the last save or load; returns how many rows were written or deleted."""
+        dirty = self.dirty_entities(model)
+        entities = self._entities(model)
+        current_keys = set(entities)
+        removed = [key for key in self._saved if key not in current_keys]
+
+        connection = self._connect()
+        try:
+            with connection:
+                if not self._saved:
+                    # First save of this store: drop rows a previous session left behind
+                    stored_keys = [tuple(row) for row in connection.execute("SELECT kind, key FROM entities")]
+                    removed = [key for key in stored_keys if key not in current_keys]
+                connection.executemany(
+                    "INSERT OR REPLACE INTO entities (kind, key, type_name, digest, data) VALUES (?, ?, ?, ?, ?)",
+                    [(kind, key, type_name, digest, data) for (kind, key), (type_name, digest, data) in dirty.items()],
+                )
+                connection.executemany("DELETE FROM entities WHERE kind = ? AND key = ?", removed)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                    [("format_version", str(SESSION_STORE_FORMAT_VERSION)), ("saved_at", datetime.now().isoformat(timespec="seconds"))],
+                )
+        finally:
+            connection.close()
+
+        for key, (type_name, digest, data) in dirty.items():
+            self._saved[key] = digest
+        for key in removed:
+            self._saved.pop(key, None)
+        self._saved_members = self._members(model)
+        for obj in entities.values():
+            obj.mark_clean()
+        return len(dirty) + len(removed)
+
+    def load(self) -> "StructureModel":
+        """
+        Rebuilds the StructureModel. Every entity is created first, so references between them
+        resolve to the same objects, then StructureModel.__setstate__ reloads the PDF and relinks
+        the floors as it does for an unpickled model.
+        """
+        connection = self._connect()
+        try:
+            version = connection.execute("SELECT value FROM meta WHERE name = 'format_version'").fetchone()
+            if version is not None and int(version[0]) != SESSION_STORE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported project session format {version[0]}, expected {SESSION_STORE_FORMAT_VERSION}")
+            rows = connection.execute("SELECT kind, key, type_name, digest, data FROM entities").fetchall()
+        finally:
+            connection.close()
+
+        entities: Dict[EntityKey, object] = {}
+        for kind, key, type_name, digest, data in rows:
+            cls = _resolve_type(type_name)
+            entities[(kind, key)] = cls.__new__(cls)
+        if (MODEL_KIND, "") not in entities:
+            raise ValueError(f"No model in project session '{self.path}'")
+
+        states = {(kind, key): _EntityUnpickler(io.BytesIO(data), entities).load() for kind, key, type_name, digest, data in rows}
+        for (kind, key), state in states.items():
+            if kind == FLOORS_KIND:
+                state["floors"] = {floor_key: entities[(FLOOR_KIND, floor_key)] for floor_key in state["floors"]}
+            elif kind == MODEL_KIND:
+                state["gui_data"] = entities.get((SETTINGS_KIND, ""))
+                state["floors_data"] = entities.get((FLOORS_KIND, ""))
+                state["all_pdf_pages"] = [entities[(PAGE_KIND, page_key)] for page_key in state["all_pdf_pages"]]
+                continue
+            _set_state(entities[(kind, key)], state)
+        # Last, as StructureModel.__setstate__ restores the PDF pages and relinks the floors
+        _set_state(entities[(MODEL_KIND, "")], states[(MODEL_KIND, "")])
+
+        self._saved = {(kind, key): digest for kind, key, type_name, digest, data in rows}
+        model = entities[(MODEL_KIND, "")]
+        self._saved_members = self._members(model)
+        for obj in entities.values():
+            obj.mark_clean()
+        return model
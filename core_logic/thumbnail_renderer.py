@@ -0,0 +1,133 @@
+# core_logic/thumbnail_renderer.py
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Set
+
+THUMBNAIL_DPI = 8 # An A1 sheet is about 260 x 190 px
+
+# Called with (pdf_path, page_index, png_path) as each thumbnail is ready, from a worker thread
+ThumbnailCallback = Callable[[str, int, str], None]
+
+# Binders open in a render worker process, each worker renders many pages of the same binder
+_worker_documents: Dict[tuple, object] = {}
+
+
+def thumbnail_path(cache_dir: str, binder_hash: str, page_index: int, dpi: int = THUMBNAIL_DPI) -> str:
+    return os.path.join(cache_dir, f"{binder_hash}_{page_index}_{dpi}dpi.png")
+
+
+def _render_page_png(pdf_path: str, page_index: int, dpi: int, png_path: str) -> str:
+    """Runs in a render worker process."""
+    from fitz import Document as FitzDocument # type: ignore
+
+    key = (pdf_path, os.path.getmtime(pdf_path))
+    document = _worker_documents.get(key)
+    if document is None:
+        document = _worker_documents[key] = FitzDocument(pdf_path)
+    pixmap = document[page_index].get_pixmap(dpi=dpi)
+    # Written aside and renamed, so a half written file is never taken from the cache
+    temp_path = f"{png_path}.{os.getpid()}.tmp"
+    pixmap.save(temp_path, output="png")
+    os.replace(temp_path, png_path)
+    return png_path
+
+
+class ThumbnailRenderer:
+    """
+    Renders PDF binder pages to PNG thumbnails in a pool of worker processes, without blocking
+    the caller, and caches them in `cache_dir` keyed by (binder content hash, page index, DPI),
+    so reopening a project shows its thumbnails without rendering them again.
+
+    `render_binder` takes the binder's content hash from its PdfBinderIndex, read by the caller as
+    the binder is not opened outside the worker processes, and returns at once; `on_thumbnail` is called from a worker thread as each
+    thumbnail is ready, cached ones first. Rendering another binder, `cancel` or `shutdown`
+    drops the pages not rendered yet.
+
+        renderer = ThumbnailRenderer(cache_dir, on_thumbnail)
+        renderer.render_binder(pdf_path, binder_index.content_hash, range(binder_index.page_count))
+        ...
+        renderer.shutdown()
+    """
+
+    def __init__(self, cache_dir: str, on_thumbnail: ThumbnailCallback, dpi: int = THUMBNAIL_DPI, max_workers: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.on_thumbnail = on_thumbnail
+        self.dpi = dpi
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+        # Reentrant, as a cancelled or finished future runs its callback in the thread adding or cancelling it
+        self._lock = threading.RLock()
+        self._generation = 0 # Bumped by each render_binder and cancel, to drop stale results
+        self._futures: Set[Future] = set()
+        # Finds the cached thumbnails, then queues the rest, one binder at a time
+        self._scheduler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+
+    def render_binder(self, pdf_path: str, binder_hash: str, page_indices):
+        with self._lock:
+            self._cancel_pending()
+            generation = self._generation
+        self._scheduler.submit(self._schedule_binder, generation, pdf_path, binder_hash, list(page_indices))
+
+    def cancel(self):
+        with self._lock:
+            self._cancel_pending()
+
+    def shutdown(self):
+        self.cancel()
+        self._scheduler.shutdown(wait=False, cancel_futures=True)
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
+
+    def _cancel_pending(self):
+        self._generation += 1
+        futures, self._futures = self._futures, set()
+        for future in futures:
+            future.cancel()
+
+    def _schedule_binder(self, generation: int, pdf_path: str, binder_hash: str, page_indices: List[int]):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except Exception as e:
+            print(f"Warning: Could not render thumbnails of '{pdf_path}': {e}")
+            return
+
+        to_render = []
+        for page_index in page_indices:
+            if generation != self._generation:
+                return
+            png_path = thumbnail_path(self.cache_dir, binder_hash, page_index, self.dpi)
+            if os.path.exists(png_path):
+                self.on_thumbnail(pdf_path, page_index, png_path)
+            else:
+                to_render.append((page_index, png_path))
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            if to_render and self._render_pool is None:
+                self._render_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            for page_index, png_path in to_render:
+                future = self._render_pool.submit(_render_page_png, pdf_path, page_index, self.dpi, png_path)
+                self._futures.add(future)
+                future.add_done_callback(lambda future, page_index=page_index: self._rendered(generation, pdf_path, page_index, future))
+
+    def _rendered(self, generation: int, pdf_path: str, page_index: int, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+        if future.cancelled() or generation != self._generation:
+            return
+        try:
+            png_path = future.result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. on a corrupt page); the next binder gets a new pool
+            print(f"Warning: Thumbnail rendering stopped at page {page_index + 1} of '{pdf_path}': {e}")
+            with self._lock:
+                self._render_pool = None
+            return
+        except Exception as e:
+            print(f"Warning: Could not render page {page_index + 1} of '{pdf_path}': {e}")
+            return
+        self.on_thumbnail(pdf_path, page_index, png_path)
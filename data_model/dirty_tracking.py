@@ -0,0 +1,47 @@
+# data_model/dirty_tracking.py
+from typing import ClassVar, FrozenSet, Tuple
+
+
+class DirtyTracked:
+    """
+    Marks an object dirty whenever one of its attributes is set, so ProjectSessionStore only
+    pickles the entities edited since the last save or load instead of every entity of the project.
+
+    New objects, and objects unpickled from a legacy project file, start dirty. In-place edits
+    (e.g. `gui_data.included_files.clear()`) are not seen; call `mark_dirty()` after them.
+    """
+    # Live objects and parent links, not pickled, so setting them does not make the object dirty
+    _untracked_attributes: ClassVar[FrozenSet[str]] = frozenset()
+    # Attributes holding DirtyTracked objects pickled with this one, e.g. a ModelPage's page_properties
+    _tracked_children: ClassVar[Tuple[str, ...]] = ()
+    _is_dirty = True
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name not in self._untracked_attributes and name != '_is_dirty':
+            object.__setattr__(self, '_is_dirty', True)
+
+    @property
+    def is_dirty(self) -> bool:
+        if self._is_dirty:
+            return True
+        for name in self._tracked_children:
+            child = getattr(self, name, None)
+            if isinstance(child, DirtyTracked) and child.is_dirty:
+                return True
+        return False
+
+    def mark_dirty(self):
+        object.__setattr__(self, '_is_dirty', True)
+
+    def mark_clean(self):
+        object.__setattr__(self, '_is_dirty', False)
+        for name in self._tracked_children:
+            child = getattr(self, name, None)
+            if isinstance(child, DirtyTracked):
+                child.mark_clean()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_is_dirty', None)
+        return state
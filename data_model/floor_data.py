@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Dict, Any, Optional
 from fitz import Page as FitzPage # type: ignore
 
+from .dirty_tracking import DirtyTracked
+
 if TYPE_CHECKING:
     from .structure_model import StructureModel
     from .slab_data import SlabMeshData
@@ -11,7 +13,9 @@ if TYPE_CHECKING:
     from .column_data import ColumnsData
 
 @dataclass
-class FloorData:
+class FloorData(DirtyTracked):
+    _untracked_attributes = frozenset({'ga_page_fitz', 'structure_model', 'floors_data_parent'})
+
     floor_name: str
     floor_index: int | None = None
 
@@ -75,7 +79,7 @@ class FloorData:
             self.listpath = new_absolute_cpt_path
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         if self.ga_page_fitz is not None and state.get('_ga_page_index') is None:
             try:
                 state['_ga_page_index'] = self.ga_page_fitz.number # type: ignore
@@ -101,7 +105,9 @@ class FloorData:
 # The rest of the file (FloorsData class) remains unchanged.
 
 @dataclass
-class FloorsData:
+class FloorsData(DirtyTracked):
+    _untracked_attributes = frozenset({'model'})
+
     model: 'StructureModel | None' = field(default=None, repr=False)
     floors: Dict[str, FloorData] = field(default_factory=dict) 
 
@@ -111,6 +117,7 @@ class FloorsData:
         floor_data_instance.floors_data_parent = self
         floor_data_instance.structure_model = self.model
         self.floors[floor_data_instance.floor_name] = floor_data_instance
+        self.mark_dirty()
 
     def get_floor_by_name(self, name: str) -> FloorData | None:
         return self.floors.get(name)
@@ -135,11 +142,13 @@ class FloorsData:
     def remove_floor(self, floor_name: str):
         if floor_name in self.floors:
             del self.floors[floor_name]
+            self.mark_dirty()
         else:
             print(f"Warning: Floor with name '{floor_name}' not found for removal.")
 
     def clear_floors(self):
         self.floors.clear()
+        self.mark_dirty()
 
     def re_index_floors(self):
         ordered_floors = self.get_ordered_floors()
@@ -0,0 +1,101 @@
+import os
+from fitz import Document as FitzDocument, Page as FitzPage # type: ignore
+
+
+class LazyPdfDocument:
+    """
+    Stands in for the fitz Document of a PDF binder, opening it on first use.
+
+    StructureModel.__setstate__ restores a project session with one of these and LazyPdfPage
+    handles for its pages, so a session opens without reading the binder; only the pages the
+    user touches are loaded. Attribute access, indexing, iteration and len() go to the opened
+    Document.
+    """
+    __slots__ = ('path', '_document', '_pages')
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self._document: FitzDocument | None = None
+        self._pages: dict[int, 'LazyPdfPage'] = {}
+
+    @property
+    def is_open(self) -> bool:
+        return self._document is not None
+
+    @property
+    def name(self) -> str:
+        # Compared with the binder path on load, without opening the binder
+        return self.path
+
+    def resolve(self) -> FitzDocument:
+        if self._document is None:
+            self._document = FitzDocument(self.path)
+        return self._document
+
+    def page(self, index: int) -> 'LazyPdfPage':
+        """A handle to page `index`, loaded on first use; the same handle for the same page."""
+        page = self._pages.get(index)
+        if page is None:
+            page = self._pages[index] = LazyPdfPage(self, index)
+        return page
+
+    def close(self):
+        if self._document is not None:
+            self._document.close()
+            self._document = None
+        for page in self._pages.values():
+            page._page = None
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __getitem__(self, index: int) -> FitzPage:
+        return self.resolve()[index]
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __bool__(self) -> bool:
+        # The binder was found when the session was restored; checking for it does not open it
+        return True
+
+    def __repr__(self) -> str:
+        return f"<LazyPdfDocument '{self.path}' {'open' if self.is_open else 'not opened'}>"
+
+
+class LazyPdfPage:
+    """Stands in for a fitz Page of a LazyPdfDocument, loading it on first use. `number` does not load it."""
+    __slots__ = ('document', 'number', '_page')
+
+    def __init__(self, document: LazyPdfDocument, number: int):
+        self.document = document
+        self.number = number
+        self._page: FitzPage | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._page is not None
+
+    def resolve(self) -> FitzPage:
+        if self._page is None:
+            document = self.document.resolve()
+            if not 0 <= self.number < document.page_count:
+                raise IndexError(f"Page {self.number} is out of range of '{self.document.path}', which has {document.page_count} pages")
+            self._page = document[self.number]
+        return self._page
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __bool__(self) -> bool:
+        return True
+
+    def __repr__(self) -> str:
+        return f"<LazyPdfPage {self.number} of '{self.document.path}' {'loaded' if self.is_loaded else 'not loaded'}>"
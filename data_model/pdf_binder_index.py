@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field, asdict
+from collections import Counter
+from typing import Optional
+import hashlib
+import json
+import os
+import threading
+from fitz import Document as FitzDocument # type: ignore
+
+from .pdf_properties import PdfPageProperties
+
+PDF_BINDER_INDEX_VERSION = 1
+PDF_BINDER_INDEX_SUFFIX = '.index.json' # Binder.pdf -> Binder.pdf.index.json, next to the binder
+
+POINTS_TO_MM = 25.4 / 72
+# ISO A sizes (short, long side) in mm, for the paper size detected from the page bounds
+ISO_A_SIZES_MM = dict(
+    A0=(841, 1189),
+    A1=(594, 841),
+    A2=(420, 594),
+    A3=(297, 420),
+    A4=(210, 297),
+)
+PAPER_SIZE_TOLERANCE_MM = 5.0
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def detect_paper_size(width: float, height: float) -> Optional[str]:
+    """The ISO A size of a page `width` x `height` points, either orientation, or None."""
+    short_mm, long_mm = sorted((width * POINTS_TO_MM, height * POINTS_TO_MM))
+    for paper_size_key, (short_side, long_side) in ISO_A_SIZES_MM.items():
+        if abs(short_mm - short_side) <= PAPER_SIZE_TOLERANCE_MM and abs(long_mm - long_side) <= PAPER_SIZE_TOLERANCE_MM:
+            return paper_size_key
+    return None
+
+
+def hash_pdf_file(pdf_path: str) -> str:
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(pdf_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+@dataclass
+class PdfPageIndexEntry:
+    page_index: int
+    width: float # page.bound(), in points
+    height: float
+    rotation: int
+    paper_size_key: Optional[str] # Detected from the bounds, None if not an ISO A size
+    annot_count: int
+    annot_subjects: dict[str, int] = field(default_factory=dict) # e.g. {'column_over': 12}
+
+
+@dataclass
+class PdfBinderIndex:
+    """
+    Page metadata of a PDF binder, saved in a sidecar file next to it and keyed by the binder's
+    content hash, so reopening an unchanged binder reads the sidecar instead of loading and
+    measuring every page.
+
+    The sidecar is trusted while the binder's size and modification time are unchanged; if only
+    the modification time changed, the content hash decides.
+
+        binder_index = PdfBinderIndex.for_binder(pdf_path)
+        page_properties = binder_index.page_properties(3, drawing_scale=100.0)
+    """
+    content_hash: str
+    file_size: int
+    mtime_ns: int
+    page_count: int
+    pages: list[PdfPageIndexEntry] = field(default_factory=list)
+
+    @staticmethod
+    def sidecar_path(pdf_path: str) -> str:
+        return pdf_path + PDF_BINDER_INDEX_SUFFIX
+
+    @classmethod
+    def build(cls, pdf_path: str, document: FitzDocument | None = None, content_hash: str | None = None) -> 'PdfBinderIndex':
+        """Measures every page of the binder; `document` is the binder already open, if it is."""
+        stat = os.stat(pdf_path)
+        owns_document = document is None
+        if owns_document:
+            document = FitzDocument(pdf_path)
+        try:
+            pages = []
+            for i, page in enumerate(document):
+                bound = page.bound()
+                subjects = Counter()
+                annot_count = 0
+                for annot in page.annots():
+                    annot_count += 1
+                    subject = annot.info.get('subject')
+                    if subject:
+                        subjects[subject] += 1
+                pages.append(PdfPageIndexEntry(
+                    page_index=i,
+                    width=float(bound.width),
+                    height=float(bound.height),
+                    rotation=int(page.rotation),
+                    paper_size_key=detect_paper_size(bound.width, bound.height),
+                    annot_count=annot_count,
+                    annot_subjects=dict(subjects),
+                ))
+        finally:
+            if owns_document:
+                document.close()
+
+        return cls(
+            content_hash=content_hash or hash_pdf_file(pdf_path),
+            file_size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            page_count=len(pages),
+            pages=pages,
+        )
+
+    @classmethod
+    def read(cls, pdf_path: str) -> Optional['PdfBinderIndex']:
+        """The sidecar index of the binder, or None if there is none or the binder changed since."""
+        sidecar_path = cls.sidecar_path(pdf_path)
+        if not os.path.exists(sidecar_path):
+            return None
+        try:
+            with open(sidecar_path, 'r') as file:
+                data = json.load(file)
+            if data.get('version') != PDF_BINDER_INDEX_VERSION:
+                return None
+            binder_index = cls(
+                content_hash=data['content_hash'],
+                file_size=data['file_size'],
+                mtime_ns=data['mtime_ns'],
+                page_count=data['page_count'],
+                pages=[PdfPageIndexEntry(**page) for page in data['pages']],
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Warning: Could not read PDF binder index '{sidecar_path}': {e}")
+            return None
+
+        stat = os.stat(pdf_path)
+        if stat.st_size != binder_index.file_size:
+            return None
+        if stat.st_mtime_ns != binder_index.mtime_ns:
+            # Copied or touched; the same binder if its content is the same
+            if hash_pdf_file(pdf_path) != binder_index.content_hash:
+                return None
+            binder_index.mtime_ns = stat.st_mtime_ns
+            binder_index.write(pdf_path)
+        return binder_index
+
+    def write(self, pdf_path: str):
+        sidecar_path = self.sidecar_path(pdf_path)
+        # Written aside and renamed, so a reader never sees a half written sidecar
+        temp_path = f"{sidecar_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w') as file:
+                json.dump(dict(version=PDF_BINDER_INDEX_VERSION, **asdict(self)), file)
+            os.replace(temp_path, sidecar_path)
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            # e.g. a read-only binder folder; the binder is measured again next time
+            print(f"Warning: Could not write PDF binder index '{sidecar_path}': {e}")
+
+    @classmethod
+    def for_binder(cls, pdf_path: str, document: FitzDocument | None = None) -> 'PdfBinderIndex':
+        """The binder's index from its sidecar, or built and saved if the sidecar is missing or stale."""
+        binder_index = cls.read(pdf_path)
+        if binder_index is None:
+            binder_index = cls.build(pdf_path, document)
+            binder_index.write(pdf_path)
+            print(f"Indexed {binder_index.page_count} pages of PDF binder '{pdf_path}'.")
+        return binder_index
+
+    def page_properties(self, page_index: int, drawing_scale: float, paper_size_key: str = 'A1', page_name: str | None = None, page=None) -> PdfPageProperties:
+        """PdfPageProperties of a page from its indexed bounds; `page` (e.g. a LazyPdfPage) is attached without being measured."""
+        entry = self.pages[page_index]
+        page_properties = PdfPageProperties(
+            page_index=page_index,
+            page_name=page_name,
+            drawing_scale=drawing_scale,
+            paper_size_key=paper_size_key,
+            page_bound_width=entry.width,
+            page_bound_height=entry.height,
+        )
+        page_properties.page = page
+        return page_properties
@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 from typing import Optional
 from fitz import Page, Rect # type: ignore
 
+from .dirty_tracking import DirtyTracked
+
 A1_SIZE = dict(
     width=594,  # mm
     height=841, # mm
@@ -12,7 +14,9 @@ PAPER_SIZES = dict(
 )
 
 @dataclass(kw_only=True)
-class PdfPageProperties:
+class PdfPageProperties(DirtyTracked):
+    _untracked_attributes = frozenset({'page'})
+
     page: Page | None = field(default=None, repr=False) # To be handled for pickling
     paper_size_key: str = 'A1'
     drawing_scale: float = 100.0
@@ -38,7 +42,7 @@ class PdfPageProperties:
             self.page_index = self.page.number # type: ignore
 
     def _calculate_derived_properties(self):
-        """Calculates dimensions and conversion factors if self.page is set."""
+        """Calculates dimensions and conversion factors from self.page, or from the page bounds if given without a page (e.g. from a PdfBinderIndex)."""
         if self.paper_size_key in PAPER_SIZES:
             self.drawing_width_mm = float(PAPER_SIZES[self.paper_size_key]['width'])
             self.drawing_height_mm = float(PAPER_SIZES[self.paper_size_key]['height'])
@@ -52,7 +56,8 @@ class PdfPageProperties:
             self.page_bound_width = float(page_bound.width)
             self.page_bound_height = float(page_bound.height)
 
-            if self.page_bound_width > 0 and self.page_bound_height > 0 and \
+        if self.page or self.page_bound_width is not None:
+            if self.page_bound_width and self.page_bound_height and \
                self.drawing_width_mm is not None and self.drawing_height_mm is not None:
                 self.annot_x_to_mm_factor = self.drawing_scale * (self.drawing_width_mm / self.page_bound_width)
                 self.annot_y_to_mm_factor = self.drawing_scale * (self.drawing_height_mm / self.page_bound_height)
@@ -70,7 +75,7 @@ class PdfPageProperties:
 
     def __getstate__(self):
         """Prepare the object for pickling."""
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         # Ensure page_index is stored if 'page' exists (should be handled by __post_init__)
         if self.page is not None and state.get('page_index') is None:
              state['page_index'] = self.page.number # type: ignore
@@ -15,6 +15,9 @@ else:
 
 from .pdf_properties import PdfPageProperties
 from .floor_data import FloorData, FloorsData
+from .lazy_pdf import LazyPdfDocument, LazyPdfPage
+from .pdf_binder_index import PdfBinderIndex
+from .dirty_tracking import DirtyTracked
 # Import GUIData and SETTINGS_DEFAULT from the correct location
 from gui.gui_data import GUIData, SETTINGS_DEFAULT
 
@@ -40,7 +43,10 @@ if TYPE_CHECKING:
 
 # In class ModelPage in structure_model.py:
 @dataclass(kw_only=True)
-class ModelPage:
+class ModelPage(DirtyTracked):
+    _untracked_attributes = frozenset({'page_fitz', 'structure_model'})
+    _tracked_children = ('page_properties',)
+
     page_fitz: FitzPage | None = field(default=None, repr=False)
     page_properties: Optional['PdfPageProperties'] = None
     structure_model: Optional['StructureModel'] = field(default=None, repr=False)
@@ -49,6 +55,9 @@ class ModelPage:
     # is_included_for_linking attribute is completely removed
     linked_cpt_floor_name: Optional[str] = None
     ga_number_display: Optional[str] = None
+    # From PDFProcessor.detect_ga_pages, None until detected
+    ga_score: Optional[float] = None
+    ga_score_reasons: List[str] = field(default_factory=list)
     
     # ... remove is_included_for_linking from __post_init__ etc. if it exists there.
 
@@ -68,7 +77,7 @@ class ModelPage:
             self.linked_cpt_floor_name = None
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         
         # Ensure PdfPageProperties handles its own Fitz page during its pickling
         if 'page_properties' in state and state['page_properties'] is not None:
@@ -133,7 +142,7 @@ class GaAnnot: # Not actively used but kept for structure
     pdf_layer: str | None = None
 
 @dataclass(kw_only=True)
-class AnnotProperties: # Used by LegendProperties
+class AnnotProperties(DirtyTracked): # Used by LegendProperties
     subject: str
     abbreviation: str
     template_annot_xref: int | None = None
@@ -143,7 +152,10 @@ class AnnotProperties: # Used by LegendProperties
         return f'{self.subject}_TEMPLATE[{self.abbreviation}]'
 
 @dataclass(kw_only=True)
-class LegendProperties:
+class LegendProperties(DirtyTracked):
+    _untracked_attributes = frozenset({'legend_page_fitz'})
+    _tracked_children = ('column_under', 'column_over', 'slab', 'wall_over', 'wall_under')
+
     legend_page_fitz: FitzPage | None = field(default=None, repr=False)
     _legend_page_index: Optional[int] = field(default=None, repr=False)
 
@@ -168,10 +180,17 @@ class LegendProperties:
             self._legend_page_index = None
 
 
-    def load_template_annots_from_legend_page(self):
+    def load_template_annots_from_legend_page(self, indexed_annot_subjects: Optional[Dict[str, int]] = None):
+        """`indexed_annot_subjects` are the legend page's subjects from the binder's PdfBinderIndex, if known; a page without templates is then not loaded."""
         if not self.legend_page_fitz:
             print("No legend page set to load template annotations from.")
             return
+        if indexed_annot_subjects is not None and not any(
+            getattr(self, f_field.name).template_subject_name in indexed_annot_subjects
+            for f_field in fields(self) if isinstance(getattr(self, f_field.name), AnnotProperties)
+        ):
+            print("Warning: No template annotations found on legend page.")
+            return
 
         for f_field in fields(self):
             if isinstance(getattr(self, f_field.name), AnnotProperties):
@@ -193,7 +212,7 @@ class LegendProperties:
     
     def __getstate__(self):
         """Prepare LegendProperties for pickling by removing live fitz.Page object."""
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         if self.legend_page_fitz is not None and state.get('_legend_page_index') is None:
             try:
                 state['_legend_page_index'] = self.legend_page_fitz.number # type: ignore
@@ -209,7 +228,10 @@ class LegendProperties:
 
 
 @dataclass(kw_only=True)
-class StructureModel:
+class StructureModel(DirtyTracked):
+    _untracked_attributes = frozenset({'pdf_document'})
+    _tracked_children = ('legend_properties',)
+
     gui_data: GUIData = field(default_factory=GUIData) # Now defaults to an empty GUIData object
     floors_data: FloorsData = field(default_factory=lambda: FloorsData())
 
@@ -243,7 +265,7 @@ class StructureModel:
 
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         state['pdf_document'] = None # Don't pickle FitzDocument
 
         # ModelPage objects in all_pdf_pages already handle their page_fitz for pickling (it's transient)
@@ -265,60 +287,35 @@ class StructureModel:
             self.gui_data = GUIData.from_dict(merged_data)
 
 
-        self.pdf_document = None # Ensure it's None before attempting to load
-        pdf_path_to_load_on_restore = self.gui_data.current_pdf_binder_full_path # Uses property
+        if self.legend_properties and isinstance(self.legend_properties, dict): # Stored as a dict by __getstate__
+            temp_legend_page_index = self.legend_properties.get('_legend_page_index')
+            self.legend_properties = LegendProperties(**self.legend_properties) # Recreate instance
+            self.legend_properties._legend_page_index = temp_legend_page_index
 
+        # The binder is only opened, and its pages loaded, when first used (see LazyPdfDocument).
+        # Page bounds, mm factors and legend template xrefs were pickled, so nothing is recalculated here.
+        self.pdf_document = None
+        pdf_path_to_load_on_restore = self.gui_data.current_pdf_binder_full_path # Uses property
         if pdf_path_to_load_on_restore and os.path.exists(pdf_path_to_load_on_restore):
-            try:
-                # print(f"StructureModel __setstate__: Restoring PDF document from: {pdf_path_to_load_on_restore}")
-                self.pdf_document = FitzDocument(pdf_path_to_load_on_restore)
-
-                # Restore page_fitz for each ModelPage
-                restored_all_pdf_pages = []
-                for mp_shell in self.all_pdf_pages: # These are ModelPage shells
-                    if mp_shell.page_properties and mp_shell.page_properties.page_index is not None and \
-                       0 <= mp_shell.page_properties.page_index < self.pdf_document.page_count:
-                        
-                        fitz_page_obj = self.pdf_document[mp_shell.page_properties.page_index]
-                        # Re-link the fitz_page_obj to the PdfPageProperties inside ModelPage
-                        if mp_shell.page_properties:
-                             mp_shell.page_properties.restore_fitz_page_and_recalculate(fitz_page_obj)
-
-                        # Update the ModelPage shell with the live fitz_page and self reference
-                        # Using dataclasses.replace is safer for immutable dataclasses or complex __init__
-                        new_mp = dataclasses.replace(mp_shell, 
-                                                     page_fitz=fitz_page_obj, 
-                                                     structure_model=self)
-                        restored_all_pdf_pages.append(new_mp)
-                    else:
-                        # print(f"Warning (StructureModel __setstate__): Could not restore page_fitz for ModelPage, index issue: {mp_shell.page_properties}")
-                        restored_all_pdf_pages.append(dataclasses.replace(mp_shell, page_fitz=None, structure_model=self))
-                self.all_pdf_pages = restored_all_pdf_pages
-                
-                # Restore legend_page_fitz if legend_properties exists
-                if self.legend_properties and isinstance(self.legend_properties, dict): # If it was stored as dict from older pickle
-                    temp_legend_page_index = self.legend_properties.get('_legend_page_index')
-                    self.legend_properties = LegendProperties(**self.legend_properties) # Recreate instance
-                    self.legend_properties._legend_page_index = temp_legend_page_index
+            self.pdf_document = LazyPdfDocument(pdf_path_to_load_on_restore)
 
+        def lazy_page(page_index: Optional[int]) -> Optional[LazyPdfPage]:
+            if self.pdf_document is None or page_index is None or page_index < 0:
+                return None
+            return self.pdf_document.page(page_index)
 
-                if self.legend_properties and self.legend_properties._legend_page_index is not None:
-                    if 0 <= self.legend_properties._legend_page_index < self.pdf_document.page_count:
-                        self.legend_properties.legend_page_fitz = self.pdf_document[self.legend_properties._legend_page_index]
-                        self.legend_properties.load_template_annots_from_legend_page()
-                    else:
-                        # print(f"Warning (StructureModel __setstate__): Legend page index {self.legend_properties._legend_page_index} out of bounds.")
-                        self.legend_properties.legend_page_fitz = None
-            except Exception as e:
-                print(f"Error re-loading PDF document during StructureModel unpickling from '{pdf_path_to_load_on_restore}': {e}")
-                self.pdf_document = None
-                for mp in self.all_pdf_pages: mp.page_fitz = None
-                if self.legend_properties: self.legend_properties.legend_page_fitz = None
-        else:
-            # print("No valid PDF path in gui_data during StructureModel unpickle, PDF objects not restored.")
-            for mp in self.all_pdf_pages: mp.page_fitz = None # Ensure all are None
-            if self.legend_properties: self.legend_properties.legend_page_fitz = None
-
+        for mp in self.all_pdf_pages:
+            mp.structure_model = self
+            page_index = mp.page_properties.page_index if mp.page_properties else None
+            mp.page_fitz = lazy_page(page_index)
+            if mp.page_properties:
+                mp.page_properties.page = mp.page_fitz
+                if mp.page_fitz is not None and mp.page_properties.page_bound_width is None:
+                    # Saved before its page was measured; the only pages loaded on restore
+                    mp.page_properties.restore_fitz_page_and_recalculate(mp.page_fitz)
+
+        if self.legend_properties:
+            self.legend_properties.legend_page_fitz = lazy_page(self.legend_properties._legend_page_index)
 
         # Re-link parent models
         if self.floors_data:
@@ -327,16 +324,7 @@ class StructureModel:
                 floor = self.floors_data.floors[floor_key]
                 floor.structure_model = self
                 floor.floors_data_parent = self.floors_data
-                # Restore ga_page_fitz in FloorData
-                if floor._ga_page_index is not None and self.pdf_document and \
-                   0 <= floor._ga_page_index < self.pdf_document.page_count:
-                    try:
-                        floor.ga_page_fitz = self.pdf_document[floor._ga_page_index]
-                    except Exception as e_fd_pdf:
-                        print(f"Error restoring ga_page_fitz for FloorData '{floor.floor_name}': {e_fd_pdf}")
-                        floor.ga_page_fitz = None
-                elif floor._ga_page_index is not None: # PDF not loaded or index out of bounds
-                     floor.ga_page_fitz = None
+                floor.ga_page_fitz = lazy_page(floor._ga_page_index)
 
 
     def load_pdf_document(self, pdf_path: str):
@@ -346,6 +334,7 @@ class StructureModel:
                 self.pdf_document.close() # Close if it's the same one being invalidated
                 self.pdf_document = None
                 self.all_pdf_pages.clear()
+                self.mark_dirty()
             return
 
         try:
@@ -355,43 +344,50 @@ class StructureModel:
                     if mp.page_name:
                         existing_links[mp.page_name] = {
                             "is_selected_ga": mp.is_selected_ga,
-                            "is_included_for_linking": mp.is_included_for_linking,
                             "linked_cpt_floor_name": mp.linked_cpt_floor_name
                         }
                 self.pdf_document.close() # Close existing before reopening
 
-            self.pdf_document = FitzDocument(pdf_path)
-            self._parse_pdf_pages(existing_links_to_restore=existing_links)
+            # Opened on first use; the page sizes come from the binder's index
+            self.pdf_document = LazyPdfDocument(pdf_path)
+            binder_index = self._parse_pdf_pages(existing_links_to_restore=existing_links)
 
-            if self.pdf_document and self.pdf_document.page_count > 0:
+            if binder_index and binder_index.page_count > 0:
                 if self.legend_properties and self.legend_properties._legend_page_index is not None:
-                    if 0 <= self.legend_properties._legend_page_index < self.pdf_document.page_count:
-                        self.legend_properties.legend_page_fitz = self.pdf_document[self.legend_properties._legend_page_index]
-                        self.legend_properties.load_template_annots_from_legend_page()
+                    if 0 <= self.legend_properties._legend_page_index < binder_index.page_count:
+                        legend_page_index = self.legend_properties._legend_page_index
+                        self.legend_properties.legend_page_fitz = self.pdf_document.page(legend_page_index)
+                        self.legend_properties.load_template_annots_from_legend_page(binder_index.pages[legend_page_index].annot_subjects)
                     else: # Index out of bounds for new PDF
-                        self.set_legend_properties_from_pdf_page() # Default to first page
+                        self.set_legend_properties_from_pdf_page(binder_index=binder_index) # Default to first page
                 elif not self.legend_properties :
-                    self.set_legend_properties_from_pdf_page()
+                    self.set_legend_properties_from_pdf_page(binder_index=binder_index)
                 elif self.legend_properties and self.legend_properties._legend_page_index is None:
-                     self.set_legend_properties_from_pdf_page()
+                     self.set_legend_properties_from_pdf_page(binder_index=binder_index)
             # print(f"PDF document '{pdf_path}' loaded with {self.pdf_document.page_count if self.pdf_document else 'N/A'} pages.")
         except Exception as e:
             print(f"Error loading PDF document '{pdf_path}': {e}")
             if self.pdf_document: self.pdf_document.close()
             self.pdf_document = None
             self.all_pdf_pages.clear()
+            self.mark_dirty()
 # In class StructureModel in structure_model.py:
-    def _parse_pdf_pages(self, existing_links_to_restore: Optional[Dict[str, Dict]] = None):
+    def _parse_pdf_pages(self, existing_links_to_restore: Optional[Dict[str, Dict]] = None) -> Optional[PdfBinderIndex]:
+        """Makes a ModelPage for each page of the binder; returns the binder's index, so its page count is known without opening it."""
         if not self.pdf_document:
-            return
+            return None
         self.all_pdf_pages.clear()
+        self.mark_dirty()
 
-        for i, fitz_page_obj in enumerate(self.pdf_document):
+        # An unchanged binder is not measured again, its pages are loaded when first used
+        binder_index = PdfBinderIndex.for_binder(self.pdf_document.name, self.pdf_document)
+        for i in range(binder_index.page_count):
             page_name_identifier = f"Page_{i+1}"
+            fitz_page_obj = self.pdf_document.page(i) if isinstance(self.pdf_document, LazyPdfDocument) else self.pdf_document[i]
 
-            page_props = PdfPageProperties(
+            page_props = binder_index.page_properties(
+                i,
                 page=fitz_page_obj,
-                page_index=i,
                 page_name=page_name_identifier,
                 drawing_scale=self.gui_data.drawing_scale_1_to,
                 paper_size_key='A1'
@@ -410,12 +406,16 @@ class StructureModel:
                 linked_cpt_floor_name=linked_cpt
             )
             self.all_pdf_pages.append(model_page)
+        return binder_index
 
-    def set_legend_properties_from_pdf_page(self, page_index: int = 0):
-        if self.pdf_document and 0 <= page_index < self.pdf_document.page_count:
-            legend_fitz_page = self.pdf_document[page_index]
+    def set_legend_properties_from_pdf_page(self, page_index: int = 0, binder_index: Optional[PdfBinderIndex] = None):
+        """With the binder's `binder_index`, the binder is only opened if the legend page has template annotations."""
+        page_count = binder_index.page_count if binder_index else (self.pdf_document.page_count if self.pdf_document else 0)
+        if self.pdf_document and 0 <= page_index < page_count:
+            legend_fitz_page = self.pdf_document.page(page_index) if isinstance(self.pdf_document, LazyPdfDocument) else self.pdf_document[page_index]
             self.legend_properties = LegendProperties(legend_page_fitz=legend_fitz_page, _legend_page_index=page_index)
-            self.legend_properties.load_template_annots_from_legend_page()
+            indexed_annot_subjects = binder_index.pages[page_index].annot_subjects if binder_index else None
+            self.legend_properties.load_template_annots_from_legend_page(indexed_annot_subjects)
             # print(f"Legend properties set from PDF page {page_index}.")
         else:
             # print(f"Cannot set legend: PDF document not loaded or page index {page_index} out of bounds.")    
@@ -442,6 +442,7 @@ class StructureModel:
         self.floors_data.clear_floors()
         if self.gui_data: # Ensure gui_data exists
             self.gui_data.included_files.clear()
+            self.gui_data.mark_dirty()
 
     def get_ordered_floors(self) -> List[FloorData]:
         return self.floors_data.get_ordered_floors()
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field, fields, asdict, MISSING
 import os
 
+from data_model.dirty_tracking import DirtyTracked
+
 # Directory name for storing PDF binder versions
 PDF_BINDERS_DIR_NAME = "PDF_BINDERS" # Retained as it's used by ProjectManager
 
@@ -41,7 +43,7 @@ class PDFBinderPages:
 
 
 @dataclass
-class GUIData:
+class GUIData(DirtyTracked):
     """
     Central data store for GUI settings and state.
     This object is part of StructureModel and is pickled with it.
@@ -19,8 +19,8 @@ from PyQt6.QtWidgets import (
     QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
     QDialog, QDialogButtonBox, QComboBox
 )
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QKeySequence, QShortcut, QColor, QBrush, QPen
+from PyQt6.QtCore import Qt, QSize, QObject, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut, QColor, QBrush, QPen, QIcon
 
 SCRIPT_DIR_ABS = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT_ABS = os.path.dirname(SCRIPT_DIR_ABS) 
@@ -30,10 +30,12 @@ if PROJECT_ROOT_ABS not in sys.path:
 
 from data_model.structure_model import StructureModel, ModelPage
 from data_model.floor_data import FloorData
+from data_model.pdf_binder_index import PdfBinderIndex
 from gui.gui_data import GUIData, SETTINGS_DEFAULT, PDF_BINDERS_DIR_NAME, DEFAULT_MASTER_CPT_TEMPLATE_PATH
-from core_logic.project_manager import ProjectManager, RAM_CONCEPT_DIR_NAME, PICKLED_DATA_FILENAME
+from core_logic.project_manager import ProjectManager, RAM_CONCEPT_DIR_NAME, PICKLED_DATA_DIR_NAME, SESSION_STORE_FILENAME
 from core_logic.pdf_processor import PDFProcessor
 from core_logic.cpt_manager import CPTManager
+from core_logic.thumbnail_renderer import ThumbnailRenderer
 from ram_load_rundown_tool.ram_api_gui_pyqt6 import RamApiGuiPyQt6
 from gui.load_rundown_window import LoadRundownWindow # Import the new window
 
@@ -55,6 +57,11 @@ class PlaceholderScripts:
         QMessageBox.information(parent, "Get Data", "Get data (stub) initiated.")
 
 
+class ThumbnailSignals(QObject):
+    # Delivers thumbnails from the renderer's threads to the GUI thread: (pdf_path, page_index, png_path)
+    thumbnail_ready = pyqtSignal(str, int, str)
+
+
 class RamApiGuiPyQt(QMainWindow):
   # Floor Data Table Columns (Right Table)
     COL_FD_INCLUDE = 0
@@ -69,7 +76,8 @@ class RamApiGuiPyQt(QMainWindow):
     COL_PP_IS_GA = 0
     COL_PP_GA_NUMBER_DISPLAY = 1
     COL_PP_PDF_PAGE_REF = 2
-    NUM_PP_COLUMNS = 3 # Reduced from 4
+    COL_PP_GA_SCORE = 3
+    NUM_PP_COLUMNS = 4
 
     # New Story Data Table Columns (Left Table)
     COL_STORY_UPDATE = 0
@@ -110,6 +118,13 @@ class RamApiGuiPyQt(QMainWindow):
         self.ram_api_operations_module_window = None # Attribute for the RamApiGuiPyQt6 window
         self._programmatic_ui_update = False
 
+        # PDF page thumbnails, rendered in the background for the active binder
+        self.thumbnail_renderer: ThumbnailRenderer | None = None
+        self.thumbnail_signals = ThumbnailSignals()
+        self.thumbnail_signals.thumbnail_ready.connect(self._on_pdf_page_thumbnail_ready)
+        self._pdf_page_thumbnails: dict[int, str] = {} # page_index -> png path
+        self._thumbnails_binder_key = None
+
         self._create_left_frame_content(self.left_section_layout)
         self._create_middle_frame_content(self.middle_section_layout)
         self._create_right_frame_content(self.right_section_layout)
@@ -181,18 +196,21 @@ class RamApiGuiPyQt(QMainWindow):
         pdf_pages_table_group_layout = self._create_group_box("DETECTED PDF PAGES (GAs)", parent_layout)
         self.pdf_pages_table = QTableWidget()
         self.pdf_pages_table.setColumnCount(self.NUM_PP_COLUMNS)
-        self.pdf_pages_table.setHorizontalHeaderLabels(["GA", "GA No.", "PDF Page Ref"]) # Headers updated
+        self.pdf_pages_table.setHorizontalHeaderLabels(["GA", "GA No.", "PDF Page Ref", "GA Score"]) # Headers updated
         self.pdf_pages_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.pdf_pages_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.pdf_pages_table.verticalHeader().setVisible(False)
         self.pdf_pages_table.setMinimumHeight(200)
-
+        self.pdf_pages_table.setIconSize(QSize(48, 34)) # Page thumbnails, full size in the tooltip
 
         pp_header = self.pdf_pages_table.horizontalHeader()
         pp_header.setSectionResizeMode(self.COL_PP_IS_GA, QHeaderView.ResizeMode.ResizeToContents)
         pp_header.setSectionResizeMode(self.COL_PP_GA_NUMBER_DISPLAY, QHeaderView.ResizeMode.ResizeToContents)
         pp_header.setSectionResizeMode(self.COL_PP_PDF_PAGE_REF, QHeaderView.ResizeMode.Stretch)
+        pp_header.setSectionResizeMode(self.COL_PP_GA_SCORE, QHeaderView.ResizeMode.ResizeToContents)
         pdf_pages_table_group_layout.addWidget(self.pdf_pages_table)
+        self.detect_ga_pages_btn = QPushButton("Detect GA Pages (pre-selects likely GAs)")
+        pdf_pages_table_group_layout.addWidget(self.detect_ga_pages_btn)
 
         pdf_processing_group_layout = self._create_group_box("CPT CREATION (from Selected GAs in Active PDF)", parent_layout)
         pdf_processing_group_layout.addWidget(QLabel("Master CPT Template (for new CPTs from GAs):"))
@@ -290,7 +308,7 @@ class RamApiGuiPyQt(QMainWindow):
             self.cpt_manager.structure_model = self.structure_model_instance
 
         if loaded_ok:
-            print(f"Successfully loaded project data from {self.project_manager.get_pickle_data_path()}")
+            print(f"Successfully loaded project data from {self.project_manager.get_session_store_path()}")
             QMessageBox.information(self, "Project Loaded", f"Project data loaded from:\n{self.structure_model_instance.gui_data.root_directory}")
         elif self.structure_model_instance.gui_data.root_directory: 
              QMessageBox.warning(self, "Load Failed", f"Could not load project data from '{self.structure_model_instance.gui_data.root_directory}'.\nStarting with a new project state for this directory.")
@@ -356,6 +374,7 @@ class RamApiGuiPyQt(QMainWindow):
         self.pdf_version_explorer_listbox.itemDoubleClicked.connect(self._set_active_pdf_version_from_explorer)
 
         # PDF Table - only checkboxes have direct signals now, connected in _update_pdf_pages_table_row
+        self.detect_ga_pages_btn.clicked.connect(self.detect_ga_pages_gui)
 
         # CPT Creation Controls
         self.browse_master_cpt_btn.clicked.connect(self._browse_master_cpt_template)
@@ -741,6 +760,34 @@ class RamApiGuiPyQt(QMainWindow):
             self._save_project_data_to_pickle()
         
 
+    def detect_ga_pages_gui(self):
+        if not self.structure_model_instance.pdf_document:
+            QMessageBox.warning(self, "No PDF Binder", "Set an active PDF binder version before detecting GA pages.")
+            return
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            scores = self.pdf_processor.detect_ga_pages()
+        except Exception as e:
+            QApplication.restoreOverrideCursor()
+            QMessageBox.critical(self, "GA Detection Error", f"Could not detect GA pages:\n{e}")
+            return
+        QApplication.restoreOverrideCursor()
+
+        # Same as ticking the GA checkboxes by hand
+        self._calculate_and_assign_pdf_ga_numbers()
+        self._sync_floor_data_with_ga_selections()
+        self._update_pdf_pages_table()
+        self._update_story_data_table()
+        self._update_floor_data_table()
+        self._update_ga_count_warnings()
+        self._save_project_data_to_pickle()
+
+        likely_ga_count = sum(page_score.is_likely_ga for page_score in scores)
+        QMessageBox.information(self, "GA Pages Detected",
+                                f"{likely_ga_count} of {len(scores)} pages are likely GAs and have been selected.\n"
+                                "Check the GA Score column (hover for the reasons) and untick any that are not GAs.")
+
     def _sync_pdf_checkboxes_to_model_page_data(self):
         self._programmatic_pdf_checkbox_update = True
         for r in range(self.pdf_pages_table.rowCount()):
@@ -976,6 +1023,8 @@ class RamApiGuiPyQt(QMainWindow):
                 event.ignore()
         else: 
             event.accept()
+        if event.isAccepted() and self.thumbnail_renderer is not None:
+            self.thumbnail_renderer.shutdown()
 
 
     def save_project_data_explicit(self):
@@ -1432,11 +1481,11 @@ class RamApiGuiPyQt(QMainWindow):
                                                             self.structure_model_instance.gui_data.root_directory or PROJECT_ROOT_ABS)
         if not new_project_path: return
         
-        current_pickle_path_obj = self.project_manager.get_pickle_data_path() 
+        current_pickle_path_obj = self.project_manager.get_session_store_path() 
         current_pickle_path = str(current_pickle_path_obj) if current_pickle_path_obj else ""
 
 
-        new_potential_pickle_path = os.path.join(new_project_path, self.project_manager.PICKLED_DATA_DIR_NAME, PICKLED_DATA_FILENAME)
+        new_potential_pickle_path = os.path.join(new_project_path, PICKLED_DATA_DIR_NAME, SESSION_STORE_FILENAME)
         
         if os.path.exists(new_potential_pickle_path) and \
            (not current_pickle_path or os.path.abspath(current_pickle_path).lower() != os.path.abspath(new_potential_pickle_path).lower()):
@@ -1626,8 +1675,20 @@ class RamApiGuiPyQt(QMainWindow):
         page_ref_item = QTableWidgetItem(page_ref_text)
         page_ref_item.setData(Qt.ItemDataRole.UserRole, model_page.page_name) 
         page_ref_item.setFlags(page_ref_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        if model_page.page_properties and model_page.page_properties.page_index in self._pdf_page_thumbnails:
+            self._set_pdf_page_thumbnail(page_ref_item, self._pdf_page_thumbnails[model_page.page_properties.page_index])
         self.pdf_pages_table.setItem(row, self.COL_PP_PDF_PAGE_REF, page_ref_item)
 
+        # COL_PP_GA_SCORE: Likelihood of being a GA, from "Detect GA Pages"
+        ga_score = getattr(model_page, 'ga_score', None)
+        ga_score_item = QTableWidgetItem("-" if ga_score is None else f"{ga_score:.2f}")
+        ga_score_item.setFlags(ga_score_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+        ga_score_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        ga_score_reasons = getattr(model_page, 'ga_score_reasons', None)
+        if ga_score_reasons:
+            ga_score_item.setToolTip(", ".join(ga_score_reasons))
+        self.pdf_pages_table.setItem(row, self.COL_PP_GA_SCORE, ga_score_item)
+
         self._pdf_table_update_in_progress = False
 
 
@@ -1755,6 +1816,50 @@ class RamApiGuiPyQt(QMainWindow):
         self._update_ga_count_warnings() # Update warnings after table is repopulated
 
         self._calculate_and_assign_pdf_ga_numbers() # Ensure GA numbers are fresh
+        self._request_pdf_page_thumbnails()
+
+    def _request_pdf_page_thumbnails(self):
+        """Starts rendering the thumbnails of the active binder, unless already started; rows get them as they are ready."""
+        pdf_document = self.structure_model_instance.pdf_document
+        cache_dir = self.project_manager.get_thumbnail_cache_path()
+        if not pdf_document or not cache_dir:
+            return
+        pdf_path = os.path.abspath(pdf_document.name)
+        if not os.path.exists(pdf_path):
+            return
+        binder_key = (pdf_path, os.path.getmtime(pdf_path), cache_dir)
+        if binder_key == self._thumbnails_binder_key:
+            return
+        self._thumbnails_binder_key = binder_key
+        self._pdf_page_thumbnails.clear()
+        try:
+            # On this thread, as PyMuPDF is not thread safe; the index was just read or built when the binder was loaded
+            binder_hash = PdfBinderIndex.for_binder(pdf_path, pdf_document).content_hash
+        except Exception as e:
+            print(f"Warning: Could not render thumbnails of '{pdf_path}': {e}")
+            return
+
+        if self.thumbnail_renderer is None or self.thumbnail_renderer.cache_dir != cache_dir:
+            if self.thumbnail_renderer is not None:
+                self.thumbnail_renderer.shutdown()
+            self.thumbnail_renderer = ThumbnailRenderer(cache_dir, self.thumbnail_signals.thumbnail_ready.emit)
+        page_indices = [mp.page_properties.page_index for mp in self.structure_model_instance.all_pdf_pages if mp.page_properties]
+        self.thumbnail_renderer.render_binder(pdf_path, binder_hash, page_indices)
+
+    def _on_pdf_page_thumbnail_ready(self, pdf_path: str, page_index: int, png_path: str):
+        if not self._thumbnails_binder_key or self._thumbnails_binder_key[0] != pdf_path:
+            return # From a binder no longer active
+        self._pdf_page_thumbnails[page_index] = png_path
+        for row, model_page in enumerate(self.structure_model_instance.all_pdf_pages):
+            if model_page.page_properties and model_page.page_properties.page_index == page_index:
+                page_ref_item = self.pdf_pages_table.item(row, self.COL_PP_PDF_PAGE_REF)
+                if page_ref_item is not None:
+                    self._set_pdf_page_thumbnail(page_ref_item, png_path)
+                break
+
+    def _set_pdf_page_thumbnail(self, page_ref_item: QTableWidgetItem, png_path: str):
+        page_ref_item.setIcon(QIcon(png_path))
+        page_ref_item.setToolTip(f'<img src="{png_path}">')
     
     def _calculate_and_assign_pdf_ga_numbers(self): # type: ignore
         ga_counter = 0
@@ -51,7 +51,7 @@ import os
 from scripts.default_settings import SETTINGS_DEFAULT, SettingsDict
 import configparser
 import json
-from scripts.load_rundown_main import main_centroid_rundown_wrapped, run_click
+from scripts.load_rundown_main import main_centroid_rundown_wrapped, run_click, resume_click
 import configparser
 import tkinter as tk
 from scripts.txt_settings import load_settings
@@ -99,6 +99,12 @@ def wrapped_run_click():
     if settings:
         run_click(settings)
 
+def wrapped_resume_click():
+
+    settings = get_settings_dict()
+    if settings:
+        resume_click(settings)
+
 def wrapped_centroid_rundown():
 
     settings = get_settings_dict()
@@ -763,6 +769,7 @@ def get_settings_dict() -> SettingsDict:
             return var.get()
 
     settings = {
+        **SETTINGS_DEFAULT,
         "REINFORCED_CONCRETE_DENSITY": safe_get_number(reinforced_concrete_density_var,SETTINGS_DEFAULT['REINFORCED_CONCRETE_DENSITY']),
         "DRAWING_SCALE_1_TO": safe_get_number(drawing_scale_var,SETTINGS_DEFAULT['DRAWING_SCALE_1_TO']),
         # "WALL_GROUP": wall_group_var.get(),
@@ -1058,6 +1065,7 @@ tk.Label(run_files, text="Update Col I Factor", **label_kwargs).grid(row=3, colu
 tk.Checkbutton(run_files, variable=update_column_stiffness_calcs_var, **entry_kwargs).grid(row=3, column=1, **grid_kwargs)
 
 tk.Button(run_files, text="Run Calcs", command=wrapped_run_click).grid(row=4, column=0, **grid_kwargs)
+tk.Button(run_files, text="Resume Calcs", command=wrapped_resume_click).grid(row=4, column=1, **grid_kwargs)
 tk.Button(run_files, text="Validate Inputs", command=wrapped_validate_settings).grid(row=5, column=0, **grid_kwargs)
 
 listbox.bind('<Delete>', lambda e: remove_file())
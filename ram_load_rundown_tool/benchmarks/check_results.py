@@ -0,0 +1,269 @@
+"""
+Checks that the optional rundown settings do not change its results, against the synthetic
+RAM Concept stand-in, so a speed-up can be verified on any machine without a RAM Concept licence.
+
+Run from the ram_load_rundown_tool folder:
+
+    python -m benchmarks.check_results
+    python -m benchmarks.check_results --floors 8 --typical 1:4 5:3 --only SYNC_TRANSFER_LOADS
+
+Each check of CHECKS rundowns a fresh copy of the same tower with its settings, `runs` times,
+and compares the last run with a baseline rundown of the tower with the optional settings off:
+the Fz total of every load case of every floor and support type, and the load and location of
+every centroid.
+
+The baseline itself is compared with a plain recomputation from its harvested loadings, summed
+row by row: the derived live load cases (e.g. ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR is the sum of
+LLUR_PLANS, see `get_derived_load_cases`) and the Floor_* and Accumulative_* centroids, the
+factored Floor_<factors> combination with Floor_ALL_LLUR included.
+
+Exits with 1 if any result differs by more than --tolerance (relative, or absolute below 1).
+"""
+from . import fake_ram_concept
+fake_ram_concept.install()
+
+from .run_benchmark import make_settings, _parse_typical
+from scripts.default_settings import SettingsDict
+from scripts.validate_inputs import get_template_has_llur
+import scripts.run_down_process as run_down_process
+import argparse
+import copy
+import logging
+import os
+import sys
+import tempfile
+
+# The baseline of a check runs the same tower `runs` times with DO_CENTROID_CALCS and the `baseline` settings
+CHECKS = [
+    dict(name='SOLVE_TYPICAL_FLOORS_ONCE', settings=dict(SOLVE_TYPICAL_FLOORS_ONCE=True), runs=1),
+    dict(name='INCREMENTAL_RUNDOWN', settings=dict(INCREMENTAL_RUNDOWN=True), runs=2),
+    dict(name='SYNC_TRANSFER_LOADS', settings=dict(SYNC_TRANSFER_LOADS=True), runs=2),
+    dict(name='SKIP_UNCHANGED_SOLVES', settings=dict(SKIP_UNCHANGED_SOLVES=True), runs=2),
+    dict(name='SYNC_TRANSFER_LOADS+SKIP_UNCHANGED_SOLVES', settings=dict(SYNC_TRANSFER_LOADS=True, SKIP_UNCHANGED_SOLVES=True), runs=2),
+    dict(name='CONCEPT_ENGINE_POOL_SIZE', settings=dict(CONCEPT_ENGINE_POOL_SIZE=2, RECYCLE_ENGINE_AFTER_N_MODELS=1), runs=1),
+    dict(name='SUPPORT_MATCH_TOLERANCE', settings=dict(SUPPORT_MATCH_TOLERANCE=0.0), runs=1),
+    dict(name='UPDATE_COLUMN_STIFNESS_CALCS+SKIP_UNCHANGED_SOLVES', baseline=dict(UPDATE_COLUMN_STIFNESS_CALCS=True), settings=dict(UPDATE_COLUMN_STIFNESS_CALCS=True, SYNC_TRANSFER_LOADS=True, SKIP_UNCHANGED_SOLVES=True), runs=2),
+]
+
+FZ_COMPONENT = 'Fz'
+
+
+def _is_close(a: float, b: float, tolerance: float) -> bool:
+    return abs(a - b) <= tolerance * max(1.0, abs(a), abs(b))
+
+
+def run_rundown(settings: SettingsDict, runs: int, logger: logging.Logger = None) -> tuple[dict, dict]:
+    """Runs the rundown `runs` times over the same project and returns the level_loads and centroid_data of the last run."""
+    for _ in range(runs):
+        level_loads, centroid_data = dict(), dict()
+        run_down_process._run(copy.deepcopy(settings), level_loads=level_loads, centroid_data=centroid_data, logger=logger)
+    return level_loads, centroid_data
+
+
+def compare_results(expected: tuple[dict, dict], actual: tuple[dict, dict], tolerance: float) -> list[str]:
+    """The load case totals and centroids of `actual` that differ from `expected`."""
+    expected_level_loads, expected_centroids = expected
+    actual_level_loads, actual_centroids = actual
+    mismatches = []
+
+    if list(expected_level_loads) != list(actual_level_loads):
+        return [f"floors {list(actual_level_loads)}, expected {list(expected_level_loads)}"]
+
+    for filename, floor_level_loads in expected_level_loads.items():
+        for support_type, load_cases in floor_level_loads.items():
+            actual_load_cases = actual_level_loads[filename][support_type]
+            for load_case in load_cases:
+                if load_case not in actual_load_cases:
+                    mismatches.append(f"{filename} {support_type} {load_case} is missing")
+                    continue
+                total = actual_load_cases[load_case].total(FZ_COMPONENT)
+                expected_total = load_cases[load_case].total(FZ_COMPONENT)
+                if not _is_close(total, expected_total, tolerance):
+                    mismatches.append(f"{filename} {support_type} {load_case} Fz {total:.6f}, expected {expected_total:.6f}")
+
+    for filename, floor_centroids in expected_centroids.items():
+        for name, centroid in floor_centroids.items():
+            if not centroid:
+                continue
+            actual_centroid = actual_centroids.get(filename, {}).get(name)
+            if not actual_centroid:
+                mismatches.append(f"{filename} centroid {name} is missing")
+                continue
+            mismatches += _compare_centroid(f"{filename} centroid {name}", _centroid_values(actual_centroid), _centroid_values(centroid), tolerance)
+
+    return mismatches
+
+
+def _centroid_values(centroid: dict) -> tuple[float, float, float]:
+    return centroid['Fz'], centroid['location'].x, centroid['location'].y
+
+
+def _compare_centroid(label: str, actual: tuple[float, float, float], expected: tuple[float, float, float], tolerance: float) -> list[str]:
+    if all(_is_close(a, b, tolerance) for a, b in zip(actual, expected)):
+        return []
+    return [f"{label} (Fz, x, y) {tuple(round(value, 6) for value in actual)}, expected {tuple(round(value, 6) for value in expected)}"]
+
+
+def _row_sums(table) -> tuple[float, float, float]:
+    """(ΣFz, ΣFz·x, ΣFz·y) of a table, read row by row through its dict view."""
+    total = weighted_x = weighted_y = 0.0
+    for row in table.values():
+        point = row['centroid'] if 'centroid' in row else row['location']
+        total += row[FZ_COMPONENT]
+        weighted_x += row[FZ_COMPONENT] * point.x
+        weighted_y += row[FZ_COMPONENT] * point.y
+    return total, weighted_x, weighted_y
+
+
+def _reference_load_cases(settings: SettingsDict) -> dict[str, list[str]]:
+    """The harvested load cases each derived live load case is the sum of."""
+    reducible_floor = list(settings['LLR_PLANS'])
+    reducible = reducible_floor + ['TRANSFER_LL_REDUCIBLE']
+    if not get_template_has_llur(settings):
+        return dict(
+            ALL_LIVE_LOADS_REDUCIBLE_FLOOR = reducible_floor,
+            ALL_LIVE_LOADS_REDUCIBLE = reducible,
+            ALL_LIVE_LOADS_FLOOR = reducible_floor,
+            ALL_LIVE_LOADS = reducible,
+        )
+    unreducible_floor = list(settings['LLUR_PLANS'])
+    unreducible = unreducible_floor + ['TRANSFER_LL_UNREDUCIBLE']
+    return dict(
+        ALL_LIVE_LOADS_REDUCIBLE_FLOOR = reducible_floor,
+        ALL_LIVE_LOADS_REDUCIBLE = reducible,
+        ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR = unreducible_floor,
+        ALL_LIVE_LOADS_UNREDUCIBLE = unreducible,
+        ALL_LIVE_LOADS_FLOOR = reducible_floor + unreducible_floor,
+        ALL_LIVE_LOADS = reducible + unreducible,
+    )
+
+
+def _factor_label(factor: float):
+    # As `get_centroids` names the factored centroids
+    return int(factor) if int(factor) - float(factor) == 0 else round(factor, 1)
+
+
+def _reference_centroids(settings: SettingsDict) -> dict[str, list[tuple[float, str]]]:
+    """The (factor, harvested load case) terms of each centroid of `get_centroids`."""
+    live = _reference_load_cases(settings)
+    centroids = dict(
+        Accumulative_ALL_DL = [(1, 'ALL_DEAD_LC')],
+        Floor_ALL_DL = [(1, 'ALL_DEAD_LC'), (-1, 'TRANSFER_DEAD')],
+        Floor_ALL_LL = [(1, load_case) for load_case in live['ALL_LIVE_LOADS_FLOOR']],
+        Accumulative_ALL_LL = [(1, load_case) for load_case in live['ALL_LIVE_LOADS']],
+        Floor_ALL_LLR = [(1, load_case) for load_case in live['ALL_LIVE_LOADS_REDUCIBLE_FLOOR']],
+    )
+    dead_factor, reducible_factor = settings['EQ_FACTORS_DL'], settings['EQ_FACTORS_LLR']
+    factors = f"{_factor_label(dead_factor)}DL_{_factor_label(reducible_factor)}LLR"
+
+    if not get_template_has_llur(settings):
+        centroids['Accumulative_ALL_LLR'] = centroids['Accumulative_ALL_LL']
+        accumulative_name = f'Accumulative_{factors}'
+        parts = dict(DL=dead_factor, LLR=reducible_factor)
+    else:
+        centroids['Accumulative_ALL_LLR'] = [(1, load_case) for load_case in live['ALL_LIVE_LOADS_REDUCIBLE']]
+        centroids['Accumulative_ALL_LLUR'] = [(1, load_case) for load_case in live['ALL_LIVE_LOADS_UNREDUCIBLE']]
+        centroids['Floor_ALL_LLUR'] = [(1, load_case) for load_case in live['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR']]
+        factors += f"_{_factor_label(settings['EQ_FACTORS_LLUR'])}LLUR"
+        accumulative_name = f'Acc_{factors}'
+        parts = dict(DL=dead_factor, LLR=reducible_factor, LLUR=settings['EQ_FACTORS_LLUR'])
+
+    for name, prefix in ((accumulative_name, 'Accumulative'), (f'Floor_{factors}', 'Floor')):
+        centroids[name] = [(factor * term_factor, load_case) for part, factor in parts.items() for term_factor, load_case in centroids[f'{prefix}_ALL_{part}']]
+    return centroids
+
+
+def check_baseline(results: tuple[dict, dict], settings: SettingsDict, tolerance: float) -> list[str]:
+    """The derived load cases and centroids of `results` that differ from their row by row recomputation."""
+    level_loads, centroid_data = results
+    mismatches = []
+
+    for filename, floor_level_loads in level_loads.items():
+        for support_type, load_cases in floor_level_loads.items():
+            for load_case, terms in _reference_load_cases(settings).items():
+                derived = load_cases[load_case]
+                for key, row in derived.items():
+                    expected = sum(load_cases[term][key][FZ_COMPONENT] for term in terms if key in load_cases[term])
+                    if not _is_close(row[FZ_COMPONENT], expected, tolerance):
+                        mismatches.append(f"{filename} {support_type} {load_case} Fz at {key} {row[FZ_COMPONENT]:.6f}, expected {expected:.6f}")
+
+        if filename not in centroid_data:
+            continue
+        for name, terms in _reference_centroids(settings).items():
+            sums = [0.0, 0.0, 0.0]
+            for factor, load_case in terms:
+                for support_type in ('COLUMNS', 'WALLS'):
+                    for i, value in enumerate(_row_sums(floor_level_loads[support_type][load_case])):
+                        sums[i] += factor * value
+            centroid = centroid_data[filename].get(name)
+            if not centroid:
+                if sums[0] != 0:
+                    mismatches.append(f"{filename} centroid {name} is missing")
+                continue
+            mismatches += _compare_centroid(f"{filename} centroid {name}", _centroid_values(centroid), (sums[0], sums[1] / sums[0], sums[2] / sums[0]), tolerance)
+
+    return mismatches
+
+
+def run_checks(directory: str, checks: list[dict], tolerance: float, tower: dict, logger: logging.Logger = None) -> dict[str, list[str]]:
+    """Runs each check and its baseline on fresh copies of the tower, and returns the mismatches of each."""
+    baselines = dict()
+    mismatches = dict()
+
+    def rundown(name: str, overrides: dict, runs: int) -> tuple[SettingsDict, tuple[dict, dict]]:
+        settings = make_settings(os.path.join(directory, name), **tower, DO_CENTROID_CALCS=True, **overrides)
+        return settings, run_rundown(settings, runs, logger=logger)
+
+    for check in checks:
+        baseline_overrides = check.get('baseline', dict())
+        baseline_key = (tuple(sorted(baseline_overrides.items())), check['runs'])
+        if baseline_key not in baselines:
+            settings, baseline = rundown(f"baseline_{len(baselines)}", baseline_overrides, check['runs'])
+            baselines[baseline_key] = baseline
+            mismatches[f"baseline {dict(baseline_overrides)} x{check['runs']}"] = check_baseline(baseline, settings, tolerance)
+
+        _, results = rundown(check['name'].replace('+', '_'), check['settings'], check['runs'])
+        mismatches[check['name']] = compare_results(baselines[baseline_key], results, tolerance)
+
+    return mismatches
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check that the optional rundown settings give the same results as the baseline rundown.")
+    parser.add_argument('--floors', type=int, default=6)
+    parser.add_argument('--columns', type=int, default=16, help="Columns below each floor.")
+    parser.add_argument('--walls', type=int, default=2, help="Walls below each floor.")
+    parser.add_argument('--typical', nargs='*', default=['1:4'], metavar='INDEX:MULTIPLIER', help="Typical multiplier of a floor, e.g. 1:4.")
+    parser.add_argument('--only', nargs='*', default=[], metavar='CHECK', help=f"Only run these checks, of {', '.join(check['name'] for check in CHECKS)}.")
+    parser.add_argument('--tolerance', type=float, default=1e-6, help="Relative difference allowed, absolute below 1.")
+    parser.add_argument('--verbose', action='store_true', help="Show the rundown log.")
+    args = parser.parse_args(argv)
+
+    checks = [check for check in CHECKS if not args.only or check['name'] in args.only]
+    unknown = set(args.only) - {check['name'] for check in CHECKS}
+    if unknown:
+        parser.error(f"Unknown checks {', '.join(sorted(unknown))}")
+
+    logger = logging.getLogger('rundown_check_results')
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    tower = dict(floors=args.floors, columns=args.columns, walls=args.walls, typical=_parse_typical(args.typical))
+    with tempfile.TemporaryDirectory() as directory:
+        mismatches = run_checks(directory, checks, args.tolerance, tower, logger=logger)
+
+    for name, check_mismatches in mismatches.items():
+        print(f"{'FAIL' if check_mismatches else 'ok':>4}  {name}")
+        for mismatch in check_mismatches[:20]:
+            print(f"      {mismatch}")
+        if len(check_mismatches) > 20:
+            print(f"      ... {len(check_mismatches) - 20} more")
+
+    return 1 if any(mismatches.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Synthetic, in-memory stand-in for the `ram_concept` package, for benchmarking the rundown
+without a RAM Concept licence.
+
+Call `install()` before importing anything from `scripts` so that
+`from ram_concept.concept import Concept` etc. resolve to this package.
+"""
+import importlib
+import sys
+
+from ._backend import configure, reset_counts, CALL_COUNTS, LATENCY
+
+SUBMODULES = (
+    'concept',
+    'model',
+    'point_2D',
+    'line_segment_2D',
+    'result_layers',
+    'force_loading_layer',
+    'load_combo_layer',
+)
+
+
+def install(force: bool = False):
+    """Registers this package as `ram_concept` in sys.modules."""
+    existing = sys.modules.get('ram_concept')
+    if existing is not None and existing is not sys.modules[__name__] and not force:
+        raise RuntimeError("A real ram_concept package is already imported; pass force=True to replace it")
+
+    sys.modules['ram_concept'] = sys.modules[__name__]
+    for name in SUBMODULES:
+        sys.modules[f'ram_concept.{name}'] = importlib.import_module(f'{__name__}.{name}')
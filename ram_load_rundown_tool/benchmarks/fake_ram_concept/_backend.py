@@ -0,0 +1,560 @@
+"""
+In-memory stand-in for the parts of the RAM Concept API used by the load rundown.
+
+A "CPT" file is a JSON document describing one floor: supports, loadings and load
+combinations. Reactions are produced by a deliberately simple statical model:
+
+- area loads are shared between supports by their tributary `weight`, scaled by
+  column stiffness (i_factor) so the stiffness iteration has something to converge on;
+- point and line loads go entirely to the nearest support.
+
+Every public API method passes through `_api_call`, which counts the call and sleeps
+for the configured latency so benchmarks can model COM round-trip cost.
+"""
+from collections import Counter
+import json
+import math
+import time
+
+from .point_2D import Point2D
+from .line_segment_2D import LineSegment2D
+
+LATENCY = {
+    'call': 0.0,
+    'start_concept': 0.0,
+    'open_file': 0.0,
+    'generate_mesh': 0.0,
+    'calc_all': 0.0,
+    'save_file': 0.0,
+}
+
+CALL_COUNTS: Counter = Counter()
+
+SELF_DEAD_LOADING = 'Self-Dead Loading'
+
+
+def configure(**latency_s: float):
+    """Sets per-call latency in seconds, e.g. configure(call=0.0005, calc_all=0.5)."""
+    for key, value in latency_s.items():
+        if key not in LATENCY:
+            raise KeyError(f"Unknown latency key {key}, expected one of {list(LATENCY)}")
+        LATENCY[key] = float(value)
+
+
+def reset_counts():
+    CALL_COUNTS.clear()
+
+
+def _api_call(name: str):
+    CALL_COUNTS[name] += 1
+    delay = LATENCY.get(name.split('.')[-1], 0.0) or LATENCY['call']
+    if delay:
+        time.sleep(delay)
+
+
+class _Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0, rot_x=0.0, rot_y=0.0):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.rot_x = rot_x
+        self.rot_y = rot_y
+
+
+class ConcreteMaterial:
+    def __init__(self, fc_final: float):
+        self._fc_final = fc_final
+
+    @property
+    def fc_final(self) -> float:
+        _api_call('Concrete.fc_final')
+        return self._fc_final
+
+
+class StructureColumn:
+    def __init__(self, model: 'Model', data: dict):
+        self._model = model
+        self._data = data
+
+    @property
+    def name(self) -> str:
+        _api_call('Column.name')
+        return self._data['name']
+
+    @property
+    def location(self) -> Point2D:
+        _api_call('Column.location')
+        return Point2D(self._data['x'], self._data['y'])
+
+    @property
+    def b(self) -> float:
+        _api_call('Column.b')
+        return self._data['b']
+
+    @property
+    def d(self) -> float:
+        _api_call('Column.d')
+        return self._data['d']
+
+    @property
+    def height(self) -> float:
+        _api_call('Column.height')
+        return self._data['height']
+
+    @property
+    def concrete(self) -> ConcreteMaterial:
+        _api_call('Column.concrete')
+        return ConcreteMaterial(self._data['fc'])
+
+    @property
+    def i_factor(self) -> float:
+        _api_call('Column.i_factor')
+        return self._data['i_factor']
+
+    @i_factor.setter
+    def i_factor(self, value: float):
+        _api_call('Column.i_factor=')
+        if self._data['i_factor'] != value:
+            self._data['i_factor'] = value
+            self._model._geometry_changed()
+
+
+class StructureWall:
+    def __init__(self, data: dict):
+        self._data = data
+
+    @property
+    def location(self) -> LineSegment2D:
+        _api_call('Wall.location')
+        return _wall_segment(self._data)
+
+    @property
+    def thickness(self) -> float:
+        _api_call('Wall.thickness')
+        return self._data['thickness']
+
+    @property
+    def height(self) -> float:
+        _api_call('Wall.height')
+        return self._data['height']
+
+
+class ColumnElement:
+    def __init__(self, data: dict, index: int):
+        self._data = data
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        _api_call('ColumnElement.name')
+        return self._data['name']
+
+    @property
+    def location(self) -> Point2D:
+        _api_call('ColumnElement.location')
+        return Point2D(self._data['x'], self._data['y'])
+
+    @property
+    def b(self) -> float:
+        _api_call('ColumnElement.b')
+        return self._data['b']
+
+    @property
+    def d(self) -> float:
+        _api_call('ColumnElement.d')
+        return self._data['d']
+
+    @property
+    def height(self) -> float:
+        _api_call('ColumnElement.height')
+        return self._data['height']
+
+
+class WallElementGroup:
+    def __init__(self, data: dict, index: int):
+        self._data = data
+        self._index = index
+
+    @property
+    def total_length(self) -> float:
+        _api_call('WallElementGroup.total_length')
+        return self._data['length']
+
+    @property
+    def total_area(self) -> float:
+        """Plan area in mm2."""
+        _api_call('WallElementGroup.total_area')
+        return self._data['length'] * 1000 * self._data['thickness']
+
+    @property
+    def centroid(self) -> Point2D:
+        _api_call('WallElementGroup.centroid')
+        return Point2D(self._data['x'], self._data['y'])
+
+    @property
+    def reaction_angle(self) -> float:
+        _api_call('WallElementGroup.reaction_angle')
+        return self._data['angle']
+
+
+class ElementLayer:
+    def __init__(self, model: 'Model'):
+        self._model = model
+
+    @property
+    def column_elements_below(self) -> list[ColumnElement]:
+        _api_call('ElementLayer.column_elements_below')
+        self._model._require_mesh()
+        return [ColumnElement(data, i) for i, data in enumerate(self._model._data['columns'])]
+
+    @property
+    def wall_element_groups_below(self) -> list[WallElementGroup]:
+        _api_call('ElementLayer.wall_element_groups_below')
+        self._model._require_mesh()
+        return [WallElementGroup(data, i) for i, data in enumerate(self._model._data['walls'])]
+
+
+class StructureLayer:
+    def __init__(self, model: 'Model'):
+        self._model = model
+
+    @property
+    def columns_below(self) -> list[StructureColumn]:
+        _api_call('StructureLayer.columns_below')
+        return [StructureColumn(self._model, data) for data in self._model._data['columns']]
+
+    @property
+    def walls_below(self) -> list[StructureWall]:
+        _api_call('StructureLayer.walls_below')
+        return [StructureWall(data) for data in self._model._data['walls']]
+
+
+class _Load:
+    def __init__(self, layer: 'ForceLoadingLayer', data: dict):
+        self._layer = layer
+        self._data = data
+
+    def delete(self):
+        _api_call(f'{type(self).__name__}.delete')
+        self._layer._remove(self._data)
+
+    @property
+    def elevation(self) -> float:
+        _api_call(f'{type(self).__name__}.elevation')
+        return self._data.get('elevation', 0.0)
+
+    @elevation.setter
+    def elevation(self, value: float):
+        _api_call(f'{type(self).__name__}.elevation=')
+        self._data['elevation'] = value
+
+
+def _load_value_property(key: str):
+    def getter(self):
+        _api_call(f'{type(self).__name__}.{key}')
+        return self._data.get(key, 0.0)
+
+    def setter(self, value):
+        _api_call(f'{type(self).__name__}.{key}=')
+        self._data[key] = float(value)
+        self._layer._model._loads_changed()
+
+    return property(getter, setter)
+
+
+class PointLoad(_Load):
+    Fx = _load_value_property('Fx')
+    Fy = _load_value_property('Fy')
+    Fz = _load_value_property('Fz')
+    Mx = _load_value_property('Mx')
+    My = _load_value_property('My')
+
+    @property
+    def location(self) -> Point2D:
+        _api_call('PointLoad.location')
+        return Point2D(self._data['x'], self._data['y'])
+
+    def zero_load_values(self):
+        _api_call('PointLoad.zero_load_values')
+        for key in ('Fx', 'Fy', 'Fz', 'Mx', 'My'):
+            self._data[key] = 0.0
+        self._layer._model._loads_changed()
+
+
+class LineLoad(_Load):
+    Fx = _load_value_property('Fx')
+    Fy = _load_value_property('Fy')
+    Fz = _load_value_property('Fz')
+    Mx = _load_value_property('Mx')
+    My = _load_value_property('My')
+
+    @property
+    def location(self) -> LineSegment2D:
+        _api_call('LineLoad.location')
+        return LineSegment2D(Point2D(self._data['x1'], self._data['y1']), Point2D(self._data['x2'], self._data['y2']))
+
+    def set_load_values(self, Fx: float, Fy: float, Fz: float, Mx: float, My: float):
+        _api_call('LineLoad.set_load_values')
+        self._data.update(Fx=Fx, Fy=Fy, Fz=Fz, Mx=Mx, My=My)
+        self._layer._model._loads_changed()
+
+
+class DefaultPointLoad:
+    def __init__(self):
+        self.elevation = 0.0
+
+
+class DefaultLineLoad:
+    def __init__(self):
+        self.elevation = 0.0
+        self._values = (0.0, 0.0, 0.0, 0.0, 0.0)
+
+    def set_load_values(self, Fx: float, Fy: float, Fz: float, Mx: float, My: float):
+        _api_call('DefaultLineLoad.set_load_values')
+        self._values = (Fx, Fy, Fz, Mx, My)
+
+
+class _ResultLayer:
+    def __init__(self, model: 'Model', name: str):
+        self._model = model
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        _api_call(f'{type(self).__name__}.name')
+        return self._name
+
+    def column_reaction(self, column_element: ColumnElement, context) -> _Vector:
+        _api_call(f'{type(self).__name__}.column_reaction')
+        fz = self._model._reactions(self._name)[column_element._index]
+        return _Vector(0.01 * fz, 0.005 * fz, fz, 0.02 * fz, -0.01 * fz)
+
+    def wall_group_reaction(self, wall_group: WallElementGroup, context) -> _Vector:
+        _api_call(f'{type(self).__name__}.wall_group_reaction')
+        fz = self._model._reactions(self._name)[len(self._model._data['columns']) + wall_group._index]
+        return _Vector(0.0, 0.0, fz, 0.0, 0.0)
+
+
+class ForceLoadingLayer(_ResultLayer):
+
+    def _loading(self) -> dict:
+        return self._model._data['loadings'][self._name]
+
+    def _remove(self, data: dict):
+        for key in ('point_loads', 'line_loads', 'area_loads'):
+            loads = self._loading().setdefault(key, [])
+            for i, load in enumerate(loads):
+                if load is data:
+                    del loads[i]
+                    self._model._loads_changed()
+                    return
+
+    def add_point_load(self, location: Point2D) -> PointLoad:
+        _api_call('ForceLoadingLayer.add_point_load')
+        data = dict(x=location.x, y=location.y, elevation=self._model.cad_manager.default_point_load.elevation, Fx=0.0, Fy=0.0, Fz=0.0, Mx=0.0, My=0.0)
+        self._loading().setdefault('point_loads', []).append(data)
+        self._model._loads_changed()
+        return PointLoad(self, data)
+
+    def add_line_load(self, location: LineSegment2D) -> LineLoad:
+        _api_call('ForceLoadingLayer.add_line_load')
+        Fx, Fy, Fz, Mx, My = self._model.cad_manager.default_line_load._values
+        data = dict(
+            x1=location.start_point.x, y1=location.start_point.y,
+            x2=location.end_point.x, y2=location.end_point.y,
+            elevation=self._model.cad_manager.default_line_load.elevation,
+            Fx=Fx, Fy=Fy, Fz=Fz, Mx=Mx, My=My,
+        )
+        self._loading().setdefault('line_loads', []).append(data)
+        self._model._loads_changed()
+        return LineLoad(self, data)
+
+    @property
+    def point_loads(self) -> list[PointLoad]:
+        _api_call('ForceLoadingLayer.point_loads')
+        return [PointLoad(self, data) for data in self._loading().get('point_loads', [])]
+
+    @property
+    def line_loads(self) -> list[LineLoad]:
+        _api_call('ForceLoadingLayer.line_loads')
+        return [LineLoad(self, data) for data in self._loading().get('line_loads', [])]
+
+    @property
+    def area_loads(self) -> list:
+        _api_call('ForceLoadingLayer.area_loads')
+        return []
+
+
+class LoadComboLayer(_ResultLayer):
+    pass
+
+
+class CadManager:
+    def __init__(self, model: 'Model'):
+        self._model = model
+        self._element_layer = ElementLayer(model)
+        self._structure_layer = StructureLayer(model)
+        self.default_point_load = DefaultPointLoad()
+        self.default_line_load = DefaultLineLoad()
+
+    @property
+    def element_layer(self) -> ElementLayer:
+        _api_call('CadManager.element_layer')
+        return self._element_layer
+
+    @property
+    def structure_layer(self) -> StructureLayer:
+        _api_call('CadManager.structure_layer')
+        return self._structure_layer
+
+    def force_loading_layer(self, name: str) -> ForceLoadingLayer | None:
+        _api_call('CadManager.force_loading_layer')
+        if name in self._model._data['loadings']:
+            return ForceLoadingLayer(self._model, name)
+        return None
+
+    def load_combo_layer(self, name: str) -> LoadComboLayer | None:
+        _api_call('CadManager.load_combo_layer')
+        if name in self._model._data['combos']:
+            return LoadComboLayer(self._model, name)
+        return None
+
+    @property
+    def force_loading_layers(self) -> list[ForceLoadingLayer]:
+        _api_call('CadManager.force_loading_layers')
+        return [ForceLoadingLayer(self._model, name) for name in self._model._data['loadings']]
+
+    @property
+    def load_combo_layers(self) -> list[LoadComboLayer]:
+        _api_call('CadManager.load_combo_layers')
+        return [LoadComboLayer(self._model, name) for name in self._model._data['combos']]
+
+
+def _wall_segment(wall: dict) -> LineSegment2D:
+    dx = wall['length'] / 2 * math.cos(math.radians(wall['angle']))
+    dy = wall['length'] / 2 * math.sin(math.radians(wall['angle']))
+    return LineSegment2D(Point2D(wall['x'] - dx, wall['y'] - dy), Point2D(wall['x'] + dx, wall['y'] + dy))
+
+
+class Model:
+    def __init__(self, concept: 'Concept', filepath: str, data: dict):
+        self._concept = concept
+        self._filepath = filepath
+        self._data = data
+        self._is_open = True
+        self._mesh_is_current = data.get('mesh_is_current', False)
+        self._reaction_cache: dict[str, list[float]] | None = None
+        self.cad_manager = CadManager(self)
+
+    def _geometry_changed(self):
+        self._mesh_is_current = False
+        self._reaction_cache = None
+
+    def _loads_changed(self):
+        self._reaction_cache = None
+
+    def _require_mesh(self):
+        if not self._mesh_is_current:
+            raise RuntimeError(f"{self._filepath}: mesh has not been generated")
+
+    def _support_points(self) -> list[tuple[float, float]]:
+        return [(c['x'], c['y']) for c in self._data['columns']] + [(w['x'], w['y']) for w in self._data['walls']]
+
+    def _support_weights(self) -> list[float]:
+        columns = self._data['columns']
+        walls = self._data['walls']
+        weights = [c['weight'] * (0.8 + 0.4 * c['i_factor']) for c in columns] + [w['weight'] for w in walls]
+        total = sum(weights) or 1.0
+        return [w / total for w in weights]
+
+    def _nearest_support(self, x: float, y: float, points: list[tuple[float, float]]) -> int:
+        best_index, best_distance = 0, math.inf
+        for i, (px, py) in enumerate(points):
+            distance = (px - x) ** 2 + (py - y) ** 2
+            if distance < best_distance:
+                best_index, best_distance = i, distance
+        return best_index
+
+    def _loading_reactions(self, loading_name: str) -> list[float]:
+        loading = self._data['loadings'][loading_name]
+        points = self._support_points()
+        weights = self._support_weights()
+        area_load = loading.get('area_load', 0.0)
+        if loading_name == SELF_DEAD_LOADING:
+            area_load += self._data.get('self_dead', 0.0)
+        total = area_load * self._data['floor_area']
+        reactions = [total * w for w in weights]
+
+        for load in loading.get('point_loads', []):
+            reactions[self._nearest_support(load['x'], load['y'], points)] += load.get('Fz', 0.0)
+
+        for load in loading.get('line_loads', []):
+            length = math.hypot(load['x2'] - load['x1'], load['y2'] - load['y1'])
+            mid_x, mid_y = (load['x1'] + load['x2']) / 2, (load['y1'] + load['y2']) / 2
+            reactions[self._nearest_support(mid_x, mid_y, points)] += load.get('Fz', 0.0) * length
+
+        return reactions
+
+    def _calculate(self):
+        self._require_mesh()
+        cache = {name: self._loading_reactions(name) for name in self._data['loadings']}
+        n = len(self._support_points())
+        for combo_name, factors in self._data['combos'].items():
+            combined = [0.0] * n
+            for loading_name, factor in factors.items():
+                for i, value in enumerate(cache[loading_name]):
+                    combined[i] += factor * value
+            cache[combo_name] = combined
+        self._reaction_cache = cache
+
+    def _reactions(self, layer_name: str) -> list[float]:
+        if self._reaction_cache is None:
+            self._calculate()
+        return self._reaction_cache[layer_name]
+
+    def generate_mesh(self):
+        _api_call('Model.generate_mesh')
+        self._mesh_is_current = True
+        self._reaction_cache = None
+
+    def calc_all(self):
+        _api_call('Model.calc_all')
+        self._calculate()
+
+    def save_file(self, filepath: str):
+        _api_call('Model.save_file')
+        self._data['mesh_is_current'] = self._mesh_is_current
+        with open(filepath, 'w') as file:
+            json.dump(self._data, file)
+
+    def close_model(self):
+        _api_call('Model.close_model')
+        self._is_open = False
+
+
+class Concept:
+
+    def __init__(self, headless: bool):
+        self.headless = headless
+        self._is_running = True
+
+    @classmethod
+    def start_concept(cls, headless: bool = True) -> 'Concept':
+        _api_call('Concept.start_concept')
+        return cls(headless)
+
+    def open_file(self, filepath: str) -> Model:
+        _api_call('Concept.open_file')
+        if not self._is_running:
+            raise RuntimeError("Concept has been shut down")
+        with open(filepath) as file:
+            data = json.load(file)
+        return Model(self, filepath, data)
+
+    def ping(self) -> str:
+        _api_call('Concept.ping')
+        return 'PONG'
+
+    def shut_down(self):
+        _api_call('Concept.shut_down')
+        self._is_running = False
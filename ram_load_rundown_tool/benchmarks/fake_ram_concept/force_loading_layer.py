@@ -0,0 +1 @@
+from ._backend import ForceLoadingLayer
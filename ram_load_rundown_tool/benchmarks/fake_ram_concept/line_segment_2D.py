@@ -0,0 +1,18 @@
+from .point_2D import Point2D
+
+
+class LineSegment2D:
+    def __init__(self, start_point: Point2D, end_point: Point2D):
+        self._start_point = start_point
+        self._end_point = end_point
+
+    @property
+    def start_point(self) -> Point2D:
+        return self._start_point
+
+    @property
+    def end_point(self) -> Point2D:
+        return self._end_point
+
+    def __repr__(self):
+        return f"LineSegment2D({self._start_point!r}, {self._end_point!r})"
@@ -0,0 +1,21 @@
+class Point2D:
+    def __init__(self, x: float, y: float):
+        self._x = float(x)
+        self._y = float(y)
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    def __repr__(self):
+        return f"Point2D({self._x}, {self._y})"
+
+    def __eq__(self, other):
+        return isinstance(other, Point2D) and self._x == other._x and self._y == other._y
+
+    def __hash__(self):
+        return hash((self._x, self._y))
@@ -0,0 +1,5 @@
+from enum import Enum
+
+
+class ReactionContext(Enum):
+    STANDARD = 0
@@ -0,0 +1,77 @@
+"""
+Runs the load rundown against a RAM Concept session recorded with RECORD_CONCEPT_SESSION, so the
+Python side of a real project's rundown can be profiled, or a slowdown bisected, without RAM Concept.
+
+Run from the ram_load_rundown_tool folder:
+
+    python -m benchmarks.replay_rundown path/to/logs/concept_session_<time>.json.gz --runs 3 --profile replay.prof
+"""
+try:
+    import ram_concept.concept
+except ImportError:
+    # Only the ram_concept modules and geometry classes are needed to replay a session
+    from . import fake_ram_concept
+    fake_ram_concept.install()
+
+from scripts.concept_pool import ConceptEnginePool
+from scripts.concept_session import ConceptSessionReplay
+from scripts.run_down_process import get_rundown_files
+import scripts.run_down_process as run_down_process
+import argparse
+import cProfile
+import logging
+import sys
+import tempfile
+import time
+
+
+def replay_rundown(replay: ConceptSessionReplay, root_directory: str, runs: int = 1, profile: cProfile.Profile = None, logger: logging.Logger = None) -> list[float]:
+    """Replays the recorded rundown `runs` times and returns the seconds each run took."""
+    settings = replay.replay_settings(root_directory)
+    seconds = []
+    for _ in range(runs):
+        replay.rewind()
+        engine_pool = ConceptEnginePool(max_engines=1, recycle_after_n_models=0, concept_factory=replay.concept, logger=logger)
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            run_down_process._run(settings, logger=logger, engine_pool=engine_pool)
+        finally:
+            if profile is not None:
+                profile.disable()
+            engine_pool.shut_down()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Replay a recorded RAM Concept session through the load rundown.")
+    parser.add_argument('session', help="Session file written by a rundown with RECORD_CONCEPT_SESSION on.")
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--profile', help="Write cProfile stats of the replayed runs to this file.")
+    parser.add_argument('--verbose', action='store_true', help="Show the rundown log.")
+    args = parser.parse_args(argv)
+
+    logger = logging.getLogger('rundown_replay')
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    replay = ConceptSessionReplay.load(args.session)
+    profile = cProfile.Profile() if args.profile else None
+    with tempfile.TemporaryDirectory() as directory:
+        seconds = replay_rundown(replay, directory, runs=args.runs, profile=profile, logger=logger)
+        n_floors = len(get_rundown_files(replay.replay_settings(directory)))
+
+    for run, run_seconds in enumerate(seconds, start=1):
+        print(f"Run {run}: {n_floors} floors in {run_seconds:.2f} s, {3600*n_floors/run_seconds:.0f} floors/h")
+    if profile is not None:
+        profile.dump_stats(args.profile)
+        print(f"Profile written to {args.profile}")
+
+
+if __name__ == '__main__':
+    main()
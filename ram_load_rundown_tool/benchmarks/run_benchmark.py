@@ -0,0 +1,154 @@
+"""
+Benchmarks the load rundown end to end against the synthetic RAM Concept stand-in, so rundown
+performance can be measured on any machine without a RAM Concept licence.
+
+Run from the ram_load_rundown_tool folder:
+
+    python -m benchmarks.run_benchmark --floors 20 --columns 60 --walls 6 --typical 2:5 --latency call=0.0002 calc_all=0.5 --runs 2
+    python -m benchmarks.run_benchmark --floors 20 --typical 2:5 --runs 2 --set INCREMENTAL_RUNDOWN=True
+
+Each run calls `run_down_process._run` on the same synthetic tower, so later runs measure a rerun
+of an unchanged project. Reports floors/hour, the floors opened and solved (the others were
+reused or derived), RAM Concept API calls per floor and peak memory. With INCREMENTAL_RUNDOWN,
+a rerun of an unchanged tower, typical stacks included, solves no floors.
+"""
+from . import fake_ram_concept
+fake_ram_concept.install()
+
+from .synthetic_tower import generate_tower
+from scripts.default_settings import SETTINGS_DEFAULT, SettingsDict
+from scripts.run_down_process import get_rundown_files
+import scripts.run_down_process as run_down_process
+import argparse
+import ast
+import copy
+import json
+import logging
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def _parse_typical(values: list[str]) -> dict[int, int]:
+    typical = dict()
+    for value in values:
+        floor_index, multiplier = value.split(':')
+        typical[int(floor_index)] = int(multiplier)
+    return typical
+
+
+def _parse_assignments(values: list[str]) -> dict[str, object]:
+    assignments = dict()
+    for value in values:
+        key, text = value.split('=', 1)
+        try:
+            assignments[key] = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            assignments[key] = text
+    return assignments
+
+
+def make_settings(directory: str, floors: int = 10, columns: int = 40, walls: int = 4, typical: dict[int, int] = None, **overrides) -> SettingsDict:
+    """Settings for a rundown of a synthetic tower written into `directory`."""
+    settings = copy.deepcopy(SETTINGS_DEFAULT)
+    settings['ROOT_DIRECTORY'] = directory
+    settings['FILES'] = generate_tower(directory, settings, floors=floors, columns=columns, walls=walls, typical=typical)
+    settings['START_FROM_LEVEL_OR_INDEX'] = 0
+    settings['END_AT_LEVEL_OR_INDEX'] = len(settings['FILES']) - 1
+    settings['OPEN_CENTROID_EXCEL'] = False
+    settings.update(overrides)
+    return settings
+
+
+def _peak_memory_mb(trace_memory: bool) -> float | None:
+    if trace_memory:
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    if resource is not None:
+        # ru_maxrss is in kB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+    return None
+
+
+def run_benchmark(settings: SettingsDict, runs: int = 1, trace_memory: bool = False, logger: logging.Logger = None) -> list[dict]:
+    """Runs the rundown `runs` times over the same project and returns the measurements of each run."""
+    n_floors = len(get_rundown_files(settings))
+    results = []
+    for run in range(1, runs + 1):
+        fake_ram_concept.reset_counts()
+        if trace_memory:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        run_down_process._run(copy.deepcopy(settings), logger=logger)
+        seconds = time.perf_counter() - start
+
+        peak_memory_mb = _peak_memory_mb(trace_memory)
+        if trace_memory:
+            tracemalloc.stop()
+
+        api_calls = sum(fake_ram_concept.CALL_COUNTS.values())
+        results.append(dict(
+            run = run,
+            floors = n_floors,
+            seconds = seconds,
+            floors_per_hour = 3600*n_floors/seconds if seconds else None,
+            floors_solved = fake_ram_concept.CALL_COUNTS['Concept.open_file'],
+            api_calls = api_calls,
+            api_calls_per_floor = api_calls/n_floors if n_floors else None,
+            peak_memory_mb = peak_memory_mb,
+            top_api_calls = dict(fake_ram_concept.CALL_COUNTS.most_common(10)),
+        ))
+    return results
+
+
+def format_results(results: list[dict]) -> str:
+    lines = [f"{'Run':>4} {'Floors':>7} {'Solved':>7} {'Seconds':>9} {'Floors/h':>10} {'API calls':>10} {'Calls/floor':>12} {'Peak MB':>9}"]
+    for result in results:
+        peak_memory = f"{result['peak_memory_mb']:.1f}" if result['peak_memory_mb'] is not None else '-'
+        lines.append(f"{result['run']:>4} {result['floors']:>7} {result['floors_solved']:>7} {result['seconds']:>9.2f} {result['floors_per_hour']:>10.0f} {result['api_calls']:>10} {result['api_calls_per_floor']:>12.0f} {peak_memory:>9}")
+    for result in results:
+        lines.append(f"Most called on run {result['run']}: " + ', '.join(f"{name} {calls}" for name, calls in result['top_api_calls'].items()))
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the load rundown against a synthetic RAM Concept stand-in.")
+    parser.add_argument('--floors', type=int, default=10)
+    parser.add_argument('--columns', type=int, default=40, help="Columns below each floor.")
+    parser.add_argument('--walls', type=int, default=4, help="Walls below each floor.")
+    parser.add_argument('--typical', nargs='*', default=[], metavar='INDEX:MULTIPLIER', help="Typical multiplier of a floor, e.g. 2:5.")
+    parser.add_argument('--latency', nargs='*', default=[], metavar='KEY=SECONDS', help="Artificial latency per API call, e.g. call=0.0002 calc_all=0.5.")
+    parser.add_argument('--set', nargs='*', default=[], metavar='SETTING=VALUE', help="Settings overrides, e.g. SOLVE_TYPICAL_FLOORS_ONCE=True.")
+    parser.add_argument('--runs', type=int, default=1, help="Rundowns over the same tower; later runs measure a rerun of an unchanged project.")
+    parser.add_argument('--trace-memory', action='store_true', help="Measure the peak Python heap with tracemalloc (slower) instead of the peak RSS.")
+    parser.add_argument('--json', help="Also write the results to this file.")
+    parser.add_argument('--verbose', action='store_true', help="Show the rundown log.")
+    args = parser.parse_args(argv)
+
+    fake_ram_concept.configure(**{key: float(value) for key, value in _parse_assignments(args.latency).items()})
+
+    logger = logging.getLogger('rundown_benchmark')
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings = make_settings(directory, floors=args.floors, columns=args.columns, walls=args.walls, typical=_parse_typical(args.typical), **_parse_assignments(args.set))
+        results = run_benchmark(settings, runs=args.runs, trace_memory=args.trace_memory, logger=logger)
+
+    print(format_results(results))
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(dict(arguments=vars(args), results=results), file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
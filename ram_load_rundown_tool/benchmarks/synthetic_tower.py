@@ -0,0 +1,87 @@
+"""Writes a synthetic tower of fake-CPT files for the rundown benchmark."""
+import json
+import math
+import os
+
+SELF_DEAD_LOADING = 'Self-Dead Loading'
+SUPERIMPOSED_DEAD_LOADING = 'Other Dead Loading'
+
+
+def _floor_data(settings: dict, columns: int, walls: int, floor_index: int, bay: float = 8.0) -> dict:
+    grid = max(1, math.ceil(math.sqrt(columns)))
+    column_data = []
+    for i in range(columns):
+        row, col = divmod(i, grid)
+        column_data.append(dict(
+            name=f'C{i + 1}',
+            x=round(col * bay + 0.125, 3),
+            y=round(row * bay + 0.375, 3),
+            b=0.0 if i % 5 == 0 else 400.0,
+            d=450.0 if i % 5 == 0 else 600.0 + 50.0 * (i % 3),
+            height=3.1,
+            fc=40.0 + 10.0 * (i % 2),
+            i_factor=0.7,
+            weight=1.0 + 0.25 * (i % 4),
+        ))
+
+    span_x = grid * bay
+    wall_data = []
+    for i in range(walls):
+        wall_data.append(dict(
+            name=f'W{i + 1}',
+            x=round(span_x + 2.0 + 3.0 * (i // 2), 3),
+            y=round(4.0 + 6.0 * (i % 2), 3),
+            angle=90.0 if i % 2 else 0.0,
+            length=4.0 + (i % 3),
+            thickness=200.0,
+            height=3.1,
+            weight=3.0,
+        ))
+
+    floor_area = (grid * bay) * (math.ceil(columns / grid) * bay)
+    loadings = {
+        SELF_DEAD_LOADING: dict(area_load=0.0),
+        SUPERIMPOSED_DEAD_LOADING: dict(area_load=1.5 + 0.1 * (floor_index % 3)),
+        settings['TRANSFER_DEAD']: dict(area_load=0.0),
+        settings['TRANSFER_LL_REDUCIBLE']: dict(area_load=0.0),
+        settings['TRANSFER_LL_UNREDUCIBLE']: dict(area_load=0.0),
+    }
+    for i, name in enumerate(settings['LLR_PLANS']):
+        loadings[name] = dict(area_load=1.5 if i == 0 else 0.5)
+    # Distinct plan loads, so a load case summing the wrong plans does not add up to the right total
+    for i, name in enumerate(settings['LLUR_PLANS']):
+        loadings[name] = dict(area_load=1.0 + 0.25 * i)
+
+    dead = [SELF_DEAD_LOADING, SUPERIMPOSED_DEAD_LOADING, settings['TRANSFER_DEAD']]
+    live = [settings['TRANSFER_LL_REDUCIBLE'], settings['TRANSFER_LL_UNREDUCIBLE'], *settings['LLR_PLANS'], *settings['LLUR_PLANS']]
+    combos = {
+        settings['ALL_DEAD_LC']: {name: 1.0 for name in dead},
+        settings['ALL_LIVE_LOADS_LC']: {name: 1.0 for name in live},
+    }
+
+    return dict(
+        floor_area=floor_area,
+        self_dead=0.2 * 24.0,
+        columns=column_data,
+        walls=wall_data,
+        loadings=loadings,
+        combos=combos,
+        mesh_is_current=False,
+    )
+
+
+def generate_tower(directory: str, settings: dict, floors: int = 10, columns: int = 40, walls: int = 4, typical: dict[int, int] = None) -> list[dict]:
+    """
+    Writes `floors` fake CPT files into `directory`, top floor first, and returns the
+    settings['FILES'] list for them. `typical` maps a floor index to its typical multiplier.
+    """
+    typical = typical or {}
+    os.makedirs(directory, exist_ok=True)
+    files = []
+    for floor_index in range(floors):
+        filename = f'L{floors - floor_index:02d}.cpt'
+        filepath = os.path.join(directory, filename)
+        with open(filepath, 'w') as file:
+            json.dump(_floor_data(settings, columns, walls, floor_index), file)
+        files.append({'filename': filename, 'filepath': filepath, 'typical': typical.get(floor_index, 1)})
+    return files
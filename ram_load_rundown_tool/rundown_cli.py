@@ -0,0 +1,227 @@
+"""
+Runs the load rundown from the command line, without the log window or the GUI, so rundowns
+can be scheduled (e.g. overnight on a build box) or run over a remote terminal session.
+
+Run from the ram_load_rundown_tool folder:
+
+    python rundown_cli.py "P:/Project/RAM Concept/settings.txt"
+    python rundown_cli.py "P:/Project/pickled_project_data/project_session.db" --resume
+    python rundown_cli.py settings.txt --set DO_CENTROID_CALCS=True ATEMPT_RESTART_IF_ERROR=False --log-format json
+
+A project session saved by the PyQt GUI gives the CPT files, their order and typical counts; the
+other settings come from the settings.txt in the active CPT folder, if there is one.
+
+No GUI toolkit is imported. Ctrl+C stops the rundown after the floor being solved is saved and
+checkpointed (resume with --resume), a second Ctrl+C or SIGTERM cancels it without saving.
+
+Exit codes: 0 the rundown completed (or the settings are valid, with --validate-only),
+1 the rundown failed, 2 invalid arguments or settings, 3 the rundown was stopped or cancelled.
+"""
+from scripts.default_settings import SETTINGS_DEFAULT, SettingsDict
+from scripts.txt_settings import read_settings_from_txt, validate_settings, SETTINGS_FILENAME
+from scripts.validate_inputs import validate_inputs
+from scripts.validate_files import check_ram_files_are_present
+from scripts.log_window_wrapper import set_logger
+from scripts.run_control import RundownControl
+from datetime import datetime
+import argparse
+import ast
+import copy
+import json
+import logging
+import os
+import pickle
+import signal
+import sys
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INVALID = 2
+EXIT_STOPPED = 3
+
+# The session store of the GUI, and the whole-model pickle of projects saved before it
+PROJECT_SESSION_EXTENSIONS = ('.db', '.pkl')
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record, for log collectors and schedulers."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = dict(
+            time = datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            level = record.levelname,
+            message = record.getMessage(),
+        )
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class _ErrorCounter(logging.Handler):
+    """Counts the errors logged, as validation logs errors without raising."""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        self.count += 1
+
+
+def _parse_assignments(values: list[str]) -> dict[str, object]:
+    assignments = dict()
+    for value in values:
+        key, is_assignment, text = value.partition('=')
+        if not is_assignment:
+            raise ValueError(f"{value} is not of the form SETTING=VALUE")
+        try:
+            assignments[key] = ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            assignments[key] = text
+    return assignments
+
+
+def settings_from_project_session(session_path: str, logger: logging.Logger = None) -> SettingsDict:
+    """
+    Rundown settings for the included floors of a project session saved by the PyQt GUI's
+    ProjectManager, in floor order. The settings.txt in the active CPT folder, if any, supplies
+    the other settings.
+    """
+    # The session holds a StructureModel, whose classes are importable from the project root
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.append(project_root)
+    if session_path.lower().endswith('.pkl'):
+        with open(session_path, 'rb') as file:
+            structure_model = pickle.load(file)
+    else:
+        from core_logic.session_store import ProjectSessionStore
+        structure_model = ProjectSessionStore(session_path).load()
+
+    gui_data = structure_model.gui_data
+    floors = [] if structure_model.floors_data is None else structure_model.floors_data.get_ordered_floors()
+    files = [
+        {'filename': os.path.basename(floor.filepath), 'typical': floor.typical_count, 'filepath': floor.filepath}
+        for floor in floors if floor.is_included and not floor.is_placeholder and floor.filepath
+    ]
+
+    root_directory = gui_data.cpt_active_folder_path or (os.path.dirname(files[0]['filepath']) if files else gui_data.root_directory)
+    settings_filename = os.path.join(root_directory, SETTINGS_FILENAME)
+    if os.path.isfile(settings_filename):
+        settings = read_settings_from_txt(settings_filename, SETTINGS_DEFAULT, logger=logger)
+    else:
+        settings = copy.deepcopy(SETTINGS_DEFAULT)
+        settings['ROOT_DIRECTORY'] = root_directory + '/'
+        settings['DRAWING_SCALE_1_TO'] = gui_data.drawing_scale_1_to
+
+    settings['FILES'] = files
+    if files:
+        settings['START_FROM_LEVEL_OR_INDEX'] = files[0]['filename'].split('.cpt')[0]
+        settings['END_AT_LEVEL_OR_INDEX'] = files[-1]['filename'].split('.cpt')[0]
+    return settings
+
+
+def _add_console_handler(logger: logging.Logger, log_format: str) -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonLogFormatter() if log_format == 'json' else logging.Formatter('%(asctime)s %(levelname)s %(message)s', '%H:%M:%S'))
+    logger.addHandler(handler)
+    return handler
+
+
+def _install_signal_handlers(control: RundownControl, logger: logging.Logger):
+    def interrupt(signum, frame):
+        if control.is_stop_requested:
+            logger.warning("Cancelling the rundown, the floor being solved is closed without saving")
+            control.request_cancel()
+        else:
+            logger.warning("Stopping the rundown after the floor being solved is saved, press Ctrl+C again to cancel")
+            control.request_stop()
+
+    def terminate(signum, frame):
+        logger.warning("Terminated, cancelling the rundown")
+        control.request_cancel()
+
+    signal.signal(signal.SIGINT, interrupt)
+    signal.signal(signal.SIGTERM, terminate)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the RAM Concept load rundown without a window.")
+    parser.add_argument('source', help=f"A {SETTINGS_FILENAME} file, or a project session ({', '.join(PROJECT_SESSION_EXTENSIONS)}) saved by the GUI.")
+    parser.add_argument('--resume', action='store_true', help="Resume from the checkpoint of a previous, stopped or failed, rundown.")
+    parser.add_argument('--set', nargs='*', default=[], metavar='SETTING=VALUE', help="Settings overrides, e.g. DO_CENTROID_CALCS=True.")
+    parser.add_argument('--log-format', choices=('text', 'json'), default='text', help="Console log format, json writes one object per line.")
+    parser.add_argument('--validate-only', action='store_true', help="Validate the settings and CPT files, without running the rundown.")
+    args = parser.parse_args(argv)
+
+    source = os.path.abspath(args.source)
+    if not os.path.isfile(source):
+        print(f"{args.source} does not exist", file=sys.stderr)
+        return EXIT_INVALID
+    try:
+        overrides = _parse_assignments(args.set)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return EXIT_INVALID
+    unknown_settings = [key for key in overrides if key not in SETTINGS_DEFAULT]
+    if unknown_settings:
+        print(f"Unknown settings: {', '.join(unknown_settings)}", file=sys.stderr)
+        return EXIT_INVALID
+
+    log_folder = os.path.join(os.path.dirname(source), 'logs')
+    if not os.path.isdir(log_folder):
+        os.makedirs(log_folder)
+    logger, log_filename = set_logger(os.path.join(log_folder, f"rundown_cli_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}"))
+    _add_console_handler(logger, args.log_format)
+    errors = _ErrorCounter()
+    logger.addHandler(errors)
+    logger.info(f"Logging to {log_filename}")
+
+    # Validation and the rundown end with exit() on errors they log, see debug_exit
+    try:
+        logger.info("Reading settings")
+        if source.lower().endswith(PROJECT_SESSION_EXTENSIONS):
+            settings = settings_from_project_session(source, logger=logger)
+        else:
+            settings = read_settings_from_txt(source, SETTINGS_DEFAULT, logger=logger)
+        # There is no one at the machine to look at the spreadsheet
+        settings['OPEN_CENTROID_EXCEL'] = False
+        settings.update(overrides)
+
+        logger.info("Validating settings")
+        validate_inputs(settings, logger=logger)
+        validate_settings(settings, logger=logger)
+        check_ram_files_are_present(settings, logger=logger)
+    except SystemExit:
+        return EXIT_INVALID
+    except Exception:
+        logger.exception("Could not read the settings")
+        return EXIT_INVALID
+    if errors.count:
+        logger.error(f"{errors.count} errors in the settings, the rundown was not run")
+        return EXIT_INVALID
+    if args.validate_only:
+        logger.info("Settings are valid")
+        return EXIT_OK
+
+    # Imported here so --validate-only and bad settings exit without loading ram_concept
+    from scripts.run_down_process import run_with_restarts
+
+    control = RundownControl()
+    _install_signal_handlers(control, logger)
+    try:
+        progress = run_with_restarts(settings, resume=args.resume, logger=logger, control=control)
+    except SystemExit:
+        return EXIT_FAILED
+    except Exception:
+        logger.exception("Rundown failed")
+        return EXIT_FAILED
+
+    if progress is None:
+        return EXIT_STOPPED
+    logger.info("Rundown completed")
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
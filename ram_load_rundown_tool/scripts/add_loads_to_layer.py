@@ -7,6 +7,9 @@ import math
 from .column_reactions import get_column_reactions, ColumnReactions
 
 from ram_concept.force_loading_layer import ForceLoadingLayer
+from ram_concept.line_segment_2D import LineSegment2D
+from .reaction_table import ReactionTable
+import numpy as np
 import math 
 
 
@@ -50,74 +53,75 @@ import math
 
 #     return total_dead_load, total_live_load
 
-def _add_column_loads(model: Model, column_data: dict[tuple,ColumnReactions], loading_layer: ForceLoadingLayer, load_types = None) -> tuple[float, float]:
+def round_transfer_loads(loads: np.ndarray) -> np.ndarray:
+    """Rounds loads up to the nearest 1 (>= 10) or 0.1 (< 10), negative loads are not transferred."""
+    return np.where(loads < 0, 0, np.where(loads >= 10, np.ceil(loads), np.ceil(loads*10)/10))
+
+def round_transfer_moments(moments: np.ndarray) -> np.ndarray:
+    """Moments keep their sign, positive moments are rounded up like loads and negative moments are rounded down."""
+    negative = np.where(moments <= 10, np.floor(moments), np.floor(moments*10)/10)
+    return np.where(moments > 0, round_transfer_loads(moments), negative)
+
+def _add_column_loads(model: Model, column_data: ReactionTable, loading_layer: ForceLoadingLayer, load_types = None) -> tuple[float, float]:
 
     """
     Adds loads to the columns in the model based on the provided data.
     
     Args:
     - model (Model): The RAM Concept model.
-    - column_data (list[ColumnReactions]): Data for the column loads.
+    - column_data (ReactionTable): Data for the column loads.
     - settings (dict): The dictionary containing all the settings.
 
     Returns:
     - tuple: Total dead load and total live load.
     """
 
-    if not load_types:
-        load_types = [('Fz','Fz')]
+    if not isinstance(column_data, ReactionTable):
+        column_data = ReactionTable.from_rows(column_data, 'COLUMNS')
 
     # load_types = [('Fz','Fz'),('Fr','Mx'),('Ms','My')]
     default_point_load = model.cad_manager.default_point_load
     default_point_load.elevation = 0
-    load_types_add = [x[1] for x in load_types]
-    for column_over in column_data.values():
-        transfer_point_load = loading_layer.add_point_load(column_over["location"])
-        transfer_point_load.zero_load_values()
-        transfer_point_load.elevation = 0
-        
-        for value in load_types:
-            load = column_over[value[0]]
-            if value[0] not in ['Ms','Mr'] or load > 0:
-                
-                if load < 0:
-                    load = 0
-                
-                elif load >= 10:
-                    load = math.ceil(load)
-
-                else:
-                    load = math.ceil(load*10)/10
-            else:
-                if load <= 10:
-                    load = math.floor(load)
-
-                else:
-                    load = math.floor(load*10)/10
-
-            if value[1] == 'Fz' and load != 0:
-                transfer_point_load.Fz = load
-                continue
-            if value[1] == 'Fx' and load != 0:
-                transfer_point_load.Fx = float(load)
-            if value[1] == 'Fy' and load != 0:
-                transfer_point_load.Fy = float(load)
-            if value[1] == 'Mx' and load != 0:
-                transfer_point_load.Mx = float(load)
-            if value[1] == 'My' and load != 0:
-                transfer_point_load.My = float(load)
-
-        # load = column_over["Fz"]
-        # if load < 0:
-        #     load = 0
-        
-        # elif load >= 10:
-        #     load = math.ceil(load)
-
-        # else:
-        #     load = math.ceil(load*10)/10
-
-        # transfer_point_load.Fz = load
+
+    rounded_loads = get_column_transfer_loads(column_data, load_types)
+
+    for i, (x, y) in enumerate(column_data.xy):
+        add_transfer_point_load(loading_layer, x, y, [(load_type, loads[i]) for load_type, loads in rounded_loads])
+
+
+def get_column_transfer_loads(column_data: ReactionTable, load_types = None) -> list[tuple[str, np.ndarray]]:
+    """The rounded point load of each column for each (reaction type, load type) in `load_types`, Fz only by default."""
+    if not load_types:
+        load_types = [('Fz','Fz')]
+
+    rounded_loads = []
+    for reaction_type, load_type in load_types:
+        if reaction_type in ['Ms','Mr']:
+            rounded_loads.append((load_type, round_transfer_moments(column_data.component(reaction_type))))
+        else:
+            rounded_loads.append((load_type, round_transfer_loads(column_data.component(reaction_type))))
+    return rounded_loads
+
+
+def add_transfer_point_load(loading_layer: ForceLoadingLayer, x: float, y: float, loads: list[tuple[str, float]]):
+    transfer_point_load = loading_layer.add_point_load(Point2D(float(x), float(y)))
+    transfer_point_load.zero_load_values()
+    transfer_point_load.elevation = 0
+    
+    for load_type, load in loads:
+        load = float(load)
+        if load == 0:
+            continue
+        if load_type == 'Fz':
+            transfer_point_load.Fz = load
+        elif load_type == 'Fx':
+            transfer_point_load.Fx = load
+        elif load_type == 'Fy':
+            transfer_point_load.Fy = load
+        elif load_type == 'Mx':
+            transfer_point_load.Mx = load
+        elif load_type == 'My':
+            transfer_point_load.My = load
 
 
 def add_column_loads(model: Model, level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename: str, lc_name: str, loading_layer: ForceLoadingLayer,load_types = None) -> tuple[float, float]:
@@ -136,41 +140,44 @@ def add_column_loads(model: Model, level_loads: dict[str, dict[str, dict[str, di
 
 from .wall_reactions import get_wall_group_reactions, get_wall_reactions, WallReactions
 
-def _add_wall_loads(model: Model, wall_over_data: dict[tuple,WallReactions], loading_layer: ForceLoadingLayer) -> tuple[float, float]:
+def _add_wall_loads(model: Model, wall_over_data: ReactionTable, loading_layer: ForceLoadingLayer) -> tuple[float, float]:
    
     """
     Adds loads to the walls in the model based on the provided data.
     
     Args:
     - model (Model): The RAM Concept model.
-    - wall_over_data (list[WallReactions]): Data for the wall loads.
+    - wall_over_data (ReactionTable): Data for the wall loads.
     - settings (dict): The dictionary containing all the settings.
 
     Returns:
     - tuple: Total dead load and total live load.
     
 """
-    total_load = 0
+    if not isinstance(wall_over_data, ReactionTable):
+        wall_over_data = ReactionTable.from_rows(wall_over_data, 'WALLS')
+
     default_line_load = model.cad_manager.default_line_load
     default_line_load.elevation = 0
-    # length = mathwall_over['locatoin'].x - wall_over['locatoin'].y
-    for location, wall_over in wall_over_data.items():
-        length = math.sqrt((location[1][0] - location[0][0])**2 + (location[1][1] - location[0][1])**2) 
-        load_per_length = wall_over["Fz"]/length
-        if load_per_length < 0:
-            load_per_length = 0
-        
-        elif load_per_length >= 10:
-            load_per_length = math.ceil(load_per_length)
 
-        else:
-            load_per_length = math.ceil(load_per_length*10)/10
+    loads_per_length = get_wall_transfer_loads(wall_over_data)
+
+    for segment, load_per_length in zip(wall_over_data.segments, loads_per_length):
+        add_transfer_line_load(model, loading_layer, segment, load_per_length)
+
+
+def get_wall_transfer_loads(wall_over_data: ReactionTable) -> np.ndarray:
+    """The rounded line load of each wall, kN/m along the wall line."""
+    return round_transfer_loads(wall_over_data.component('Fz')/wall_over_data.segment_lengths())
+
 
-        default_line_load.set_load_values(
-            0, 0, load_per_length, 0, 0
-        )  
+def add_transfer_line_load(model: Model, loading_layer: ForceLoadingLayer, segment: tuple[float, float, float, float], load_per_length: float):
+    x1, y1, x2, y2 = segment
+    model.cad_manager.default_line_load.set_load_values(
+        0, 0, float(load_per_length), 0, 0
+    )  
 
-        loading_layer.add_line_load(wall_over["location"])
+    loading_layer.add_line_load(LineSegment2D(Point2D(float(x1), float(y1)), Point2D(float(x2), float(y2))))
 
 
 def add_wall_loads(model: Model, level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename: str, lc_name: str, loading_layer: ForceLoadingLayer) -> tuple[float, float]:
@@ -0,0 +1,184 @@
+from .default_settings import SettingsDict
+from logging import Logger
+from datetime import datetime
+import hashlib
+import json
+import os
+import pickle
+
+CHECKPOINT_DIR_NAME = 'checkpoints'
+CHECKPOINT_MANIFEST_FILENAME = 'rundown_manifest.json'
+
+# Settings that only control how the rundown is run, not what it calculates
+RUN_CONTROL_SETTINGS = (
+    'DEBUG',
+    'EXIT_CODE_AFTER_X_SECONDS',
+    'MAX_ATTEMPTS_IF_ERRORS_RAISED',
+    'ATEMPT_RESTART_IF_ERROR',
+    'CREATE_BACKUP_FILES',
+    'CONCEPT_ENGINE_POOL_SIZE',
+    'RECYCLE_ENGINE_AFTER_N_MODELS',
+    'INCREMENTAL_RUNDOWN',
+    'INCREMENTAL_TRANSFER_TOLERANCE',
+    'SYNC_TRANSFER_LOADS',
+    'SKIP_UNCHANGED_SOLVES',
+    'STAGE_TIMING',
+    'TRACE_CONCEPT_API',
+    'RECORD_CONCEPT_SESSION',
+    'OPEN_CENTROID_EXCEL',
+    'START_FROM_LEVEL_OR_INDEX',
+    'END_AT_LEVEL_OR_INDEX',
+    'FILES',
+)
+
+def hash_file(filepath: str) -> str | None:
+    if not os.path.isfile(filepath):
+        return None
+    sha = hashlib.sha256()
+    with open(filepath, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def hash_settings(settings: SettingsDict, files: list[dict]) -> str:
+    """Hashes the settings that change the rundown results, together with the (typical expanded) list of files."""
+    relevant = {key: value for key, value in settings.items() if key not in RUN_CONTROL_SETTINGS}
+    relevant['FILES'] = [(file['filename'], os.path.normcase(os.path.abspath(file['filepath']))) for file in files]
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class RundownCheckpoint:
+    """
+    Persists the rundown after every floor so it can be resumed after a crash.
+
+    Each completed floor is pickled to `<ROOT_DIRECTORY>/checkpoints/floor_<index>.pkl` with its
+    level_loads and centroid data, and `rundown_manifest.json` records the progress index,
+    the settings hash and the hash of each CPT file as it was saved.
+    """
+
+    def __init__(self, settings: SettingsDict, files: list[dict], logger: Logger = None):
+        self.directory = os.path.join(settings['ROOT_DIRECTORY'], CHECKPOINT_DIR_NAME)
+        self.manifest_path = os.path.join(self.directory, CHECKPOINT_MANIFEST_FILENAME)
+        self.settings_hash = hash_settings(settings, files)
+        self.files = files
+        self.logger = logger
+        self.manifest = None
+
+    def _floor_path(self, index: int) -> str:
+        return os.path.join(self.directory, f'floor_{index:03d}.pkl')
+
+    def _write_manifest(self):
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(temp_path, self.manifest_path)
+
+    def _read_manifest(self) -> dict | None:
+        if not os.path.isfile(self.manifest_path):
+            return None
+        try:
+            with open(self.manifest_path) as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError) as exc:
+            if self.logger:
+                self.logger.warning(f"Could not read rundown checkpoint {self.manifest_path}: {exc}")
+            return None
+
+    def start(self, progress: int = 0):
+        """Starts a new checkpoint, keeping the floors before `progress` from the previous manifest."""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        previous = self._read_manifest() if progress else None
+        floors = previous['floors'][:progress] if previous else []
+
+        self.manifest = dict(
+            settings_hash = self.settings_hash,
+            started = datetime.now().isoformat(timespec='seconds'),
+            progress = len(floors),
+            completed = False,
+            floors = floors,
+        )
+        self._write_manifest()
+
+    def save_floor(self, index: int, file_dict: dict, floor_level_loads: dict, floor_centroid_data: dict | None):
+        if self.manifest is None:
+            self.start(index)
+
+        floor_path = self._floor_path(index)
+        temp_path = floor_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump(dict(filename=file_dict['filename'], level_loads=floor_level_loads, centroid_data=floor_centroid_data), file)
+        os.replace(temp_path, floor_path)
+
+        self.manifest['floors'] = self.manifest['floors'][:index]
+        self.manifest['floors'].append(dict(
+            index = index,
+            filename = file_dict['filename'],
+            filepath = file_dict['filepath'],
+            cpt_hash = hash_file(file_dict['filepath']),
+        ))
+        self.manifest['progress'] = index + 1
+        self._write_manifest()
+
+    def mark_completed(self):
+        if self.manifest is None:
+            return
+        self.manifest['completed'] = True
+        self._write_manifest()
+
+    def _first_invalid_floor(self, floors: list[dict]) -> int:
+        """Index of the first floor whose CPT no longer matches the file saved by the rundown."""
+        latest_by_filepath = {}
+        for floor in floors:
+            latest_by_filepath[floor['filepath']] = floor
+
+        first_invalid = len(floors)
+        for filepath, floor in latest_by_filepath.items():
+            if hash_file(filepath) != floor['cpt_hash']:
+                if self.logger:
+                    self.logger.warning(f"{floor['filename']} has changed since it was checkpointed, it will be re-run")
+                first_of_file = min(f['index'] for f in floors if f['filepath'] == filepath)
+                first_invalid = min(first_invalid, first_of_file)
+        return first_invalid
+
+    def restore(self) -> tuple[int, dict, dict] | None:
+        """
+        Loads the last checkpoint for these settings and files.
+
+        Returns:
+        - tuple: (progress, level_loads, centroid_data) to pass to `_run`, or None if there is nothing to resume.
+        """
+        manifest = self._read_manifest()
+        if not manifest:
+            return None
+
+        if manifest['settings_hash'] != self.settings_hash:
+            if self.logger:
+                self.logger.warning("Rundown checkpoint was made with different settings or files, starting from the top")
+            return None
+
+        if manifest['completed']:
+            return None
+
+        floors = manifest['floors']
+        if [f['filename'] for f in floors] != [f['filename'] for f in self.files[:len(floors)]]:
+            return None
+
+        progress = self._first_invalid_floor(floors)
+
+        level_loads = dict()
+        centroid_data = dict()
+        for index in range(progress):
+            with open(self._floor_path(index), 'rb') as file:
+                floor = pickle.load(file)
+            level_loads[floor['filename']] = floor['level_loads']
+            if floor['centroid_data'] is not None:
+                centroid_data[floor['filename']] = floor['centroid_data']
+
+        self.manifest = manifest
+        self.manifest['floors'] = floors[:progress]
+        self.manifest['progress'] = progress
+        self._write_manifest()
+
+        return progress, level_loads, centroid_data
@@ -6,6 +6,9 @@ from scripts.default_settings import SettingsDict
 import math
 from ram_concept.force_loading_layer import ForceLoadingLayer
 from ram_concept.load_combo_layer import LoadComboLayer
+from scripts.reaction_table import ReactionTable
+from scripts.reaction_harvester import harvest_layers
+from scripts.support_geometry import SupportGeometry
 
 class ColumnReactions(TypedDict):
     location: Point2D
@@ -21,54 +24,25 @@ class ColumnReactions(TypedDict):
     Mr: float
     Ms: float
 
-def get_column_reactions(model: Model, loading_layer: ForceLoadingLayer|LoadComboLayer ,self_weight_concrete_density = 0) -> List[ColumnReactions]:
+def get_column_reactions(model: Model, loading_layer: ForceLoadingLayer|LoadComboLayer ,self_weight_concrete_density = 0, geometry: SupportGeometry = None) -> ReactionTable:
     
     """
     Fetches the reactions for each column in the model.
     
     Args:
     - model (Model): The RAM Concept model.
-    - settings (dict): The dictionary containing all the settings.
+    - loading_layer: The loading or load combination layer to read.
+    - self_weight_concrete_density (float): Added to Fz for the self weight of the column below.
+    - geometry (SupportGeometry): The model's support snapshot, read from the model when not given.
 
     Returns:
-    - List[ColumnReactions]: A list of reactions for each column.
+    - ReactionTable: The reactions of each column, keyed by (x, y).
     """
-  
-    reactions = {}
 
-    for column_element in model.cad_manager.element_layer.column_elements_below:
-
-        if self_weight_concrete_density == 0:
-            column_self_weight = 0
+    if geometry is None:
+        geometry = SupportGeometry(model)
 
-        else:
-            height = column_element.height
-            width = column_element.b/1000
-            depth = column_element.d/1000
-        
-            if width == 0:
-                column_self_weight = self_weight_concrete_density * height * (math.pi * depth**2) / 4
-
-            else:
-                
-                column_self_weight =  self_weight_concrete_density * height * width * depth
-        
-        column_reaction = loading_layer.column_reaction(
-                column_element, ReactionContext.STANDARD
-        )
-        
-        location = column_element.location
-        reactions[(location.x,location.y)] = dict(
-                location = Point2D(location.x, location.y),
-                name = column_element.name,
-                Fr = column_reaction.x,
-                Fs = column_reaction.y,
-                Fz = column_reaction.z + column_self_weight,
-                Mr = column_reaction.rot_x,
-                Ms = column_reaction.rot_y,
-            )
-        
-    return reactions
+    return harvest_layers(geometry, 'COLUMNS', [('COLUMNS', loading_layer, self_weight_concrete_density)])['COLUMNS']
 
     # if over_multi:
 
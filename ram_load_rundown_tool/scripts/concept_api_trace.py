@@ -0,0 +1,223 @@
+from .default_settings import SettingsDict
+from collections import Counter
+from datetime import datetime
+from enum import Enum
+from logging import Logger
+import json
+import os
+import sys
+import time
+
+TRACE_FILENAME_PREFIX = 'concept_api_trace'
+
+# Plain values returned by the API, passed through as they are
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes, Enum)
+# ram_concept geometry value classes, cheap to use and passed back into the API as arguments
+_VALUE_TYPE_NAMES = {'Point2D', 'Point3D', 'LineSegment2D', 'Polygon2D'}
+
+_THIS_FILE = os.path.normcase(os.path.abspath(__file__))
+
+
+class ApiCallStats:
+    """Call count, latency and call sites of one API method or attribute."""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'call_sites')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.call_sites: Counter = Counter()
+
+    def add(self, seconds: float, call_site: str):
+        self.calls += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+        self.call_sites[call_site] += 1
+
+    def as_dict(self, n_call_sites: int = 5) -> dict:
+        return dict(
+            calls = self.calls,
+            seconds = self.seconds,
+            mean_ms = 1000*self.seconds/self.calls if self.calls else 0.0,
+            max_ms = 1000*self.max_seconds,
+            call_sites = dict(self.call_sites.most_common(n_call_sites)),
+        )
+
+
+class ConceptApiTracer:
+    """
+    Counts and times every call into the ram_concept API made through the objects it wraps.
+
+    `wrap(concept)` returns a proxy of the Concept; models, the cad manager, loading layers,
+    elements etc. returned from it are proxied in turn, so every method call, attribute read
+    (e.g. `point_load.location`) and attribute write (e.g. `column.i_factor = 1.0`) is recorded
+    as `<class>.<name>`, `<class>.<name> =` for writes, with the rundown line that made it.
+
+        tracer = ConceptApiTracer(logger=logger)
+        concept = tracer.wrap(concept)
+        ...
+        tracer.log_report()
+    """
+
+    def __init__(self, report_path: str = None, logger: Logger = None):
+        self.report_path = report_path
+        self.logger = logger
+        self.stats: dict[str, ApiCallStats] = dict()
+
+    @classmethod
+    def from_settings(cls, settings: SettingsDict, logger: Logger = None) -> 'ConceptApiTracer | None':
+        """A tracer reporting to `<ROOT_DIRECTORY>/logs/concept_api_trace_<time>.json`, or None if TRACE_CONCEPT_API is off."""
+        if not settings['TRACE_CONCEPT_API']:
+            return None
+        report_path = None
+        if settings['ROOT_DIRECTORY']:
+            log_folder = os.path.join(settings['ROOT_DIRECTORY'], 'logs')
+            if not os.path.isdir(log_folder):
+                os.makedirs(log_folder)
+            report_path = os.path.join(log_folder, f"{TRACE_FILENAME_PREFIX}_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}.json")
+        return cls(report_path, logger=logger)
+
+    def wrap(self, value):
+        """`value` with API objects, also inside lists and tuples, replaced by tracing proxies."""
+        if isinstance(value, (_TracingProxy, *_PLAIN_TYPES)):
+            return value
+        if isinstance(value, list):
+            return [self.wrap(item) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self.wrap(item) for item in value)
+        if type(value).__name__ in _VALUE_TYPE_NAMES:
+            return value
+        return _TracingProxy(value, self)
+
+    def record(self, name: str, seconds: float):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = ApiCallStats()
+        stats.add(seconds, _call_site())
+
+    @property
+    def total_calls(self) -> int:
+        return sum(stats.calls for stats in self.stats.values())
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(stats.seconds for stats in self.stats.values())
+
+    def report(self, n_methods: int = 15, n_call_sites: int = 2) -> str:
+        """The API methods taking the most time, with their hottest call sites."""
+        lines = [f"RAM Concept API: {self.total_calls} calls taking {self.total_seconds:.2f} s"]
+        if not self.stats:
+            return lines[0]
+
+        lines.append(f"  {'Method':<45} {'Calls':>8} {'Total s':>9} {'Mean ms':>9} {'Max ms':>9}")
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True)[:n_methods]:
+            lines.append(f"  {name:<45} {stats.calls:>8} {stats.seconds:>9.2f} {1000*stats.seconds/stats.calls:>9.3f} {1000*stats.max_seconds:>9.3f}")
+            for call_site, calls in stats.call_sites.most_common(n_call_sites):
+                lines.append(f"      {calls:>8} from {call_site}")
+        return '\n'.join(lines)
+
+    def save_report(self):
+        if not self.report_path:
+            return
+        report = dict(
+            total_calls = self.total_calls,
+            total_seconds = self.total_seconds,
+            methods = {name: stats.as_dict() for name, stats in sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True)},
+        )
+        with open(self.report_path, 'w') as file:
+            json.dump(report, file, indent=4)
+
+    def log_report(self):
+        """Logs the report and writes the full report to `report_path`."""
+        try:
+            self.save_report()
+        except OSError as exc:
+            if self.logger:
+                self.logger.warning(f"Could not write RAM Concept API trace to {self.report_path}: {exc}")
+            self.report_path = None
+        if not self.logger:
+            return
+        for line in self.report().splitlines():
+            self.logger.info(line)
+        if self.report_path:
+            self.logger.info(f"RAM Concept API trace written to {self.report_path}")
+
+
+def _call_site() -> str:
+    """`file:line in function` of the first frame outside this module."""
+    frame = sys._getframe(2)
+    while frame is not None and os.path.normcase(frame.f_code.co_filename) == _THIS_FILE:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def _unwrap(value):
+    if isinstance(value, _TracingProxy):
+        return object.__getattribute__(value, '_target')
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    return value
+
+
+class _TracingProxy:
+    """Forwards attribute access to an API object, timing and recording each access through its tracer."""
+
+    __slots__ = ('_target', '_tracer', '_type_name')
+
+    def __init__(self, target, tracer: ConceptApiTracer):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_tracer', tracer)
+        object.__setattr__(self, '_type_name', type(target).__name__)
+
+    def __getattr__(self, name: str):
+        target = object.__getattribute__(self, '_target')
+        tracer: ConceptApiTracer = object.__getattribute__(self, '_tracer')
+        qualified_name = f"{object.__getattribute__(self, '_type_name')}.{name}"
+
+        start = time.perf_counter()
+        value = getattr(target, name)
+        elapsed = time.perf_counter() - start
+
+        if not callable(value) or isinstance(value, type):
+            tracer.record(qualified_name, elapsed)
+            return tracer.wrap(value)
+
+        def traced_method(*args, **kwargs):
+            args = _unwrap(args)
+            kwargs = {key: _unwrap(item) for key, item in kwargs.items()}
+            start = time.perf_counter()
+            try:
+                return tracer.wrap(value(*args, **kwargs))
+            finally:
+                tracer.record(qualified_name, time.perf_counter() - start)
+
+        return traced_method
+
+    def __setattr__(self, name: str, value):
+        target = object.__getattribute__(self, '_target')
+        tracer: ConceptApiTracer = object.__getattribute__(self, '_tracer')
+        start = time.perf_counter()
+        setattr(target, name, _unwrap(value))
+        tracer.record(f"{object.__getattribute__(self, '_type_name')}.{name} =", time.perf_counter() - start)
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, '_target') == _unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, '_target'))
+
+    def __iter__(self):
+        tracer = object.__getattribute__(self, '_tracer')
+        return (tracer.wrap(item) for item in object.__getattribute__(self, '_target'))
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, '_target'))
+
+    def __repr__(self):
+        return f"<traced {object.__getattribute__(self, '_target')!r}>"
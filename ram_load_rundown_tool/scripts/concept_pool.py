@@ -0,0 +1,149 @@
+from ram_concept.concept import Concept
+from contextlib import contextmanager
+from logging import Logger
+from typing import Callable
+import queue
+import threading
+
+
+def start_headless_concept() -> Concept:
+    return Concept.start_concept(headless=True)
+
+
+class _PooledEngine:
+    def __init__(self, concept: Concept, engine_id: int):
+        self.concept = concept
+        self.engine_id = engine_id
+        self.models_opened = 0
+
+
+class ConceptEnginePool:
+    """
+    Hands out headless RAM Concept engines for the load rundown.
+
+    Engines are started lazily up to `max_engines`, reused across floors and
+    recycled (shut down and replaced) after `recycle_after_n_models` models or
+    whenever an error is raised while a model is open on them.
+
+    Usage:
+        pool = ConceptEnginePool(max_engines=1, recycle_after_n_models=10, logger=logger)
+        try:
+            with pool.engine() as concept:
+                model = concept.open_file(filepath)
+                ...
+        finally:
+            pool.shut_down()
+    """
+
+    def __init__(self, max_engines: int = 1, recycle_after_n_models: int = 10, concept_factory: Callable[[], Concept] = None, logger: Logger = None):
+        if max_engines < 1:
+            raise ValueError(f"max_engines must be at least 1, got {max_engines}")
+
+        self.max_engines = max_engines
+        self.recycle_after_n_models = recycle_after_n_models
+        self.concept_factory = concept_factory or start_headless_concept
+        self.logger = logger
+
+        self._idle: queue.LifoQueue[_PooledEngine] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._engines_alive = 0
+        self._next_engine_id = 1
+        self._is_shut_down = False
+
+        self.engines_started = 0
+        self.engines_recycled = 0
+
+    def _log(self, message: str):
+        if self.logger:
+            self.logger.info(message)
+
+    def _start_engine(self) -> _PooledEngine:
+        with self._lock:
+            engine_id = self._next_engine_id
+            self._next_engine_id += 1
+        self._log(f"Starting RAM Concept engine {engine_id}")
+        try:
+            concept = self.concept_factory()
+        except Exception:
+            with self._lock:
+                self._engines_alive -= 1
+            raise
+        self.engines_started += 1
+        return _PooledEngine(concept, engine_id)
+
+    def _stop_engine(self, engine: _PooledEngine):
+        with self._lock:
+            self._engines_alive -= 1
+        try:
+            engine.concept.shut_down()
+        except Exception as exc:
+            if self.logger:
+                self.logger.warning(f"RAM Concept engine {engine.engine_id} did not shut down cleanly: {exc}")
+
+    def acquire(self) -> _PooledEngine:
+        if self._is_shut_down:
+            raise RuntimeError("ConceptEnginePool has been shut down")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_start = self._engines_alive < self.max_engines
+            if can_start:
+                self._engines_alive += 1
+
+        if can_start:
+            return self._start_engine()
+
+        return self._idle.get()
+
+    def release(self, engine: _PooledEngine, is_error: bool = False):
+        engine.models_opened += 1
+
+        if self._is_shut_down:
+            self._stop_engine(engine)
+            return
+
+        if is_error:
+            self._log(f"Recycling RAM Concept engine {engine.engine_id} after an error")
+            self.engines_recycled += 1
+            self._stop_engine(engine)
+            return
+
+        if self.recycle_after_n_models and engine.models_opened >= self.recycle_after_n_models:
+            self._log(f"Recycling RAM Concept engine {engine.engine_id} after {engine.models_opened} models")
+            self.engines_recycled += 1
+            self._stop_engine(engine)
+            return
+
+        self._idle.put(engine)
+
+    @contextmanager
+    def engine(self):
+        engine = self.acquire()
+        try:
+            yield engine.concept
+        except BaseException:
+            self.release(engine, is_error=True)
+            raise
+        else:
+            self.release(engine)
+
+    def shut_down(self):
+        """Shuts down every idle engine; engines still in use are shut down when released."""
+        self._is_shut_down = True
+        while True:
+            try:
+                engine = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._log(f"Shutting down RAM Concept engine {engine.engine_id}")
+            self._stop_engine(engine)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shut_down()
@@ -0,0 +1,321 @@
+from .default_settings import SettingsDict
+from collections import Counter, defaultdict
+from datetime import datetime
+from enum import Enum
+from logging import Logger
+import copy
+import gzip
+import importlib
+import json
+import os
+
+SESSION_FILENAME_PREFIX = 'concept_session'
+SESSION_FORMAT_VERSION = 1
+
+_ROOT_PATH = 'concept'
+_PLAIN_TYPES = (type(None), bool, int, float, str)
+
+
+class ReplayMissError(KeyError):
+    """The rundown made a RAM Concept API call that is not in the recorded session."""
+
+
+def _encode_value(value, object_id) -> object:
+    """JSON for a value passed to or returned from the API; API objects become {'ref': id}."""
+    if isinstance(value, Enum):
+        return {'enum': f"{type(value).__module__}:{type(value).__qualname__}.{value.name}"}
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item, object_id) for item in value]
+    type_name = type(value).__name__
+    if type_name == 'Point2D':
+        return {'Point2D': [value.x, value.y]}
+    if type_name == 'LineSegment2D':
+        return {'LineSegment2D': [[value.start_point.x, value.start_point.y], [value.end_point.x, value.end_point.y]]}
+    return {'ref': object_id(value)}
+
+
+def _args_key(args: tuple, kwargs: dict, object_id) -> str:
+    def encode(value):
+        # Files are keyed by name so a session replays from any folder
+        if isinstance(value, str) and os.path.isabs(value):
+            return os.path.basename(value)
+        return _encode_value(value, object_id)
+    return json.dumps([[encode(arg) for arg in args], {key: encode(value) for key, value in sorted(kwargs.items())}], separators=(',', ':'))
+
+
+def _session_path(settings: SettingsDict) -> str:
+    log_folder = os.path.join(settings['ROOT_DIRECTORY'], 'logs')
+    if not os.path.isdir(log_folder):
+        os.makedirs(log_folder)
+    return os.path.join(log_folder, f"{SESSION_FILENAME_PREFIX}_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}.json.gz")
+
+
+class ConceptSessionRecorder:
+    """
+    Records the RAM Concept API calls of a rundown, and what they returned, into a session file
+    that `ConceptSessionReplay` can run the rundown against without RAM Concept.
+
+    API objects are identified by how they were reached, e.g. the loading layer returned by
+    `force_loading_layer('Other Dead Loading')` on the cad manager of the model opened from
+    `L05.cpt`, so the same calls made again on replay find the same objects. Each call or
+    attribute read is recorded with its arguments, in the order it was made.
+
+    `save()` writes gzipped JSON: the objects by path, the methods of each object, the recorded
+    values of each call and the settings of the run.
+    """
+
+    def __init__(self, settings: SettingsDict, session_path: str = None, logger: Logger = None):
+        self.settings = settings
+        self.session_path = session_path
+        self.logger = logger
+        self.object_ids: dict[str, int] = {_ROOT_PATH: 0}
+        self.methods: set[str] = set()
+        self.calls: dict[str, list] = defaultdict(list)
+
+    @classmethod
+    def from_settings(cls, settings: SettingsDict, logger: Logger = None) -> 'ConceptSessionRecorder | None':
+        """A recorder saving to `<ROOT_DIRECTORY>/logs/concept_session_<time>.json.gz`, or None if RECORD_CONCEPT_SESSION is off."""
+        if not settings['RECORD_CONCEPT_SESSION']:
+            return None
+        return cls(settings, _session_path(settings), logger=logger)
+
+    def wrap(self, concept):
+        return _RecordingProxy(concept, 0, self)
+
+    def _child_id(self, key: str, index: int = None) -> int:
+        path = key if index is None else f"{key}[{index}]"
+        object_id = self.object_ids.get(path)
+        if object_id is None:
+            object_id = self.object_ids[path] = len(self.object_ids)
+        return object_id
+
+    def _wrap_result(self, value, key: str, index: int = None):
+        """`value` returned by the call `key`, with API objects, also inside lists, replaced by recording proxies."""
+        if isinstance(value, (_RecordingProxy, Enum, *_PLAIN_TYPES)) or type(value).__name__ in ('Point2D', 'LineSegment2D'):
+            return value
+        if isinstance(value, (list, tuple)):
+            return type(value)(self._wrap_result(item, key, i) for i, item in enumerate(value))
+        return _RecordingProxy(value, self._child_id(key, index), self)
+
+    def record(self, key: str, value):
+        self.calls[key].append(_encode_value(value, _recorded_object_id))
+
+    def save(self):
+        """Writes the session recorded so far to `session_path`."""
+        if not self.session_path:
+            return
+        session = dict(
+            version = SESSION_FORMAT_VERSION,
+            settings = self.settings,
+            object_ids = self.object_ids,
+            methods = sorted(self.methods),
+            calls = self.calls,
+        )
+        temp_path = self.session_path + '.tmp'
+        try:
+            with gzip.open(temp_path, 'wt') as file:
+                json.dump(session, file, separators=(',', ':'), default=str)
+            os.replace(temp_path, self.session_path)
+        except OSError as exc:
+            if self.logger:
+                self.logger.warning(f"Could not save RAM Concept session to {self.session_path}: {exc}")
+            return
+        if self.logger:
+            self.logger.info(f"RAM Concept session of {sum(len(values) for values in self.calls.values())} calls recorded to {self.session_path}")
+
+
+def _recorded_object_id(value) -> int:
+    return object.__getattribute__(value, '_object_id') if isinstance(value, _RecordingProxy) else -1
+
+
+def _unwrap(value):
+    if isinstance(value, _RecordingProxy):
+        return object.__getattribute__(value, '_target')
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    return value
+
+
+class _RecordingProxy:
+    __slots__ = ('_target', '_object_id', '_recorder')
+
+    def __init__(self, target, object_id: int, recorder: ConceptSessionRecorder):
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_object_id', object_id)
+        object.__setattr__(self, '_recorder', recorder)
+
+    def __getattr__(self, name: str):
+        target = object.__getattribute__(self, '_target')
+        object_id = object.__getattribute__(self, '_object_id')
+        recorder: ConceptSessionRecorder = object.__getattribute__(self, '_recorder')
+        value = getattr(target, name)
+
+        if not callable(value) or isinstance(value, type):
+            key = f"{object_id}|{name}"
+            value = recorder._wrap_result(value, key)
+            recorder.record(key, value)
+            return value
+
+        recorder.methods.add(f"{object_id}|{name}")
+
+        def recording_method(*args, **kwargs):
+            key = f"{object_id}|{name}|{_args_key(args, kwargs, _recorded_object_id)}"
+            result = value(*_unwrap(args), **{argument: _unwrap(item) for argument, item in kwargs.items()})
+            result = recorder._wrap_result(result, key)
+            recorder.record(key, result)
+            return result
+
+        return recording_method
+
+    def __setattr__(self, name: str, value):
+        setattr(object.__getattribute__(self, '_target'), name, _unwrap(value))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, '_target') == _unwrap(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, '_target'))
+
+
+class ConceptSessionReplay:
+    """
+    Replays a session recorded by `ConceptSessionRecorder`, answering each API call the rundown
+    makes with the value recorded for the same call. Repeated calls get the recorded values in
+    order, then the last one. Attribute writes and calls recorded only as returning None (e.g.
+    `save_file` of a backup with another timestamp) are accepted; any other call that was not
+    recorded raises `ReplayMissError`.
+
+        replay = ConceptSessionReplay.load(session_path)
+        engine_pool = ConceptEnginePool(concept_factory=replay.concept)
+    """
+
+    def __init__(self, session: dict):
+        if session.get('version') != SESSION_FORMAT_VERSION:
+            raise ValueError(f"Unsupported RAM Concept session version {session.get('version')}, expected {SESSION_FORMAT_VERSION}")
+        self.settings: SettingsDict = session['settings']
+        self.object_ids: dict[str, int] = session['object_ids']
+        self.methods: set[str] = set(session['methods'])
+        self.calls: dict[str, list] = session['calls']
+        self._calls_made: Counter = Counter()
+        self._objects: dict[int, _ReplayObject] = dict()
+
+        # Side effect only calls, replayed whatever their arguments
+        self._none_methods = set()
+        values_by_method = defaultdict(list)
+        for key, values in self.calls.items():
+            values_by_method['|'.join(key.split('|', 2)[:2])].extend(values)
+        for method in self.methods:
+            if all(value is None for value in values_by_method.get(method, [None])):
+                self._none_methods.add(method)
+
+    @classmethod
+    def load(cls, session_path: str) -> 'ConceptSessionReplay':
+        with gzip.open(session_path, 'rt') as file:
+            return cls(json.load(file))
+
+    def replay_settings(self, root_directory: str) -> SettingsDict:
+        """
+        The recorded settings with the project moved into `root_directory`, where an empty
+        placeholder is written for each CPT. Solve skipping, the incremental cache and backups
+        are turned off, as they depend on files of the original project.
+        """
+        settings = copy.deepcopy(self.settings)
+        settings['ROOT_DIRECTORY'] = root_directory
+        for file in settings['FILES']:
+            file['filepath'] = os.path.join(root_directory, file['filename'])
+            if not os.path.isfile(file['filepath']):
+                open(file['filepath'], 'w').close()
+        settings['SKIP_UNCHANGED_SOLVES'] = False
+        settings['INCREMENTAL_RUNDOWN'] = False
+        settings['CREATE_BACKUP_FILES'] = False
+        settings['RECORD_CONCEPT_SESSION'] = False
+        settings['OPEN_CENTROID_EXCEL'] = False
+        return settings
+
+    def rewind(self):
+        """Starts the replay again from the first recorded call."""
+        self._calls_made.clear()
+
+    def concept(self) -> '_ReplayObject':
+        """A replayed Concept, for use as the `concept_factory` of a `ConceptEnginePool`."""
+        return _ReplayConcept(self, 0)
+
+    def _object(self, object_id: int) -> '_ReplayObject':
+        replay_object = self._objects.get(object_id)
+        if replay_object is None:
+            replay_object = self._objects[object_id] = _ReplayObject(self, object_id)
+        return replay_object
+
+    def _decode(self, value):
+        if isinstance(value, list):
+            return [self._decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if 'ref' in value:
+            return self._object(value['ref'])
+        if 'Point2D' in value:
+            from ram_concept.point_2D import Point2D
+            return Point2D(*value['Point2D'])
+        if 'LineSegment2D' in value:
+            from ram_concept.point_2D import Point2D
+            from ram_concept.line_segment_2D import LineSegment2D
+            start, end = value['LineSegment2D']
+            return LineSegment2D(Point2D(*start), Point2D(*end))
+        if 'enum' in value:
+            module_name, qualified_name = value['enum'].split(':')
+            class_name, member_name = qualified_name.rsplit('.', 1)
+            return getattr(getattr(importlib.import_module(module_name), class_name), member_name)
+        return value
+
+    def _replay(self, key: str, method: str = None):
+        values = self.calls.get(key)
+        if not values:
+            if method is not None and method in self._none_methods:
+                return None
+            raise ReplayMissError(f"RAM Concept call {key} was not recorded; the session must be recorded with the same settings and SKIP_UNCHANGED_SOLVES off")
+        n = self._calls_made[key]
+        self._calls_made[key] += 1
+        return self._decode(values[min(n, len(values) - 1)])
+
+
+class _ReplayObject:
+    __slots__ = ('_replay', '_object_id')
+
+    def __init__(self, replay: ConceptSessionReplay, object_id: int):
+        object.__setattr__(self, '_replay', replay)
+        object.__setattr__(self, '_object_id', object_id)
+
+    def __getattr__(self, name: str):
+        replay: ConceptSessionReplay = object.__getattribute__(self, '_replay')
+        object_id = object.__getattribute__(self, '_object_id')
+        method = f"{object_id}|{name}"
+
+        if method not in replay.methods:
+            return replay._replay(method)
+
+        def replayed_method(*args, **kwargs):
+            key = f"{method}|{_args_key(args, kwargs, _replayed_object_id)}"
+            return replay._replay(key, method)
+
+        return replayed_method
+
+    def __setattr__(self, name: str, value):
+        pass
+
+    def __repr__(self):
+        return f"<replayed RAM Concept object {object.__getattribute__(self, '_object_id')}>"
+
+
+class _ReplayConcept(_ReplayObject):
+    """The engine itself is not part of the session, see `ConceptEnginePool`."""
+
+    def shut_down(self):
+        pass
+
+
+def _replayed_object_id(value) -> int:
+    return object.__getattribute__(value, '_object_id') if isinstance(value, _ReplayObject) else -1
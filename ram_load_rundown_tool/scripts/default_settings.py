@@ -31,6 +31,20 @@ class SettingsDict(TypedDict):
     EQ_FACTORS_LLR: bool
     EQ_FACTORS_LLUR: bool
     CREATE_BACKUP_FILES: bool
+    CONCEPT_ENGINE_POOL_SIZE: int
+    RECYCLE_ENGINE_AFTER_N_MODELS: int
+    SOLVE_TYPICAL_FLOORS_ONCE: bool
+    INCREMENTAL_RUNDOWN: bool
+    INCREMENTAL_TRANSFER_TOLERANCE: float
+    SYNC_TRANSFER_LOADS: bool
+    SKIP_UNCHANGED_SOLVES: bool
+    COLUMN_STIFFNESS_TOLERANCE: float
+    COLUMN_STIFFNESS_MAX_ITERATIONS: int
+    SUPPORT_MATCH_TOLERANCE: float
+    STAGE_TIMING: bool
+    TRACE_CONCEPT_API: bool
+    RECORD_CONCEPT_SESSION: bool
+    OPEN_CENTROID_EXCEL: bool
 
 SETTINGS_DEFAULT: SettingsDict = {
     "REINFORCED_CONCRETE_DENSITY": 24.0,
@@ -63,4 +77,18 @@ SETTINGS_DEFAULT: SettingsDict = {
     'EQ_FACTORS_LLR': 0.3,
     'EQ_FACTORS_LLUR': 0.6,
     'CREATE_BACKUP_FILES': False,
+    'CONCEPT_ENGINE_POOL_SIZE': 1,
+    'RECYCLE_ENGINE_AFTER_N_MODELS': 10,
+    'SOLVE_TYPICAL_FLOORS_ONCE': False,
+    'INCREMENTAL_RUNDOWN': False,
+    'INCREMENTAL_TRANSFER_TOLERANCE': 0.1,
+    'SYNC_TRANSFER_LOADS': False,
+    'SKIP_UNCHANGED_SOLVES': False,
+    'COLUMN_STIFFNESS_TOLERANCE': 0.0,
+    'COLUMN_STIFFNESS_MAX_ITERATIONS': 1,
+    'SUPPORT_MATCH_TOLERANCE': 0.001,
+    'STAGE_TIMING': True,
+    'TRACE_CONCEPT_API': False,
+    'RECORD_CONCEPT_SESSION': False,
+    'OPEN_CENTROID_EXCEL': True,
 }
@@ -5,17 +5,22 @@ from .default_settings import SettingsDict
 from ram_concept.force_loading_layer import ForceLoadingLayer
 
 
-def delete_loadings(loading_layer:ForceLoadingLayer, area_loads:bool = True, line_loads: bool = True, point_loads: bool = True) -> None:
-
+def delete_loadings(loading_layer:ForceLoadingLayer, area_loads:bool = True, line_loads: bool = True, point_loads: bool = True) -> int:
+    """Deletes the chosen kinds of loads from `loading_layer`; returns how many were deleted."""
+    n_deleted = 0
     if area_loads:
         for load in loading_layer.area_loads:
             load.delete()
+            n_deleted += 1
     if line_loads:
         for load in loading_layer.line_loads:
             load.delete()
+            n_deleted += 1
     if point_loads:
         for load in loading_layer.point_loads:
             load.delete()
+            n_deleted += 1
+    return n_deleted
 
 def delete_transfer_loads(model: Model, settings: SettingsDict) -> None:
     """
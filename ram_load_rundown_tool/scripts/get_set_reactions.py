@@ -6,30 +6,23 @@ from ram_concept.result_layers import ReactionContext
 from .error_handling import debug_exit
 from .column_reactions import ColumnReactions, get_column_reactions
 from .wall_reactions import WallReactions, get_wall_group_reactions
+from .reaction_table import ReactionTable
+from .reaction_harvester import get_load_layer
+from .support_geometry import SupportGeometry, StructureColumnGeometry
+from .spatial_index import SUPPORT_MATCH_TOLERANCE
 from logging import Logger
 import math
+import numpy as np
 from .default_settings import SettingsDict
 
 
-def set_reactions(model:Model,level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename,lc_name: str,support_type_name: str,settings: SettingsDict,self_weight_concrete_density = 0, logger: Logger = None):
-    _lc_name = settings.get(lc_name)
-
-    if _lc_name:
-        layer_name = _lc_name
-        key = lc_name
-    else:
-        layer_name = lc_name
-        key = lc_name
-    load_layer = model.cad_manager.force_loading_layer(layer_name)
-    if not load_layer:
-        load_layer = model.cad_manager.load_combo_layer(layer_name)
-    if not load_layer:
-        logger.error(f"Load layer {layer_name} not found in Loading Layers or Load Combinations Layers")
-        debug_exit(settings, is_error=True, logger=logger) 
+def set_reactions(model:Model,level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename,lc_name: str,support_type_name: str,settings: SettingsDict,self_weight_concrete_density = 0, logger: Logger = None, geometry: SupportGeometry = None):
+    key = lc_name
+    load_layer = get_load_layer(model, lc_name, settings, logger=logger)
     if support_type_name == 'COLUMNS':
-        level_loads[filename]['COLUMNS'][key] = get_column_reactions(model, load_layer,self_weight_concrete_density = self_weight_concrete_density)
+        level_loads[filename]['COLUMNS'][key] = get_column_reactions(model, load_layer,self_weight_concrete_density = self_weight_concrete_density, geometry=geometry)
     elif support_type_name == 'WALLS':
-        level_loads[filename]['WALLS'][key] = get_wall_group_reactions(model, load_layer, self_weight_concrete_density=self_weight_concrete_density)
+        level_loads[filename]['WALLS'][key] = get_wall_group_reactions(model, load_layer, self_weight_concrete_density=self_weight_concrete_density, geometry=geometry)
 
 
 # def set_reactions(model:Model,level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename,: str,support_type_name: str,settings,self_weight_concrete_density = 0, logger: Logger = None):
@@ -43,67 +36,79 @@ def set_reactions(model:Model,level_loads: dict[str, dict[str, dict[str, dict[st
 #         level_loads[filename]['COLUMNS'][lc_name] = get_column_reactions(model, load_layer,self_weight_concrete_density = self_weight_concrete_density)
 #     elif support_type_name == 'WALLS':
 
-#         level_loads[filename]['WALLS'][lc_name] = get_wall_group_reactions(model, load_layer, self_weight_concrete_density=self_weight_concrete_density)
+#         level_loads[filename]['WALLS'][lc_name] = get_wall_group_reactions(model, load_layer, self_weight_concrete_density=self_weight_concrete_density, geometry=geometry)
 
 
-def get_ultimate_column_reactions(level_loads: dict[str, dict[str, dict[str, dict[str, float]]]],filename, logger: Logger = None):
-    ultimate_columns = {}
-    for dead_location, dead_value in level_loads[filename]['COLUMNS']['ALL_DEAD_LC'].items():
+def get_ultimate_column_reactions(level_loads: dict[str, dict[str, dict[str, ReactionTable]]],filename, logger: Logger = None, tolerance: float = SUPPORT_MATCH_TOLERANCE) -> ReactionTable:
+    all_dead = level_loads[filename]['COLUMNS']['ALL_DEAD_LC']
+    all_live = level_loads[filename]['COLUMNS']['ALL_LIVE_LOADS']
 
-        all_live_value = level_loads[filename]['COLUMNS']['ALL_LIVE_LOADS'].get(dead_location)
-        if not all_live_value:
-            raise Exception(f"Location {dead_location} not found in ALL LIVE LOADS")
+    dead_Fz = all_dead.component('Fz')
+    if all_dead.has_same_keys(all_live):
+        live_Fz = all_live.component('Fz')
+    else:
+        match = all_live.match(all_dead.keys_sorted, tolerance)
+        if not match.is_complete:
+            raise Exception(f"Location {all_dead.keys_sorted[match.unmatched[0]]} not found in ALL LIVE LOADS")
+        if len(match.ambiguous) and logger:
+            logger.warning(f"{len(match.ambiguous)} columns of {filename} have more than one ALL LIVE LOADS column within {tolerance}, the nearest is used")
+        live_Fz = all_live.component('Fz')[match.index]
 
-        ultimate_columns[dead_location] = {'location': dead_location, 'Fz':max((1.2*dead_value['Fz'] + 1.5*all_live_value['Fz'],1.35*dead_value["Fz"]))}
+    ultimate_columns = all_dead.scale(0)
+    ultimate_columns.component('Fz')[:] = np.maximum(1.2*dead_Fz + 1.5*live_Fz, 1.35*dead_Fz)
 
     return ultimate_columns
 
-def update_column_stiffness(model: Model, ultimate_columns: dict[str, dict], settings: SettingsDict ) -> list[ColumnReactions]:
-
+def get_column_i_factors(ultimate_columns: ReactionTable, structure_columns: StructureColumnGeometry, settings: SettingsDict) -> np.ndarray:
+    """
+    The cracked section stiffness factor of each structure column from its axial load ratio
+    N*/(Ag f'c), in the order of `structure_columns`.
+    """
     max_column_stiffness_ratio = settings['MAX_COLUMN_STIFFNESS_RATIO']
     min_column_stiffness_ratio = settings['MIN_COLUMN_STIFFNESS_RATIO']
-    
-    for column_element in model.cad_manager.structure_layer.columns_below:
-        location = column_element.location
-
-        width = column_element.b
-        depth = column_element.d
-    
-        if width == 0:
-            Ag = (math.pi * depth**2) / 4
-
-        else:
-            
-            Ag =  width * depth
-
-        N_star =  ultimate_columns[(location.x,location.y)]['Fz']*1000 #kN to N
-
-        f_c = column_element.concrete.fc_final
-        
-        check = N_star/(Ag*f_c)
-
-        new_i_factor = 0.3
-        
-        if check >= 0.5:
-            new_i_factor = 0.8
-            
-        elif check >= 0.2:
-            new_i_factor = 0.5 + (check-0.2)
-        
-        elif check >= 0:
-            new_i_factor = 0.3 + check*(0.2/0.3)
-
-        else:
-            new_i_factor = 0.3
-            # raise Exception(f"Column {column_element.name} has negative axial load, logic should prevent this")
-                
-        new_i_factor = math.floor(new_i_factor*1000)/1000
-        if new_i_factor > max_column_stiffness_ratio or new_i_factor > 1:
-            new_i_factor = min(max_column_stiffness_ratio,1)
-        if new_i_factor < min_column_stiffness_ratio or new_i_factor < 0:
-            new_i_factor = max(min_column_stiffness_ratio,0)
-
-        column_element.i_factor = new_i_factor
+
+    # Structure layer columns are matched to the column elements' reactions within tolerance
+    match = ultimate_columns.match(structure_columns.keys, settings['SUPPORT_MATCH_TOLERANCE'])
+    if not match.is_complete:
+        raise KeyError(structure_columns.keys[match.unmatched[0]])
+
+    N_star = ultimate_columns.component('Fz')[match.index]*1000 #kN to N
+    check = N_star/(structure_columns.areas*structure_columns.fc)
+
+    # A negative axial load keeps the minimum 0.3, logic should prevent it
+    new_i_factors = np.where(check >= 0.5, 0.8,
+                    np.where(check >= 0.2, 0.5 + (check-0.2),
+                    np.where(check >= 0, 0.3 + check*(0.2/0.3), 0.3)))
+
+    new_i_factors = np.floor(new_i_factors*1000)/1000
+    upper = min(max_column_stiffness_ratio,1)
+    new_i_factors = np.where(new_i_factors > upper, upper, new_i_factors)
+    lower = max(min_column_stiffness_ratio,0)
+    new_i_factors = np.where(new_i_factors < lower, lower, new_i_factors)
+    return new_i_factors
+
+
+def update_column_stiffness(model: Model, ultimate_columns: ReactionTable, settings: SettingsDict, geometry: SupportGeometry = None) -> int:
+    """
+    Sets the i-factor of each column below from its ultimate axial load.
+
+    Only columns whose i-factor moves by more than COLUMN_STIFFNESS_TOLERANCE are written.
+
+    Returns:
+    - int: The number of columns whose i-factor was changed.
+    """
+    if geometry is None:
+        geometry = SupportGeometry(model)
+    structure_columns = geometry.structure_columns
+
+    new_i_factors = get_column_i_factors(ultimate_columns, structure_columns, settings)
+    changed = np.flatnonzero(np.abs(new_i_factors - structure_columns.i_factors) > settings['COLUMN_STIFFNESS_TOLERANCE'])
+
+    for i in changed:
+        structure_columns.columns[i].i_factor = float(new_i_factors[i])
+        structure_columns.i_factors[i] = new_i_factors[i]
+
+    return len(changed)
 
 
 
@@ -0,0 +1,144 @@
+from .default_settings import SettingsDict
+from .validate_inputs import get_template_has_llur
+from .checkpoint import hash_file, hash_settings
+from logging import Logger
+import os
+import pickle
+import re
+import numpy as np
+
+INCREMENTAL_CACHE_DIR_NAME = 'rundown_cache'
+
+def get_transfer_load_cases(settings: SettingsDict) -> list[str]:
+    """The load cases of a floor that are applied as transfer loads to the floor below, see `add_support_type_loads`."""
+    if get_template_has_llur(settings):
+        return ['ALL_DEAD_LC', 'ALL_LIVE_LOADS_REDUCIBLE', 'ALL_LIVE_LOADS_UNREDUCIBLE']
+    return ['ALL_DEAD_LC', 'ALL_LIVE_LOADS']
+
+def get_incoming_transfer_loads(floor_above_level_loads: dict, settings: SettingsDict) -> dict[str, dict[str, tuple[list[tuple], np.ndarray]]]:
+    """Support location keys and Fz for each load case that the floor above transfers into this floor."""
+    incoming = dict()
+    for support_type, support_loads in floor_above_level_loads.items():
+        incoming[support_type] = {
+            load_case: (list(support_loads[load_case].keys_sorted), support_loads[load_case].component('Fz').copy())
+            for load_case in get_transfer_load_cases(settings)
+            if load_case in support_loads
+        }
+    return incoming
+
+def transfer_loads_match(stored: dict | None, incoming: dict | None, tolerance: float) -> bool:
+    if stored is None or incoming is None:
+        return stored is None and incoming is None
+
+    if stored.keys() != incoming.keys():
+        return False
+
+    for support_type, load_cases in incoming.items():
+        if stored[support_type].keys() != load_cases.keys():
+            return False
+        for load_case, (locations, Fz) in load_cases.items():
+            stored_locations, stored_Fz = stored[support_type][load_case]
+            if stored_locations != locations:
+                return False
+            if len(Fz) and np.max(np.abs(stored_Fz - Fz)) > tolerance:
+                return False
+    return True
+
+
+class IncrementalRundownCache:
+    """
+    Stores the results of each floor with a fingerprint of its inputs so unchanged floors can be skipped.
+
+    A floor's fingerprint is the hash of its CPT as the rundown saved it, a hash of the settings and
+    the transfer loads it received from the floor above. When all three match the stored run, the
+    stored reactions are reused instead of opening, meshing, calculating and saving the model.
+    Because the reused reactions are identical to the stored ones, the floor below also sees unchanged
+    transfer loads, so only the floors from an edited CPT down to where the loads stop changing re-run.
+
+    The storeys of a typical stack share one CPT and each of them saves it, so the CPT hash is kept
+    per file: `store` records it after every save, leaving the hash of the stack's last save, and
+    `lookup` compares it with the CPT as this run first found it, before any storey saved it.
+    """
+
+    def __init__(self, settings: SettingsDict, logger: Logger = None):
+        self.directory = os.path.join(settings['ROOT_DIRECTORY'], INCREMENTAL_CACHE_DIR_NAME)
+        self.settings = settings
+        self.tolerance = settings['INCREMENTAL_TRANSFER_TOLERANCE']
+        self.logger = logger
+        self.floors_reused = 0
+        # Whether each CPT is as the last run left it, decided before this run saves it
+        self._is_cpt_unchanged: dict[str, bool] = dict()
+
+    def _entry_path(self, file_dict: dict) -> str:
+        name = re.sub(r'[^\w\-. ]', '_', file_dict['filename'])
+        return os.path.join(self.directory, f"{name}#{file_dict.get('typical_index', 0)}.pkl")
+
+    def _cpt_hash_path(self, file_dict: dict) -> str:
+        name = re.sub(r'[^\w\-. ]', '_', file_dict['filename'])
+        return os.path.join(self.directory, f"{name}.cpt_hash")
+
+    def _is_unchanged_since_last_run(self, file_dict: dict) -> bool:
+        filename = file_dict['filename']
+        if filename not in self._is_cpt_unchanged:
+            cpt_hash_path = self._cpt_hash_path(file_dict)
+            saved_cpt_hash = None
+            if os.path.isfile(cpt_hash_path):
+                with open(cpt_hash_path, 'r') as file:
+                    saved_cpt_hash = file.read().strip()
+            self._is_cpt_unchanged[filename] = saved_cpt_hash is not None and saved_cpt_hash == hash_file(file_dict['filepath'])
+        return self._is_cpt_unchanged[filename]
+
+    def _settings_hash(self, file_dict: dict) -> str:
+        return hash_settings(self.settings, [file_dict])
+
+    def lookup(self, file_dict: dict, incoming_transfer_loads: dict | None) -> dict | None:
+        """
+        Returns the stored {'level_loads': ..., 'centroid_data': ...} for this floor if its inputs are unchanged.
+        """
+        if not self._is_unchanged_since_last_run(file_dict):
+            return None
+
+        entry_path = self._entry_path(file_dict)
+        if not os.path.isfile(entry_path):
+            return None
+
+        try:
+            with open(entry_path, 'rb') as file:
+                entry = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError) as exc:
+            if self.logger:
+                self.logger.warning(f"Could not read rundown cache {entry_path}: {exc}")
+            return None
+
+        if entry['settings_hash'] != self._settings_hash(file_dict):
+            return None
+
+        if not transfer_loads_match(entry['incoming_transfer_loads'], incoming_transfer_loads, self.tolerance):
+            return None
+
+        self.floors_reused += 1
+        return entry
+
+    def store(self, file_dict: dict, incoming_transfer_loads: dict | None, floor_level_loads: dict, floor_centroid_data: dict | None):
+        """Stores the results of a floor that has just been solved and saved."""
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        entry = dict(
+            filename = file_dict['filename'],
+            settings_hash = self._settings_hash(file_dict),
+            incoming_transfer_loads = incoming_transfer_loads,
+            level_loads = floor_level_loads,
+            centroid_data = floor_centroid_data,
+        )
+
+        entry_path = self._entry_path(file_dict)
+        temp_path = entry_path + '.tmp'
+        with open(temp_path, 'wb') as file:
+            pickle.dump(entry, file)
+        os.replace(temp_path, entry_path)
+
+        cpt_hash_path = self._cpt_hash_path(file_dict)
+        with open(cpt_hash_path + '.tmp', 'w') as file:
+            file.write(hash_file(file_dict['filepath']))
+        os.replace(cpt_hash_path + '.tmp', cpt_hash_path)
@@ -0,0 +1,149 @@
+from collections.abc import MutableMapping
+from .default_settings import SettingsDict
+from .validate_inputs import get_template_has_llur
+from .reaction_table import ReactionTable, AXIAL_COMPONENTS
+from .spatial_index import SUPPORT_MATCH_TOLERANCE
+
+
+class LoadCaseExpression:
+    """
+    A load case defined as the sum of other load cases of the same floor, e.g.
+    ALL_LIVE_LOADS_REDUCIBLE = sum(LLR_PLANS) + TRANSFER_LL_REDUCIBLE.
+
+    As with `add_sub_reactions`, the rows and moments come from the first term and only
+    Fz and Fz_per_m are summed. Supports of the terms are matched within `tolerance`,
+    settings['SUPPORT_MATCH_TOLERANCE'] (see `get_derived_load_cases`).
+    """
+
+    __slots__ = ('terms', 'tolerance')
+
+    def __init__(self, *terms: str, tolerance: float = SUPPORT_MATCH_TOLERANCE):
+        if not terms:
+            raise ValueError("A load case expression needs at least one term")
+        self.terms = terms
+        self.tolerance = tolerance
+
+    def evaluate(self, load_cases: 'FloorLoadCases') -> ReactionTable:
+        total = load_cases[self.terms[0]].copy()
+        for term in self.terms[1:]:
+            total.add_inplace(load_cases[term], AXIAL_COMPONENTS, tolerance=self.tolerance)
+        return total
+
+    def __repr__(self):
+        return ' + '.join(self.terms)
+
+
+def get_harvested_load_cases(settings: SettingsDict) -> list[tuple[str, float]]:
+    """
+    The loadings and load combinations whose reactions are read from each calculated floor,
+    with the concrete density used to add the supports' self weight to the reactions.
+    """
+    load_cases = [
+        ('TRANSFER_DEAD', 0),
+        ('TRANSFER_LL_REDUCIBLE', 0),
+        ('ALL_DEAD_LC', settings['REINFORCED_CONCRETE_DENSITY']),
+    ]
+
+    if settings['ALL_LIVE_LOADS_LC']:
+        load_cases.append(('ALL_LIVE_LOADS_LC', 0))
+
+    load_cases.extend((live_load_name, 0) for live_load_name in settings['LLR_PLANS'])
+
+    if get_template_has_llur(settings):
+        load_cases.append(('TRANSFER_LL_UNREDUCIBLE', 0))
+        load_cases.extend((live_load_name, 0) for live_load_name in settings['LLUR_PLANS'])
+
+    return load_cases
+
+
+def get_derived_load_cases(settings: SettingsDict) -> dict[str, LoadCaseExpression]:
+    """The load cases of a floor that are built from the harvested loadings and load combinations."""
+    tolerance = settings['SUPPORT_MATCH_TOLERANCE']
+    derived = dict(
+        ALL_LIVE_LOADS_REDUCIBLE_FLOOR = LoadCaseExpression(*settings['LLR_PLANS'], tolerance=tolerance),
+        ALL_LIVE_LOADS_REDUCIBLE = LoadCaseExpression('ALL_LIVE_LOADS_REDUCIBLE_FLOOR', 'TRANSFER_LL_REDUCIBLE', tolerance=tolerance),
+    )
+
+    if get_template_has_llur(settings):
+        derived.update(
+            ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR = LoadCaseExpression(*settings['LLUR_PLANS'], tolerance=tolerance),
+            ALL_LIVE_LOADS_UNREDUCIBLE = LoadCaseExpression('ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR', 'TRANSFER_LL_UNREDUCIBLE', tolerance=tolerance),
+            ALL_LIVE_LOADS_FLOOR = LoadCaseExpression('ALL_LIVE_LOADS_REDUCIBLE_FLOOR', 'ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR', tolerance=tolerance),
+            ALL_LIVE_LOADS = LoadCaseExpression('ALL_LIVE_LOADS_REDUCIBLE', 'ALL_LIVE_LOADS_UNREDUCIBLE', tolerance=tolerance),
+        )
+    else:
+        derived.update(
+            ALL_LIVE_LOADS_FLOOR = LoadCaseExpression('ALL_LIVE_LOADS_REDUCIBLE_FLOOR', tolerance=tolerance),
+            ALL_LIVE_LOADS = LoadCaseExpression('ALL_LIVE_LOADS_REDUCIBLE', tolerance=tolerance),
+        )
+
+    return derived
+
+
+class FloorLoadCases(MutableMapping):
+    """
+    The load cases of one support type on one floor, `level_loads[filename][support_type]`.
+
+    Harvested load cases are stored as given. Derived load cases are only evaluated, and then
+    cached, the first time they are read; setting or deleting a harvested load case clears
+    the cache so a re-harvest (e.g. after updating column stiffnesses) is picked up.
+    """
+
+    def __init__(self, derived_load_cases: dict[str, LoadCaseExpression], load_cases: dict[str, ReactionTable] = None):
+        self.derived_load_cases = derived_load_cases
+        self.load_cases = dict(load_cases or {})
+        self._cache = dict()
+
+    def is_derived(self, load_case: str) -> bool:
+        return load_case in self.derived_load_cases and load_case not in self.load_cases
+
+    def _is_available(self, load_case: str) -> bool:
+        if load_case in self.load_cases:
+            return True
+        expression = self.derived_load_cases.get(load_case)
+        return expression is not None and all(self._is_available(term) for term in expression.terms)
+
+    def __getitem__(self, load_case: str) -> ReactionTable:
+        if load_case in self.load_cases:
+            return self.load_cases[load_case]
+        if load_case in self._cache:
+            return self._cache[load_case]
+        if not self._is_available(load_case):
+            raise KeyError(load_case)
+        self._cache[load_case] = self.derived_load_cases[load_case].evaluate(self)
+        return self._cache[load_case]
+
+    def __setitem__(self, load_case: str, reactions: ReactionTable):
+        self.load_cases[load_case] = reactions
+        self._cache.clear()
+
+    def __delitem__(self, load_case: str):
+        del self.load_cases[load_case]
+        self._cache.clear()
+
+    def __contains__(self, load_case) -> bool:
+        return self._is_available(load_case)
+
+    def __iter__(self):
+        yield from self.load_cases
+        for load_case in self.derived_load_cases:
+            if load_case not in self.load_cases and self._is_available(load_case):
+                yield load_case
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __getstate__(self):
+        return dict(derived_load_cases=self.derived_load_cases, load_cases=self.load_cases)
+
+    def __setstate__(self, state):
+        self.derived_load_cases = state['derived_load_cases']
+        self.load_cases = state['load_cases']
+        self._cache = dict()
+
+    def with_load_cases(self, load_cases: dict[str, ReactionTable]) -> 'FloorLoadCases':
+        """A copy that shares the unchanged harvested load cases, with derived load cases re-evaluated on read."""
+        return FloorLoadCases(self.derived_load_cases, {**self.load_cases, **load_cases})
+
+    def __repr__(self):
+        return f"FloorLoadCases(harvested={list(self.load_cases)}, derived={list(self.derived_load_cases)})"
@@ -11,20 +11,25 @@ import threading
 
 from scripts.validate_inputs import validate_inputs
 
-from scripts.run_down_process import _run
+from scripts.run_down_process import run_with_restarts
 from scripts.log_window_wrapper import log_window_wrapper
+from scripts.run_control import RundownControl
 
 def run_click(settings: SettingsDict):
     threading.Thread(target = run(settings,log_folder_src = settings['ROOT_DIRECTORY'])).start()
 
+def resume_click(settings: SettingsDict):
+    threading.Thread(target = run(settings,resume = True,log_folder_src = settings['ROOT_DIRECTORY'])).start()
+
 def main_centroid_rundown_wrapped(settings: SettingsDict):
     threading.Thread(target = run(settings,log_folder_src = settings['ROOT_DIRECTORY'])).start()
 
 @log_window_wrapper
-def run(settings: SettingsDict,**kwargs):
+def run(settings: SettingsDict,resume: bool = False,**kwargs):
 
 
     logger: Logger = kwargs.get('logger', None)
+    control: RundownControl = kwargs.get('control', None)
     
     validate_inputs(settings, logger = logger)
     validate_settings(settings, logger=logger)
@@ -36,7 +41,7 @@ def run(settings: SettingsDict,**kwargs):
     progress = 0
     attempts = 0
     finish = False
-    progress = _run(settings,progress=0, level_loads=None,centroid_data = None, attempts = None,logger = logger)
+    progress = run_with_restarts(settings, resume = resume, logger = logger, control = control)
 
 
 # @log_window_wrapper
@@ -1,10 +1,18 @@
 import logging
+import logging.handlers
+import queue
 import threading
-import tkinter as tk
-from tkinter import messagebox
-import tailer
 from datetime import datetime
+import inspect
 import os
+from .run_control import RundownControl
+
+# The log window is redrawn with up to LOG_DRAIN_MAX_RECORDS queued records every LOG_DRAIN_INTERVAL_MS
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_DRAIN_MAX_RECORDS = 500
+
+# tkinter is only imported once a window is made, so the rundown can run headless (see rundown_cli.py)
+
 def set_logger(logger_name):
     log_filename = f"{logger_name}.log"
     logger = logging.getLogger(logger_name)
@@ -16,48 +24,27 @@ def set_logger(logger_name):
     logger.propagate = False
     return logger, log_filename
 
-import threading
-import ctypes
-import time
-
-class thread_with_exception(threading.Thread):
-    # def __init__(self, name):
-    #     threading.Thread.__init__(self)
-    #     self.name = name
-             
-    # def run(self):
-
-    #     # target function of the thread class
-    #     try:
-    #         while True:
-    #     finally:
-          
-    def get_id(self):
-        # returns id of the respective thread
-        if hasattr(self, '_thread_id'):
-            return self._thread_id
-        for id, thread in threading._active.items():
-            if thread is self:
-                return id
-            
-    def raise_exception(self):
-        thread_id = self.get_id()
-        res = ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id,
-              ctypes.py_object(SystemExit))
-        if res > 1:
-            ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id, 0)
-            print('Exception raise failure')
-
-class TkinterLoggingHandler(threading.Thread):
-
-    def __init__(self, name, main_func, root, logger, log_filename):
-        super().__init__()
+def add_queue_handler(logger: logging.Logger) -> tuple[queue.SimpleQueue, logging.Handler]:
+    """Also sends the records of `logger` to a queue, for the log window to show. The file handler keeps the log on disk."""
+    log_queue = queue.SimpleQueue()
+    # QueueHandler formats each record's message, with any traceback, before queueing it
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    logger.addHandler(queue_handler)
+    return log_queue, queue_handler
+
+class TkinterLoggingHandler:
+    """The log window of `main_func`; `run` calls it, on a thread of its own, see `log_window_wrapper`."""
+
+    def __init__(self, name, main_func, root, logger, log_filename, log_queue: queue.SimpleQueue = None, control: RundownControl = None):
         self.name = name
         self.main_func = main_func
         self.root = root
 
         self.logger = logger
         self.log_filename = log_filename
+        self.log_queue = log_queue
+        self.control = control
+        import tkinter as tk
         # 1. Create a Scrollbar widget.
         # Create a Scrollbar widget with specified colors.
         self.scrollbar = tk.Scrollbar(self.root, bg="white", troughcolor="black")
@@ -72,83 +59,95 @@ class TkinterLoggingHandler(threading.Thread):
         self.scrollbar.config(command=self.text_widget.yview)
 
         self.text_widget.pack()
+        for msg_type, color in (('INFO', 'white'), ('WARNING', 'orange'), ('ERROR', 'red')):
+            self.text_widget.tag_configure(msg_type, foreground=color)
+
         self.result_container = {"result": None}
         self.main_loop_is_running = False
-
-    def append_text(self, content, msg_type):
-        colors = {
-            'INFO': 'white',
-            'WARNING': 'orange',
-            'ERROR': 'red'
-        }
-
-        # Setting the color based on msg_typese
-        color = colors.get(msg_type, 'white')  # Default to white if msg_type isn't recognized
-
-        # Insert the content
-
-        self.text_widget.insert(tk.END, content + '\n')
-        
-        # Applying color to the inserted content
-        start_index = "end-{}c".format(len(content) + 1)
-        self.text_widget.tag_add(msg_type, start_index, "end-1c")  # -1c to avoid including the newline in the tag
-        self.text_widget.tag_configure(msg_type, foreground=color)
-
-        # Scroll if scrollbar was at the end
-        y_scroll = self.text_widget.yview()[1]
-        if y_scroll >= 0.9:
-            self.text_widget.see(tk.END)
+        self.is_cancelling = False
 
     def run(self, *args, **kwargs):
         kwargs['logger'] = self.logger
+        parameters = inspect.signature(self.main_func).parameters
+        if 'control' in parameters or any(parameter.kind == inspect.Parameter.VAR_KEYWORD for parameter in parameters.values()):
+            kwargs['control'] = self.control
         self.result_container["result"] = self.main_func(*args, **kwargs)
 
-    def tail_log(self, handler_thread: thread_with_exception, root: tk.Tk):
-        try:
-            for line in tailer.follow(open(self.log_filename)):
-                _type = 'NONE'
-                if 'WARNING' in str(line):
-                    _type = 'WARNING'
-                    line = line[line.find('WARNING'):]
-                if 'ERROR' in str(line):
-                    _type = 'ERROR'
-                    line = line[line.find('ERROR'):]
-                if 'INFO' in str(line):
-                    _type = 'INFO'
-                    line = line[line.find('INFO'):]
-                
-                line: str
-                if len(line) == len(_type) + 3:
-                    _type = 'NONE'
-                    self.text_widget.insert(tk.END, '\n')
+    def close_window(self, handler_thread: threading.Thread, root: 'tk.Tk'):
+        """
+        Closing the window while the function is running cancels it at its next check, see
+        `RundownControl`. The window stays open, showing the log, until `drain_log` sees the
+        function has finished.
+        """
+        import tkinter as tk
+        from tkinter import messagebox
+        if self.is_cancelling:
+            return
+        if handler_thread.is_alive():
+            if not messagebox.askyesno("Cancel", "Cancel the running process? The file being solved is closed without saving."):
+                return
+            self.control.request_cancel()
+        if handler_thread.is_alive():
+            # drain_log keeps running while the thread is alive, and closes the window after it
+            self.is_cancelling = True
+            root.title(f"{self.name} - Cancelling...")
+            self.text_widget.insert(tk.END, "Cancelling... the window closes once the running step has stopped.\n", ('WARNING',))
+            self.text_widget.see(tk.END)
+            return
+        root.destroy()
+
+    def drain_log(self, handler_thread: threading.Thread, root: 'tk.Tk'):
+        """
+        Shows the records queued since the last call in one redraw, then calls itself again after
+        LOG_DRAIN_INTERVAL_MS until `handler_thread` has finished and the queue is empty, then
+        closes the window if it is cancelling.
+
+        Runs on the Tk main loop. Warnings and errors are still shown in a message box, but the
+        window is only raised for them, not for every line.
+        """
+        import tkinter as tk
+        from tkinter import messagebox
+        records: list[logging.LogRecord] = []
+        while len(records) < LOG_DRAIN_MAX_RECORDS:
+            try:
+                records.append(self.log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        if records:
+            is_at_end = self.text_widget.yview()[1] >= 0.9
+            # Text.insert takes (text, tags) pairs, so the whole batch is one insert
+            chunks = []
+            alerts = []
+            for record in records:
+                if not record.msg:
+                    chunks += ['\n', ()]
+                    continue
+                line = f"{record.levelname} - {record.msg}"
+                msg_type = record.levelname if record.levelname in ('INFO', 'WARNING', 'ERROR') else 'NONE'
+                chunks += [line, (msg_type,), '\n' if msg_type == 'INFO' else '\n\n', ()]
+                if msg_type in ('WARNING', 'ERROR'):
+                    alerts.append((msg_type, line))
+
+            self.text_widget.insert(tk.END, *chunks)
+            if is_at_end:
+                self.text_widget.see(tk.END)
+
+            for msg_type, line in alerts:
+                root.lift()
+                if msg_type == 'ERROR':
+                    messagebox.showerror(msg_type, line)
                 else:
-                    root.lift()
-                    # Instead of inserting directly, now use the append_text method
-                    self.append_text(line, _type)
-                    if _type not in ['INFO']:
-                        self.text_widget.insert(tk.END, '\n')
-                        
-                if _type in ['ERROR']:
-                    messagebox.showerror(_type, line)
-                    root.lift()
-
-                if _type in ['WARNING']:
-                    messagebox.showwarning(_type, line)
-                    root.lift()
-
-                if '[EXIT]' in line:
-                    handler_thread.raise_exception()
-                    exit()
-        except Exception as exc:
-            handler_thread.raise_exception()
-            exit()
-            
-        finally:
-            handler_thread.raise_exception()
-            exit()
-                        
+                    messagebox.showwarning(msg_type, line)
+
+        if handler_thread.is_alive() or not self.log_queue.empty():
+            root.after(LOG_DRAIN_INTERVAL_MS, self.drain_log, handler_thread, root)
+        elif self.is_cancelling:
+            root.destroy()
+
 def log_window_wrapper(func):
     def wrapper(*args, **kwargs):
+        import tkinter as tk
         root = tk.Tk('')
         title = f"{func.__name__}_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}"
         log_folder_src = kwargs.get('log_folder_src', None)
@@ -164,14 +163,16 @@ def log_window_wrapper(func):
             logger, log_filename = set_logger(log_folder_src + '/logs/' + title)
         else:
             logger, log_filename = set_logger(title)
-        handler = TkinterLoggingHandler(title, func, root, logger, log_filename)
-        handler_thread = thread_with_exception(target=handler.run, args=args, kwargs=kwargs)
-        tail_thread = threading.Thread(target=handler.tail_log ,args = (handler_thread,root))
-        tail_thread.start()
+        log_queue, queue_handler = add_queue_handler(logger)
+        handler = TkinterLoggingHandler(title, func, root, logger, log_filename, log_queue=log_queue, control=RundownControl())
+        # debug_exit ends the function with exit(), which only ends this thread
+        handler_thread = threading.Thread(target=handler.run, args=args, kwargs=kwargs)
         handler_thread.start()
+        root.protocol("WM_DELETE_WINDOW", lambda: handler.close_window(handler_thread, root))
+        root.after(LOG_DRAIN_INTERVAL_MS, handler.drain_log, handler_thread, root)
         root.mainloop()
-        handler.join()
-        tail_thread.join()
+        handler_thread.join()
+        logger.removeHandler(queue_handler)
         return handler.result_container["result"]
     return wrapper
 
@@ -0,0 +1,96 @@
+from ram_concept.model import Model
+from ram_concept.result_layers import ReactionContext
+from ram_concept.force_loading_layer import ForceLoadingLayer
+from ram_concept.load_combo_layer import LoadComboLayer
+from .default_settings import SettingsDict
+from .error_handling import debug_exit
+from .reaction_table import ReactionTable, REACTION_COMPONENTS
+from .support_geometry import SupportGeometry
+from logging import Logger
+import numpy as np
+
+_FZ = REACTION_COMPONENTS.index('Fz')
+_FZ_PER_M = REACTION_COMPONENTS.index('Fz_per_m')
+
+
+def get_load_layer(model: Model, lc_name: str, settings: SettingsDict, logger: Logger = None) -> ForceLoadingLayer | LoadComboLayer:
+    """
+    Finds the loading or load combination layer of a load case.
+
+    `lc_name` is either a settings key (e.g. 'TRANSFER_DEAD') whose value is the layer name,
+    or the layer name itself (e.g. an LLR plan).
+    """
+    layer_name = settings.get(lc_name) or lc_name
+
+    load_layer = model.cad_manager.force_loading_layer(layer_name)
+    if not load_layer:
+        load_layer = model.cad_manager.load_combo_layer(layer_name)
+    if not load_layer:
+        logger.error(f"Load layer {layer_name} not found in Loading Layers or Load Combinations Layers")
+        debug_exit(settings, is_error=True, logger=logger)
+    return load_layer
+
+
+class ReactionHarvester:
+    """
+    Harvests the support reactions of many load layers of a calculated model in one pass.
+
+    The supports come from the model's SupportGeometry snapshot, so their elements, location
+    keys and self weight volumes are read once per model. `harvest` then walks the elements
+    once and queries the reaction of every requested layer, returning one ReactionTable per
+    load case that all share the same rows. Calling `harvest` again, e.g. after the column
+    stiffnesses are updated, only re-queries the reactions.
+    """
+
+    def __init__(self, model: Model, settings: SettingsDict, geometry: SupportGeometry = None, logger: Logger = None):
+        self.model = model
+        self.settings = settings
+        self.geometry = geometry if geometry is not None else SupportGeometry(model)
+        self.logger = logger
+        self._load_layers = dict()
+
+    def load_layer(self, lc_name: str) -> ForceLoadingLayer | LoadComboLayer:
+        if lc_name not in self._load_layers:
+            self._load_layers[lc_name] = get_load_layer(self.model, lc_name, self.settings, logger=self.logger)
+        return self._load_layers[lc_name]
+
+    def harvest(self, support_type: str, load_cases: list[tuple[str, float]]) -> dict[str, ReactionTable]:
+        """
+        Args:
+        - support_type (str): COLUMNS or WALLS.
+        - load_cases (list): (load case name, self weight concrete density) pairs, see `get_harvested_load_cases`.
+
+        Returns:
+        - dict: A ReactionTable for each load case.
+        """
+        layers = [(lc_name, self.load_layer(lc_name), density) for lc_name, density in load_cases]
+        return harvest_layers(self.geometry, support_type, layers)
+
+
+def harvest_layers(geometry: SupportGeometry, support_type: str, layers: list[tuple[str, ForceLoadingLayer | LoadComboLayer, float]]) -> dict[str, ReactionTable]:
+    """
+    Reads the reactions of each (name, layer, self weight concrete density) in `layers` in one pass over the supports.
+    """
+    supports = geometry.supports(support_type)
+    data = np.zeros((len(layers), len(supports.elements), len(REACTION_COMPONENTS)))
+
+    for i, element in enumerate(supports.elements):
+        for j, (_, load_layer, _) in enumerate(layers):
+            if support_type == 'COLUMNS':
+                reaction = load_layer.column_reaction(element, ReactionContext.STANDARD)
+                data[j, i, :5] = (reaction.x, reaction.y, reaction.z, reaction.rot_x, reaction.rot_y)
+            else:
+                data[j, i, _FZ] = load_layer.wall_group_reaction(element, ReactionContext.STANDARD).z
+
+    densities = np.array([density for _, _, density in layers], dtype=np.float64)
+    data[:, :, _FZ] += densities[:, None] * supports.self_weight_volumes[None, :]
+
+    segments = None
+    if support_type == 'WALLS':
+        segments = supports.segments
+        np.divide(data[:, :, _FZ], supports.lengths, out=data[:, :, _FZ_PER_M], where=supports.lengths > 0)
+
+    return {
+        lc_name: ReactionTable(support_type, supports.keys, supports.xy, data[j], names=supports.names, segments=segments, is_sorted=True)
+        for j, (lc_name, _, _) in enumerate(layers)
+    }
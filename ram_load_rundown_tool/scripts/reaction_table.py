@@ -0,0 +1,291 @@
+from collections.abc import Mapping
+from ram_concept.point_2D import Point2D
+from ram_concept.line_segment_2D import LineSegment2D
+from typing import Iterable
+from .spatial_index import SUPPORT_MATCH_TOLERANCE, SupportMatch, key_coordinates, match_supports
+import numpy as np
+
+REACTION_COMPONENTS = ('Fr', 'Fs', 'Fz', 'Mr', 'Ms', 'Fz_per_m')
+_COMPONENT_INDEX = {component: i for i, component in enumerate(REACTION_COMPONENTS)}
+
+# Components exposed by the dict view of each support type, matching ColumnReactions and WallReactions
+SUPPORT_TYPE_COMPONENTS = {
+    'COLUMNS': ('Fr', 'Fs', 'Fz', 'Mr', 'Ms'),
+    'WALLS': ('Fz', 'Fz_per_m'),
+}
+
+# Components changed by load case addition, see `add_sub_reactions`
+AXIAL_COMPONENTS = ('Fz', 'Fz_per_m')
+
+
+def _component_indices(components: Iterable[str] | None) -> list[int] | slice:
+    if components is None:
+        return slice(None)
+    return [_COMPONENT_INDEX[component] for component in components]
+
+
+class ReactionTable(Mapping):
+    """
+    Support reactions for one load case, stored as NumPy arrays.
+
+    Rows are sorted by location key; the key of a column is `(x, y)` and the key of a wall group is
+    `((start x, start y), (end x, end y))`, the same keys used by the original per-location dicts.
+    Aligning two tables matches keys within `tolerance`, see `match`; the rundown passes
+    settings['SUPPORT_MATCH_TOLERANCE'] and SUPPORT_MATCH_TOLERANCE is only the default.
+    Reaction components are float64 columns of `data` in the order of REACTION_COMPONENTS.
+
+    The table is a read-only Mapping of key to a ColumnReactions / WallReactions dict, so existing
+    code that iterates `.items()` or indexes by location still works. Load case algebra should use
+    `add`, `subtract`, `scale` and `align`, which are vectorised and align rows by key.
+    """
+
+    __slots__ = ('support_type', 'keys_sorted', 'xy', 'segments', 'names', 'data', '_index')
+
+    def __init__(self, support_type: str, keys: list[tuple], xy: np.ndarray, values: np.ndarray, names: list[str] = None, segments: np.ndarray = None, is_sorted: bool = False):
+        if support_type not in SUPPORT_TYPE_COMPONENTS:
+            raise ValueError(f"support_type must be COLUMNS or WALLS, got {support_type}")
+
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(REACTION_COMPONENTS))
+
+        if not is_sorted and keys:
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            keys = [keys[i] for i in order]
+            xy = xy[order]
+            values = values[order]
+            if names is not None:
+                names = [names[i] for i in order]
+            if segments is not None:
+                segments = np.asarray(segments, dtype=np.float64)[order]
+
+        self.support_type = support_type
+        # Tables built from the same harvest or from each other share one key list, see `has_same_keys`
+        self.keys_sorted = keys if is_sorted and isinstance(keys, list) else list(keys)
+        self.xy = xy
+        self.data = values
+        self.names = names
+        self.segments = None if segments is None else np.asarray(segments, dtype=np.float64).reshape(-1, 4)
+        self._index = None
+
+    @classmethod
+    def empty(cls, support_type: str) -> 'ReactionTable':
+        segments = np.zeros((0, 4)) if support_type == 'WALLS' else None
+        names = [] if support_type == 'COLUMNS' else None
+        return cls(support_type, [], np.zeros((0, 2)), np.zeros((0, len(REACTION_COMPONENTS))), names=names, segments=segments, is_sorted=True)
+
+    @classmethod
+    def from_rows(cls, rows: Mapping, support_type: str) -> 'ReactionTable':
+        """Builds a table from the per-location dict shape returned by the original reaction functions."""
+        keys = list(rows.keys())
+        values = np.zeros((len(keys), len(REACTION_COMPONENTS)))
+        xy = np.zeros((len(keys), 2))
+        names = [] if support_type == 'COLUMNS' else None
+        segments = np.zeros((len(keys), 4)) if support_type == 'WALLS' else None
+
+        for i, key in enumerate(keys):
+            row = rows[key]
+            for component in REACTION_COMPONENTS:
+                value = row.get(component)
+                if value is not None:
+                    values[i, _COMPONENT_INDEX[component]] = value
+            if support_type == 'COLUMNS':
+                location = row['location']
+                xy[i] = (location.x, location.y)
+                names.append(row.get('name'))
+            else:
+                (x1, y1), (x2, y2) = key
+                segments[i] = (x1, y1, x2, y2)
+                centroid = row.get('centroid')
+                xy[i] = (centroid.x, centroid.y) if centroid is not None else ((x1 + x2) / 2, (y1 + y2) / 2)
+
+        return cls(support_type, keys, xy, values, names=names, segments=segments)
+
+    # Mapping view
+
+    def _key_index(self) -> dict[tuple, int]:
+        if self._index is None:
+            self._index = {key: i for i, key in enumerate(self.keys_sorted)}
+        return self._index
+
+    def __len__(self) -> int:
+        return len(self.keys_sorted)
+
+    def __iter__(self):
+        return iter(self.keys_sorted)
+
+    def __contains__(self, key) -> bool:
+        return key in self._key_index()
+
+    def __getitem__(self, key) -> dict:
+        return self.row(self._key_index()[key])
+
+    def __eq__(self, other):
+        if not isinstance(other, ReactionTable):
+            return Mapping.__eq__(self, other)
+        return (
+            self.support_type == other.support_type
+            and self.keys_sorted == other.keys_sorted
+            and np.array_equal(self.data, other.data)
+        )
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != '_index'}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._index = None
+
+    def row(self, i: int) -> dict:
+        x, y = self.xy[i]
+        row = dict()
+        if self.support_type == 'COLUMNS':
+            row['location'] = Point2D(x, y)
+            row['name'] = self.names[i] if self.names is not None else None
+        else:
+            x1, y1, x2, y2 = self.segments[i]
+            row['location'] = LineSegment2D(Point2D(x1, y1), Point2D(x2, y2))
+            row['centroid'] = Point2D(x, y)
+        for component in SUPPORT_TYPE_COMPONENTS[self.support_type]:
+            row[component] = float(self.data[i, _COMPONENT_INDEX[component]])
+        return row
+
+    def to_dict(self) -> dict[tuple, dict]:
+        return {key: self.row(i) for i, key in enumerate(self.keys_sorted)}
+
+    # Columns
+
+    def component(self, component: str) -> np.ndarray:
+        return self.data[:, _COMPONENT_INDEX[component]]
+
+    def value_at(self, key: tuple, component: str) -> float:
+        return float(self.data[self._key_index()[key], _COMPONENT_INDEX[component]])
+
+    def total(self, component: str = 'Fz') -> float:
+        return float(self.component(component).sum())
+
+    def segment_lengths(self) -> np.ndarray:
+        if self.segments is None:
+            return np.zeros(len(self))
+        return np.hypot(self.segments[:, 2] - self.segments[:, 0], self.segments[:, 3] - self.segments[:, 1])
+
+    # Alignment
+
+    def has_same_keys(self, other: 'ReactionTable') -> bool:
+        return self.keys_sorted is other.keys_sorted or self.keys_sorted == other.keys_sorted
+
+    def match(self, keys: list[tuple], tolerance: float = SUPPORT_MATCH_TOLERANCE) -> SupportMatch:
+        """
+        Matches location keys to the rows of this table, exactly where possible and otherwise to
+        the nearest unused row within `tolerance`, so a support that moved by less than the
+        tolerance between models still lines up.
+        """
+        key_index = self._key_index()
+        index = np.fromiter((key_index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+        ambiguous = np.zeros(0, dtype=np.int64)
+
+        missing = np.flatnonzero(index < 0)
+        if len(missing) and len(self) and tolerance > 0:
+            is_free = np.ones(len(self), dtype=bool)
+            is_free[index[index >= 0]] = False
+            free = np.flatnonzero(is_free)
+            near = match_supports(key_coordinates([keys[i] for i in missing]), key_coordinates(self.keys_sorted)[free], tolerance, allow_reversed=self.support_type == 'WALLS')
+            found = near.index >= 0
+            index[missing[found]] = free[near.index[found]]
+            ambiguous = missing[near.ambiguous]
+
+        return SupportMatch(index, ambiguous, len(self))
+
+    def index_of(self, keys: list[tuple], tolerance: float = SUPPORT_MATCH_TOLERANCE) -> np.ndarray:
+        """Row index of each key in this table, -1 where no row is within `tolerance` of the key."""
+        return self.match(keys, tolerance).index
+
+    def aligned_values(self, other: 'ReactionTable', tolerance: float = SUPPORT_MATCH_TOLERANCE) -> np.ndarray:
+        """`other.data` reordered to this table's keys, zero where `other` has no reaction at a key."""
+        if self.has_same_keys(other):
+            return other.data
+        index = other.index_of(self.keys_sorted, tolerance)
+        aligned = np.zeros_like(self.data)
+        found = index >= 0
+        aligned[found] = other.data[index[found]]
+        return aligned
+
+    def align(self, keys: list[tuple], tolerance: float = SUPPORT_MATCH_TOLERANCE) -> 'ReactionTable':
+        """A copy of this table with exactly `keys` as rows, zero filled where a key is missing."""
+        keys = sorted(keys)
+        index = self.index_of(keys, tolerance)
+        found = index >= 0
+        values = np.zeros((len(keys), len(REACTION_COMPONENTS)))
+        values[found] = self.data[index[found]]
+        xy = np.full((len(keys), 2), np.nan)
+        xy[found] = self.xy[index[found]]
+        names = None
+        if self.names is not None:
+            names = [self.names[i] if i >= 0 else None for i in index]
+        segments = None
+        if self.segments is not None:
+            segments = np.array([(k[0][0], k[0][1], k[1][0], k[1][1]) for k in keys], dtype=np.float64).reshape(-1, 4)
+            xy[~found] = (segments[~found, :2] + segments[~found, 2:]) / 2
+        else:
+            xy[~found] = np.array([key for key, f in zip(keys, found) if not f], dtype=np.float64).reshape(-1, 2)
+        return ReactionTable(self.support_type, keys, xy, values, names=names, segments=segments, is_sorted=True)
+
+    def missing_keys(self, other: 'ReactionTable', tolerance: float = SUPPORT_MATCH_TOLERANCE) -> list[tuple]:
+        """Keys of this table that are not in `other`."""
+        if self.has_same_keys(other):
+            return []
+        return [key for key, i in zip(self.keys_sorted, other.index_of(self.keys_sorted, tolerance)) if i < 0]
+
+    # Load case algebra, rows always follow `self`
+
+    def _with_values(self, values: np.ndarray) -> 'ReactionTable':
+        return ReactionTable(self.support_type, self.keys_sorted, self.xy, values, names=self.names, segments=self.segments, is_sorted=True)
+
+    def copy(self) -> 'ReactionTable':
+        return self._with_values(self.data.copy())
+
+    def add(self, other: 'ReactionTable', components: Iterable[str] | None = None, tolerance: float = SUPPORT_MATCH_TOLERANCE) -> 'ReactionTable':
+        values = self.data.copy()
+        columns = _component_indices(components)
+        values[:, columns] += self.aligned_values(other, tolerance)[:, columns]
+        return self._with_values(values)
+
+    def subtract(self, other: 'ReactionTable', components: Iterable[str] | None = None, tolerance: float = SUPPORT_MATCH_TOLERANCE) -> 'ReactionTable':
+        values = self.data.copy()
+        columns = _component_indices(components)
+        values[:, columns] -= self.aligned_values(other, tolerance)[:, columns]
+        return self._with_values(values)
+
+    def scale(self, factor: float, components: Iterable[str] | None = None) -> 'ReactionTable':
+        values = self.data.copy()
+        columns = _component_indices(components)
+        values[:, columns] *= factor
+        return self._with_values(values)
+
+    def add_inplace(self, other: 'ReactionTable', components: Iterable[str] | None = None, factor: float = 1.0, tolerance: float = SUPPORT_MATCH_TOLERANCE):
+        columns = _component_indices(components)
+        self.data[:, columns] += factor * self.aligned_values(other, tolerance)[:, columns]
+
+    def __add__(self, other: 'ReactionTable') -> 'ReactionTable':
+        return self.add(other)
+
+    def __sub__(self, other: 'ReactionTable') -> 'ReactionTable':
+        return self.subtract(other)
+
+    def __mul__(self, factor: float) -> 'ReactionTable':
+        return self.scale(factor)
+
+    __rmul__ = __mul__
+
+    def __repr__(self):
+        return f"ReactionTable({self.support_type}, {len(self)} rows, Fz={self.total():.1f})"
+
+
+def sum_reactions(tables: list[ReactionTable], components: Iterable[str] | None = AXIAL_COMPONENTS, tolerance: float = SUPPORT_MATCH_TOLERANCE) -> ReactionTable:
+    """Adds `tables[1:]` onto `tables[0]`, keeping the rows and the other components of the first table."""
+    total = tables[0].copy()
+    for table in tables[1:]:
+        total.add_inplace(table, components, tolerance=tolerance)
+    return total
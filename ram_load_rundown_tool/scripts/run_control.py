@@ -0,0 +1,85 @@
+from logging import Logger
+import threading
+
+
+class RundownStopped(Exception):
+    """The rundown was stopped on request, after the last finished floor was saved and checkpointed."""
+
+
+class RundownCancelled(RundownStopped):
+    """The rundown was cancelled on request; the model being solved was closed without saving."""
+
+
+class RundownControl:
+    """
+    Lets another thread (e.g. the rundown window) pause, stop or cancel a running rundown.
+
+    The rundown checks the control between stages, so it is never interrupted inside a RAM
+    Concept call and no CPT is left half written:
+
+    - pause: after the current floor is saved, closed and checkpointed, wait until resumed;
+    - stop: after the current floor is saved, closed and checkpointed, raise `RundownStopped`.
+      The run can be resumed from its checkpoint;
+    - cancel: at the next check (after calc, after harvesting, before saving), raise
+      `RundownCancelled`. The open model is closed without saving, leaving the CPT as it
+      was last saved.
+
+    In every case the engine pool shuts down the RAM Concept engines, freeing the licence.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Set while the rundown may run, cleared while paused
+        self._running = threading.Event()
+        self._running.set()
+        self._is_stop_requested = False
+        self._is_cancel_requested = False
+
+    def request_pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def request_stop(self):
+        with self._lock:
+            self._is_stop_requested = True
+        self._running.set()
+
+    def request_cancel(self):
+        with self._lock:
+            self._is_stop_requested = True
+            self._is_cancel_requested = True
+        self._running.set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    @property
+    def is_stop_requested(self) -> bool:
+        return self._is_stop_requested
+
+    @property
+    def is_cancel_requested(self) -> bool:
+        return self._is_cancel_requested
+
+    def check_cancelled(self, stage: str):
+        """Call between the stages of a floor; raises `RundownCancelled` if a cancel was requested."""
+        if self._is_cancel_requested:
+            raise RundownCancelled(f"Rundown cancelled {stage}")
+
+    def floor_finished(self, filename: str, logger: Logger = None):
+        """
+        Call once a floor is saved, closed and checkpointed. Waits while paused, then raises
+        `RundownStopped` if a stop or cancel was requested.
+        """
+        if self.is_paused and not self._is_stop_requested:
+            if logger:
+                logger.info(f"Rundown paused after {filename}, {filename} is saved and closed")
+            self._running.wait()
+            if logger and not self._is_stop_requested:
+                logger.info(f"Rundown resumed")
+
+        if self._is_stop_requested:
+            raise RundownStopped(f"Rundown stopped after {filename}")
@@ -1,7 +1,6 @@
 
 import os
 import configparser
-from ram_concept.concept import Concept
 from scripts.default_settings import SettingsDict
 import math
 from scripts.wall_loads import add_wall_loads
@@ -18,11 +17,9 @@ from ram_concept.point_2D import Point2D
 from ram_concept.line_segment_2D import LineSegment2D
 import time
 import logging
-import tkinter as tk
-import threading
-import copy
 
 DO_NEW = False
+RESTART_WAIT_SECONDS = 60
 
 from scripts.validate_template import validate_loading_types, validate_load_comboinations_types
 from scripts.add_loads_to_layer import add_loads 
@@ -38,6 +35,21 @@ import os
 from datetime import datetime
 import shutil
 from .validate_inputs import get_template_has_llur
+from .concept_pool import ConceptEnginePool
+from .typical_floors import expand_typical_files, is_derived_typical_floor, derive_typical_level_loads
+from .checkpoint import RundownCheckpoint
+from .incremental_rundown import IncrementalRundownCache, get_incoming_transfer_loads
+from .reaction_table import ReactionTable, AXIAL_COMPONENTS
+from .spatial_index import SUPPORT_MATCH_TOLERANCE
+from .load_cases import FloorLoadCases, get_derived_load_cases, get_harvested_load_cases
+from .reaction_harvester import ReactionHarvester
+from .support_geometry import SupportGeometry
+from .transfer_load_sync import TransferLoadEdits, sync_loads
+from .solve_fingerprint import SolveFingerprint, hash_transfer_loads, hash_transfer_layer, transfer_layer_key
+from .stage_timer import StageTimer
+from .concept_api_trace import ConceptApiTracer
+from .concept_session import ConceptSessionRecorder
+from .run_control import RundownControl, RundownStopped
 
 def create_excel_from_centroid_data(centroid_data: dict, directory_path: str, darwing_scale: float):
     # Set the filepath for the template and the new file
@@ -89,24 +101,12 @@ def create_excel_from_centroid_data(centroid_data: dict, directory_path: str, da
                     
     return new_filepath
 
-def add_sub_reactions(all_reactions, loading_reactions, addT_subF = True):
-    for location, reaction in loading_reactions.items():
-        if location in all_reactions:
-            if not addT_subF:
-                all_reactions[location]['Fz'] -= reaction['Fz']
-                all_reactions[location]['Fx'] -= reaction['Fx']
-                all_reactions[location]['Fy'] -= reaction['Fy']
-                all_reactions[location]['Mr'] -= reaction['Mr']
-                all_reactions[location]['Ms'] -= reaction['Ms']
-
-                if all_reactions[location].get('Fz_per_m') is not None:
-
-                    all_reactions[location]['Fz_per_m'] -= reaction['Fz_per_m']   
-
-            else:
-                all_reactions[location]['Fz'] += reaction['Fz']
-                if all_reactions[location].get('Fz_per_m') is not None:
-                    all_reactions[location]['Fz_per_m'] += reaction['Fz_per_m']   
+def add_sub_reactions(all_reactions: ReactionTable, loading_reactions: ReactionTable, addT_subF = True, tolerance: float = SUPPORT_MATCH_TOLERANCE):
+    """Adds (Fz and Fz_per_m only) or subtracts (all components) loading_reactions in place, at the locations of all_reactions."""
+    if addT_subF:
+        all_reactions.add_inplace(loading_reactions, AXIAL_COMPONENTS, tolerance=tolerance)
+    else:
+        all_reactions.add_inplace(loading_reactions, factor=-1, tolerance=tolerance)
 
 def open_excel(filepath: str):
     os.system(f'start excel "{filepath}"')
@@ -115,7 +115,7 @@ import typing
 if typing.TYPE_CHECKING:
     import logging
 
-def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, dict[str, dict[str, ColumnReactions]]]]=None,centroid_data = None, attempts = None,logger: Logger = None):
+def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, dict[str, dict[str, ColumnReactions]]]]=None,centroid_data = None, attempts = None,logger: Logger = None, engine_pool: ConceptEnginePool = None, checkpoint: RundownCheckpoint = None, timer: StageTimer = None, api_tracer: ConceptApiTracer = None, session_recorder: ConceptSessionRecorder = None, control: RundownControl = None):
 
     do_centroid = settings['DO_CENTROID_CALCS']
     do_transfer = settings['DO_LOAD_RUNDOWN']
@@ -130,53 +130,13 @@ def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, di
 
     def set_support_type_reactions(support_type):
 
+        # One pass over the supports reads the reactions of every harvested loading and load combination
+        with timer.stage('set_reactions', support_type=support_type):
+            level_loads[current_level_filename][support_type].update(harvester.harvest(support_type, harvested_load_cases))
+        check_cancelled(f"after getting the {support_type.lower()} reactions of {current_level_filename}")
 
-        set_reactions(model,level_loads, current_level_filename, 'TRANSFER_DEAD',support_type, settings, logger=logger)
-
-        set_reactions(model,level_loads, current_level_filename, 'TRANSFER_LL_REDUCIBLE',support_type, settings, logger=logger)
-        
-        set_reactions(model,level_loads, current_level_filename, 'ALL_DEAD_LC',support_type,settings,self_weight_concrete_density = settings['REINFORCED_CONCRETE_DENSITY'], logger=logger)
-
-        if settings['ALL_LIVE_LOADS_LC']:
-            set_reactions(model,level_loads, current_level_filename, 'ALL_LIVE_LOADS_LC',support_type,settings, logger=logger)
-
-        for live_load_name in settings['LLR_PLANS']:
-            set_reactions(model,level_loads, current_level_filename, live_load_name,support_type, settings, logger=logger)
-        # set_reactions(model,level_loads, current_level_filename, 'ALL_LIVE_LOADS',support_type, settings, logger=logger)
-
-        level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'] = copy.deepcopy(level_loads[current_level_filename][support_type][settings['LLR_PLANS'][0]])
-        for live_load_name in settings['LLR_PLANS'][1:]:
-            add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'], level_loads[current_level_filename][support_type][live_load_name], addT_subF = True)
-
-        level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
-        add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'],level_loads[current_level_filename][support_type]['TRANSFER_LL_REDUCIBLE'], addT_subF = True)
-
-        if template_has_llur:
-            set_reactions(model,level_loads, current_level_filename, 'TRANSFER_LL_UNREDUCIBLE',support_type, settings, logger=logger)
-
-            for live_load_name in settings['LLUR_PLANS']:
-                set_reactions(model,level_loads, current_level_filename, live_load_name,support_type, settings, logger=logger)
-            # set_reactions(model,level_loads, current_level_filename, 'ALL_LIVE_LOADS',support_type, settings, logger=logger)
-
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'] = copy.deepcopy(level_loads[current_level_filename][support_type][settings['LLUR_PLANS'][0]])
-            for live_load_name in settings['LLR_PLANS'][1:]:
-                add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'], level_loads[current_level_filename][support_type][live_load_name], addT_subF = True)
-
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'])
-            add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'],level_loads[current_level_filename][support_type]['TRANSFER_LL_UNREDUCIBLE'], addT_subF = True)
-
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_FLOOR'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
-
-
-            add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_FLOOR'],level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'], addT_subF = True)
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_FLOOR'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
-
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'])
-            add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS'],level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'], addT_subF = True)
-
-        else:
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_FLOOR'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
-            level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'])
+        # ALL_LIVE_LOADS_REDUCIBLE_FLOOR, ALL_LIVE_LOADS_REDUCIBLE, ALL_LIVE_LOADS etc. are derived
+        # from the reactions above when they are first read, see `get_derived_load_cases`
 
         if support_type == 'COLUMNS' and DO_NEW:
 
@@ -204,6 +164,8 @@ def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, di
 
                 level_loads[current_level_filename][support_type]['SUMMARY'][location] = summary_reaction
 
+            level_loads[current_level_filename][support_type]['SUMMARY'] = ReactionTable.from_rows(level_loads[current_level_filename][support_type]['SUMMARY'], support_type)
+
                 # if all_dead.
                 #     all_dead = 0
 
@@ -211,24 +173,59 @@ def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, di
             # set_reactions(model,level_loads, current_level_filename, 'TRANSFER_LL_UNREDUCIBLE',support_type, settings, logger=logger)
             # set_reactions(model,level_loads, current_level_filename, 'LL_UNREDUCIBLE',support_type, settings, logger=logger)
 
-            # level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'] = copy.deepcopy(level_loads[current_level_filename][support_type]['LL_UNREDUCIBLE'])
+            # level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'] = level_loads[current_level_filename][support_type]['LL_UNREDUCIBLE'].copy()
             # add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'], level_loads[current_level_filename][support_type]['TRANSFER_LL_UNREDUCIBLE'], addT_subF = True)
 
-            # level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'] = copy.deepcopy(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS'])
+            # level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'] = level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS'].copy()
             # add_sub_reactions(level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_REDUCIBLE'], level_loads[current_level_filename][support_type]['ALL_LIVE_LOADS_UNREDUCIBLE'], addT_subF = False)
     
-    def add_support_type_loads(support_type):
-        add_loads(model, level_loads, previous_level_filename, 'ALL_DEAD_LC', support_type, model.cad_manager.force_loading_layer(settings["TRANSFER_DEAD"]))
+    def check_cancelled(stage: str):
+        # Stopping inside a floor closes its model unsaved, the CPT stays as it was last saved
+        if control is not None and control.is_cancel_requested:
+            logger.info(f"Closing {current_level_filename} without saving")
+            with timer.stage('close_model'):
+                model.close_model()
+            control.check_cancelled(stage)
+
+    def get_transfer_layers(support_type) -> list[tuple[str, str, list | None]]:
+        """(load case, loading layer name, load types) of each transfer loading layer written for `support_type`."""
+        transfer_layers = [('ALL_DEAD_LC', settings["TRANSFER_DEAD"], None)]
 
         if template_has_llur:
-            add_loads(model, level_loads, previous_level_filename, 'ALL_LIVE_LOADS_REDUCIBLE', support_type, model.cad_manager.force_loading_layer(settings["TRANSFER_LL_REDUCIBLE"]))
-            add_loads(model, level_loads, previous_level_filename, 'ALL_LIVE_LOADS_UNREDUCIBLE', support_type, model.cad_manager.force_loading_layer(settings["TRANSFER_LL_UNREDUCIBLE"]))
+            transfer_layers.append(('ALL_LIVE_LOADS_REDUCIBLE', settings["TRANSFER_LL_REDUCIBLE"], None))
+            transfer_layers.append(('ALL_LIVE_LOADS_UNREDUCIBLE', settings["TRANSFER_LL_UNREDUCIBLE"], None))
 
         else:
-            add_loads(model, level_loads, previous_level_filename, 'ALL_LIVE_LOADS', support_type, model.cad_manager.force_loading_layer(settings["TRANSFER_LL_REDUCIBLE"]))
+            transfer_layers.append(('ALL_LIVE_LOADS', settings["TRANSFER_LL_REDUCIBLE"], None))
 
         if support_type == 'COLUMNS' and DO_NEW:
-            add_loads(model, level_loads, previous_level_filename, 'SUMMARY', support_type, model.cad_manager.force_loading_layer('_SUMMARY_TRANSFER_LOADS'),load_types = [('Fr','Fx'),('Fs','Fy'),('Fz','Fz'),('Fr','Mx'),('Ms','My')])
+            transfer_layers.append(('SUMMARY', '_SUMMARY_TRANSFER_LOADS', [('Fr','Fx'),('Fs','Fy'),('Fz','Fz'),('Fr','Mx'),('Ms','My')]))
+
+        return transfer_layers
+
+    def add_support_type_loads(support_type):
+        with timer.stage('add_loads', support_type=support_type):
+            for lc_name, layer_name, load_types in get_transfer_layers(support_type):
+                add_loads(model, level_loads, previous_level_filename, lc_name, support_type, model.cad_manager.force_loading_layer(layer_name), load_types = load_types)
+                if solve_fingerprint is not None:
+                    layer_hash = hash_transfer_layer(level_loads[previous_level_filename][support_type][lc_name], support_type, load_types)
+                    solve_fingerprint.transfer_layer_written(transfer_layer_key(support_type, layer_name, load_types), layer_hash)
+
+    def sync_support_type_loads(support_type) -> TransferLoadEdits:
+        edits = TransferLoadEdits()
+        with timer.stage('sync_loads', support_type=support_type):
+            for lc_name, layer_name, load_types in get_transfer_layers(support_type):
+                layer_key = transfer_layer_key(support_type, layer_name, load_types)
+                layer_hash = hash_transfer_layer(level_loads[previous_level_filename][support_type][lc_name], support_type, load_types)
+                if solve_fingerprint.transfer_layer_is_current(layer_key, layer_hash):
+                    edits.unchanged_layers += 1
+                else:
+                    # A layer last written by the rundown with the same load types only needs its transferred components compared
+                    is_rundown_written = layer_key in solve_fingerprint.transfer_layer_hashes
+                    edits += sync_loads(model, level_loads, previous_level_filename, lc_name, support_type, model.cad_manager.force_loading_layer(layer_name), load_types = load_types, tolerance = settings['SUPPORT_MATCH_TOLERANCE'], is_rundown_written = is_rundown_written)
+                solve_fingerprint.transfer_layer_written(layer_key, layer_hash)
+        timer.count('transfer_load_edits', edits.total)
+        return edits
 
     # try:
     # The above code is a Python function that performs a series of tasks. Here is a breakdown of
@@ -243,119 +240,357 @@ def _run(settings: SettingsDict, progress=0, level_loads: dict[str, dict[str, di
         attempts = 1
     
     
-    updataed_files = []
-    for e,file_dict in enumerate(settings['FILES'][settings["START_FROM_LEVEL_OR_INDEX"]:settings["END_AT_LEVEL_OR_INDEX"]+1]):
-        for _ in range(int(file_dict['typical'])):
-            updataed_files.append(file_dict)
-    settings['FILES'] = updataed_files
-
-
-    FILES = settings['FILES']
-
-    for e, file in enumerate(FILES[progress:]):
-        concept = Concept.start_concept(headless=True)
-        logger.info('')
-        filename = file['filename']
-        filepath = file['filepath']
-        logger.info(f"Opening file {filename}")
-
-        model = concept.open_file(filepath)
-
-        if create_backup_files:
-            path = os.path.dirname(filepath)
-            if not os.path.isdir(path + '/backups'):
-                os.mkdir(path + '/backups')    
-            backup_name = f"/backups/{filename}.bak_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}"
-            logger.info(f"Creating backup file {backup_name}")
-            model.save_file(f"{filepath}.bak_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}")
-        # model.calc_options.supports_above_in_self_dead = False
-
-        if e == 0:
-            previous_level_filename = file['filename']
-        else:
-            previous_level_filename = current_level_filename
-
-        current_level_filename = file['filename']
-
-        logger.info(f"Validating loading and load combinations types for {current_level_filename}")
-        validate_loading_types(model, settings, filename, logger=logger)
-        validate_load_comboinations_types(model, settings, filename, logger=logger)
-
-        if e > 0 and do_transfer:
-            logger.info(f"Deleting transfer loads from previous rundown if any for {current_level_filename}")
-            delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_DEAD"]))
-            delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_LL_REDUCIBLE"]))      
-            if DO_NEW:
-                delete_loadings(model.cad_manager.force_loading_layer("_SUMMARY_TRANSFER_LOADS")) 
-            if template_has_llur:
-                delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_LL_UNREDUCIBLE"]))
-
-            logger.info(f"Adding column loads for {current_level_filename}")
-            add_support_type_loads('COLUMNS')
-            logger.info(f"Adding column loads for {current_level_filename}")
-            add_support_type_loads('WALLS')
+    FILES = get_rundown_files(settings)
+
+    if checkpoint is not None:
+        checkpoint.start(progress)
+
+    if timer is None:
+        timer = StageTimer.from_settings(settings, logger=logger)
+
+    if api_tracer is None:
+        api_tracer = ConceptApiTracer.from_settings(settings, logger=logger)
+
+    if session_recorder is None:
+        session_recorder = ConceptSessionRecorder.from_settings(settings, logger=logger)
+
+    owns_engine_pool = engine_pool is None
+    if owns_engine_pool:
+        engine_pool = ConceptEnginePool(
+            max_engines = settings['CONCEPT_ENGINE_POOL_SIZE'],
+            recycle_after_n_models = settings['RECYCLE_ENGINE_AFTER_N_MODELS'],
+            logger = logger,
+        )
+
+    incremental_cache = IncrementalRundownCache(settings, logger=logger) if settings['INCREMENTAL_RUNDOWN'] else None
+
+    harvested_load_cases = get_harvested_load_cases(settings)
+    derived_load_cases = get_derived_load_cases(settings)
+
+    # level_loads of the first solved storey of each typical stack, keyed by filename
+    typical_first_level_loads = dict()
+
+    first_floor = progress
+    try:
+        for e, file in enumerate(FILES[progress:], start=progress):
+            if control is not None and e > first_floor:
+                # The previous floor is saved, closed and checkpointed, so the run can pause or stop here
+                control.floor_finished(FILES[e - 1]['filename'], logger=logger)
+
+            if is_derived_typical_floor(file, settings) and file['filename'] in typical_first_level_loads:
+                logger.info('')
+                current_level_filename = file['filename']
+                logger.info(f"Deriving typical floor {current_level_filename} ({file['typical_index'] + 1} of {file['typical_count']}) from the first floor of the stack")
+                with timer.floor(e, current_level_filename):
+                    with timer.stage('derive_typical_floor'):
+                        level_loads[current_level_filename] = derive_typical_level_loads(typical_first_level_loads[current_level_filename], file['typical_index'], settings)
+                    timer.count('floors_derived')
+
+                    if do_centroid:
+                        with timer.stage('get_centroids'):
+                            centroid_data[current_level_filename] = get_centroids(level_loads, current_level_filename, template_has_llur, settings,  logger=logger)
+                        log_centroid_calcs(centroid_data[current_level_filename],logger = logger)
+
+                progress += 1
+                if checkpoint is not None:
+                    checkpoint.save_floor(e, file, level_loads[current_level_filename], centroid_data.get(current_level_filename))
+                continue
+
+            if incremental_cache is not None:
+                incoming_transfer_loads = None
+                if e > 0 and do_transfer:
+                    incoming_transfer_loads = get_incoming_transfer_loads(level_loads[FILES[e - 1]['filename']], settings)
+
+                cached_floor = incremental_cache.lookup(file, incoming_transfer_loads)
+                if cached_floor:
+                    logger.info('')
+                    current_level_filename = file['filename']
+                    logger.info(f"Inputs for {current_level_filename} are unchanged since the last rundown, reusing its reactions")
+                    level_loads[current_level_filename] = cached_floor['level_loads']
+                    timer.count('floors_reused')
+
+                    if do_centroid:
+                        if cached_floor['centroid_data'] is None:
+                            with timer.floor(e, current_level_filename), timer.stage('get_centroids'):
+                                cached_floor['centroid_data'] = get_centroids(level_loads, current_level_filename, template_has_llur, settings,  logger=logger)
+                        centroid_data[current_level_filename] = cached_floor['centroid_data']
+                        log_centroid_calcs(centroid_data[current_level_filename],logger = logger)
+
+                    progress += 1
+                    if checkpoint is not None:
+                        checkpoint.save_floor(e, file, level_loads[current_level_filename], centroid_data.get(current_level_filename))
+                    continue
+
+            with timer.floor(e, file['filename']), engine_pool.engine() as concept:
+                if session_recorder is not None:
+                    concept = session_recorder.wrap(concept)
+                if api_tracer is not None:
+                    concept = api_tracer.wrap(concept)
+                logger.info('')
+                filename = file['filename']
+                filepath = file['filepath']
+                logger.info(f"Opening file {filename}")
+
+                with timer.stage('open_file'):
+                    model = concept.open_file(filepath)
+                geometry = SupportGeometry(model)
+                solve_fingerprint = None
+                if settings['SKIP_UNCHANGED_SOLVES'] or settings['SYNC_TRANSFER_LOADS']:
+                    solve_fingerprint = SolveFingerprint(filepath, geometry, logger=logger, track_solves=settings['SKIP_UNCHANGED_SOLVES'])
+
+                if create_backup_files:
+                    path = os.path.dirname(filepath)
+                    if not os.path.isdir(path + '/backups'):
+                        os.mkdir(path + '/backups')    
+                    backup_name = f"/backups/{filename}.bak_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}"
+                    logger.info(f"Creating backup file {backup_name}")
+                    with timer.stage('backup'):
+                        model.save_file(f"{filepath}.bak_{datetime.now().strftime('%Y_%m_%d@%H_%M_%S')}")
+                # model.calc_options.supports_above_in_self_dead = False
+
+                if e == 0:
+                    previous_level_filename = file['filename']
+                else:
+                    previous_level_filename = FILES[e - 1]['filename']
+
+                current_level_filename = file['filename']
+
+                logger.info(f"Validating loading and load combinations types for {current_level_filename}")
+                with timer.stage('validate'):
+                    validate_loading_types(model, settings, filename, logger=logger)
+                    validate_load_comboinations_types(model, settings, filename, logger=logger)
+
+                # The stored results are only those of the loads in the model if no load was edited
+                n_transfer_load_edits = 0
+                are_transfer_loads_rewritten = False
+
+                if e > 0 and do_transfer and settings['SYNC_TRANSFER_LOADS']:
+                    logger.info(f"Updating transfer loads from previous rundown if any for {current_level_filename}")
+                    if not solve_fingerprint.is_saved_by_rundown:
+                        # The rundown leaves no area loads on the transfer layers, so only a CPT saved since by hand can have any
+                        transfer_layer_names = {layer_name for support_type in ('COLUMNS', 'WALLS') for _, layer_name, _ in get_transfer_layers(support_type)}
+                        with timer.stage('delete_loadings'):
+                            for layer_name in transfer_layer_names:
+                                n_transfer_load_edits += delete_loadings(model.cad_manager.force_loading_layer(layer_name), line_loads=False, point_loads=False)
+
+                    logger.info(f"Updating column loads for {current_level_filename}")
+                    column_edits = sync_support_type_loads('COLUMNS')
+                    logger.info(f"Column transfer loads: {column_edits}")
+                    logger.info(f"Updating wall loads for {current_level_filename}")
+                    wall_edits = sync_support_type_loads('WALLS')
+                    logger.info(f"Wall transfer loads: {wall_edits}")
+                    n_transfer_load_edits += column_edits.total + wall_edits.total
+
+                elif e > 0 and do_transfer:
+                    are_transfer_loads_rewritten = True
+                    logger.info(f"Deleting transfer loads from previous rundown if any for {current_level_filename}")
+                    with timer.stage('delete_loadings'):
+                        delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_DEAD"]))
+                        delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_LL_REDUCIBLE"]))      
+                        if DO_NEW:
+                            delete_loadings(model.cad_manager.force_loading_layer("_SUMMARY_TRANSFER_LOADS")) 
+                        if template_has_llur:
+                            delete_loadings(model.cad_manager.force_loading_layer(settings["TRANSFER_LL_UNREDUCIBLE"]))
+
+                    logger.info(f"Adding column loads for {current_level_filename}")
+                    add_support_type_loads('COLUMNS')
+                    logger.info(f"Adding column loads for {current_level_filename}")
+                    add_support_type_loads('WALLS')
             
-        if genererate_mesh:
-            logger.info(f"Generating mesh for {current_level_filename}")
-            model.generate_mesh()
+                transfer_loads_hash = None
+                if e > 0 and do_transfer:
+                    transfer_loads_hash = hash_transfer_loads(level_loads[previous_level_filename], {support_type: get_transfer_layers(support_type) for support_type in ('COLUMNS', 'WALLS')})
+
+                if genererate_mesh:
+                    if solve_fingerprint is not None and solve_fingerprint.mesh_is_current():
+                        logger.info(f"Supports and column stiffnesses of {current_level_filename} are unchanged since the last mesh, skipping mesh generation")
+                        timer.count('mesh_skipped')
+                    else:
+                        logger.info(f"Generating mesh for {current_level_filename}")
+                        with timer.stage('generate_mesh'):
+                            model.generate_mesh()
+                        if solve_fingerprint is not None:
+                            solve_fingerprint.mesh_generated()
         
-        logger.info(f"Calculating model for {current_level_filename}")
-        model.calc_all()
-        level_loads[current_level_filename] = dict(COLUMNS=dict(),WALLS=dict())
-        logger.info(f"Getting column reactions for {current_level_filename}")
-
-        set_support_type_reactions('COLUMNS')
-
-        if do_update_column_stiffness:
-
-            ultimate_column_loads = get_ultimate_column_reactions(level_loads, current_level_filename,logger=logger)
-            update_column_stiffness(model, ultimate_column_loads, settings)
-            logger.info(f"Regenerating mesh for updated column stiffnesses")
-            
-            model.generate_mesh()
-            logger.info(f"Getting revised column reactions for {current_level_filename}")
-
-            set_support_type_reactions('COLUMNS')
-
-
-        logger.info(f"Getting wall reactions for {current_level_filename}")
-        set_support_type_reactions('WALLS')
-
-        if do_centroid:
-            centroid_loads = copy.deepcopy(level_loads)
-            # Process loads using the new function
-            centroid_data[filename] = get_centroids(centroid_loads, current_level_filename, template_has_llur, settings,  logger=logger)
-            log_centroid_calcs(centroid_data[filename],logger = logger)
-
-        logger.info(f"Getting wall reactions for {current_level_filename}")
-        logger.info(f"Saving file {current_level_filename}")
-        model.save_file(filepath)
-        progress += 1
-        logger.info(f"Closing File {current_level_filename}")
-        model.close_model()
-        logger.info(f"File {current_level_filename} closed")
+                if solve_fingerprint is not None and not are_transfer_loads_rewritten and n_transfer_load_edits == 0 and solve_fingerprint.results_are_current(transfer_loads_hash):
+                    logger.info(f"Mesh and transfer loads of {current_level_filename} are unchanged since the last calculation, skipping calculation")
+                    timer.count('calc_skipped')
+                else:
+                    logger.info(f"Calculating model for {current_level_filename}")
+                    with timer.stage('calc_all'):
+                        model.calc_all()
+                    if solve_fingerprint is not None:
+                        solve_fingerprint.calculated(transfer_loads_hash)
+                    check_cancelled(f"after calculating {current_level_filename}")
+                level_loads[current_level_filename] = dict(COLUMNS=FloorLoadCases(derived_load_cases),WALLS=FloorLoadCases(derived_load_cases))
+                harvester = ReactionHarvester(model, settings, geometry=geometry, logger=logger)
+                logger.info(f"Getting column reactions for {current_level_filename}")
+
+                set_support_type_reactions('COLUMNS')
+
+                if do_update_column_stiffness:
+
+                    max_iterations = settings['COLUMN_STIFFNESS_MAX_ITERATIONS']
+                    for iteration in range(1, max_iterations + 1):
+                        with timer.stage('update_column_stiffness', iteration=iteration):
+                            ultimate_column_loads = get_ultimate_column_reactions(level_loads, current_level_filename,logger=logger, tolerance=settings['SUPPORT_MATCH_TOLERANCE'])
+                            columns_changed = update_column_stiffness(model, ultimate_column_loads, settings, geometry=geometry)
+                        timer.count('column_stiffnesses_updated', columns_changed)
+                        if not columns_changed:
+                            logger.info(f"Column stiffnesses converged for {current_level_filename} after {iteration - 1} updates")
+                            break
+
+                        logger.info(f"Regenerating mesh for {columns_changed} updated column stiffnesses (update {iteration} of {max_iterations})")
+                        with timer.stage('generate_mesh', iteration=iteration):
+                            model.generate_mesh()
+                        geometry.invalidate_elements()
+                        if solve_fingerprint is not None:
+                            solve_fingerprint.mesh_generated()
+
+                        logger.info(f"Recalculating model for {current_level_filename}")
+                        with timer.stage('calc_all', iteration=iteration):
+                            model.calc_all()
+                        if solve_fingerprint is not None:
+                            solve_fingerprint.calculated(transfer_loads_hash)
+                        check_cancelled(f"after recalculating {current_level_filename}")
+
+                        logger.info(f"Getting revised column reactions for {current_level_filename}")
+                        set_support_type_reactions('COLUMNS')
+
+                    else:
+                        if max_iterations > 1:
+                            logger.warning(f"Column stiffnesses of {current_level_filename} did not converge within {max_iterations} updates")
+
+
+                logger.info(f"Getting wall reactions for {current_level_filename}")
+                set_support_type_reactions('WALLS')
+
+                if file.get('typical_index') == 0 and file.get('typical_count', 1) > 2:
+                    typical_first_level_loads[current_level_filename] = level_loads[current_level_filename]
+
+                if do_centroid:
+                    with timer.stage('get_centroids'):
+                        centroid_data[filename] = get_centroids(level_loads, current_level_filename, template_has_llur, settings,  logger=logger)
+                    log_centroid_calcs(centroid_data[filename],logger = logger)
+
+                logger.info(f"Getting wall reactions for {current_level_filename}")
+                check_cancelled(f"before saving {current_level_filename}")
+                logger.info(f"Saving file {current_level_filename}")
+                with timer.stage('save_file'):
+                    model.save_file(filepath)
+                if solve_fingerprint is not None:
+                    solve_fingerprint.save()
+                progress += 1
+                logger.info(f"Closing File {current_level_filename}")
+                with timer.stage('close_model'):
+                    model.close_model()
+                logger.info(f"File {current_level_filename} closed")
+
+                if checkpoint is not None:
+                    checkpoint.save_floor(e, file, level_loads[current_level_filename], centroid_data.get(current_level_filename))
+
+                if incremental_cache is not None:
+                    incremental_cache.store(file, incoming_transfer_loads, level_loads[current_level_filename], centroid_data.get(current_level_filename))
+
+    finally:
+        if owns_engine_pool:
+            engine_pool.shut_down()
 
     if do_centroid:
         logger.info(f"Creating Excel file for centroid data")
         excel_filepath = create_excel_from_centroid_data(centroid_data, settings['ROOT_DIRECTORY'], settings['DRAWING_SCALE_1_TO'])
-        logger.info(f"Opening Excel file for centroid data")
-        open_excel(excel_filepath)
+        if settings['OPEN_CENTROID_EXCEL']:
+            logger.info(f"Opening Excel file for centroid data")
+            open_excel(excel_filepath)
 
-    logger.info(f"SCRIPT COMPLETED SUCCESSFULLY")
-    return 
+    if checkpoint is not None:
+        checkpoint.mark_completed()
 
+    if incremental_cache is not None:
+        logger.info(f"Reused the reactions of {incremental_cache.floors_reused} unchanged floors")
 
-    # except Exception as exc:
-
-    #     if attempts >= settings['MAX_ATTEMPTS_IF_ERRORS_RAISED']:
-    #         logger.error(f"RAM Concept spamming error: {exc}, max attempts reached of {settings['MAX_ATTEMPTS_IF_ERRORS_RAISED']}, exiting script")
-    #         debug_exit(settings, is_error=True, logger = logger)
-
-    #     logger.info(f"RAM Concept spamming error: {exc}, waiting 60 seconds and trying again")
-    #     for t in range(int(60/5)):
-    #         logger.info(f"Restarting in {int(60-t*5)} seconds")
-    #         time.sleep(5)
-    #     attempts += 1
-    #     _run(settings, progress=progress, level_loads=level_loads,centroid_data = centroid_data, attempts=attempts, logger=logger)
-    #     # debug_exit(settings, is_error=True, logger = logger)
-
+    log_run_reports(timer, api_tracer, session_recorder)
+    logger.info(f"SCRIPT COMPLETED SUCCESSFULLY")
+    return progress
+
+def log_run_reports(timer: StageTimer, api_tracer: ConceptApiTracer = None, session_recorder: ConceptSessionRecorder = None):
+    """Logs the stage timings and API trace of a run and saves its recorded RAM Concept session."""
+    timer.log_summary()
+    if api_tracer is not None:
+        api_tracer.log_report()
+    if session_recorder is not None:
+        session_recorder.save()
+
+def get_rundown_files(settings: SettingsDict) -> list[dict]:
+    """The files between START_FROM_LEVEL_OR_INDEX and END_AT_LEVEL_OR_INDEX, with each typical floor repeated."""
+    return expand_typical_files(settings['FILES'][settings["START_FROM_LEVEL_OR_INDEX"]:settings["END_AT_LEVEL_OR_INDEX"]+1])
+
+def run_with_restarts(settings: SettingsDict, resume: bool = False, logger: Logger = None, control: RundownControl = None):
+    """
+    Runs the rundown, checkpointing after every floor.
+
+    If ATEMPT_RESTART_IF_ERROR is set, an error raised during a floor (e.g. RAM Concept crashing)
+    restarts the rundown from the last checkpoint, up to MAX_ATTEMPTS_IF_ERRORS_RAISED attempts.
+    With resume=True the first attempt also starts from the last checkpoint of a previous run.
+
+    `control` pauses, stops or cancels the run from another thread, see `RundownControl`. A
+    stopped or cancelled run returns None and can be resumed from its checkpoint.
+    """
+    checkpoint = RundownCheckpoint(settings, get_rundown_files(settings), logger=logger)
+    engine_pool = ConceptEnginePool(
+        max_engines = settings['CONCEPT_ENGINE_POOL_SIZE'],
+        recycle_after_n_models = settings['RECYCLE_ENGINE_AFTER_N_MODELS'],
+        logger = logger,
+    )
+    # One timer for every attempt, so the summary covers the floors solved before a restart too
+    timer = StageTimer.from_settings(settings, logger=logger)
+    api_tracer = ConceptApiTracer.from_settings(settings, logger=logger)
+    session_recorder = ConceptSessionRecorder.from_settings(settings, logger=logger)
+
+    attempts = 1
+    try:
+        while True:
+            progress, level_loads, centroid_data = 0, None, None
+            if resume:
+                restored = checkpoint.restore()
+                if restored:
+                    progress, level_loads, centroid_data = restored
+                    logger.info(f"Resuming rundown from checkpoint at floor {progress + 1}")
+                else:
+                    logger.info(f"No checkpoint to resume from, starting from the first floor")
+
+            try:
+                return _run(settings, progress=progress, level_loads=level_loads, centroid_data=centroid_data, attempts=attempts, logger=logger, engine_pool=engine_pool, checkpoint=checkpoint, timer=timer, api_tracer=api_tracer, session_recorder=session_recorder, control=control)
+
+            except RundownStopped as exc:
+                logger.info(f"{exc}, resume the rundown to continue from the last saved floor")
+                log_run_reports(timer, api_tracer, session_recorder)
+                return None
+
+            except Exception as exc:
+                if not settings['ATEMPT_RESTART_IF_ERROR']:
+                    logger.error(f"RAM Concept error: {exc}, restart on error is off, exiting script")
+                    log_run_reports(timer, api_tracer, session_recorder)
+                    debug_exit(settings, is_error=True, logger = logger)
+                    raise
+
+                if attempts >= settings['MAX_ATTEMPTS_IF_ERRORS_RAISED']:
+                    logger.error(f"RAM Concept spamming error: {exc}, max attempts reached of {settings['MAX_ATTEMPTS_IF_ERRORS_RAISED']}, exiting script")
+                    log_run_reports(timer, api_tracer, session_recorder)
+                    debug_exit(settings, is_error=True, logger = logger)
+                    raise
+
+                logger.info(f"RAM Concept spamming error: {exc}, waiting {RESTART_WAIT_SECONDS} seconds and restarting from the last checkpoint")
+                for t in range(int(RESTART_WAIT_SECONDS/5)):
+                    if control is not None and control.is_stop_requested:
+                        break
+                    logger.info(f"Restarting in {int(RESTART_WAIT_SECONDS-t*5)} seconds")
+                    time.sleep(5)
+                if control is not None and control.is_stop_requested:
+                    logger.info(f"Rundown stopped before restarting, resume the rundown to continue from the last saved floor")
+                    log_run_reports(timer, api_tracer, session_recorder)
+                    return None
+                attempts += 1
+                resume = True
+    finally:
+        engine_pool.shut_down()
@@ -0,0 +1,151 @@
+from .add_loads_to_layer import get_column_transfer_loads, get_wall_transfer_loads
+from .checkpoint import hash_file
+from .support_geometry import SupportGeometry
+from logging import Logger
+import hashlib
+import json
+import os
+import numpy as np
+
+SOLVE_FINGERPRINT_SUFFIX = '.solve.json'
+
+
+def _update_hash(sha, *arrays: np.ndarray):
+    for array in arrays:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        sha.update(str(array.shape).encode())
+        sha.update(array.tobytes())
+
+
+def hash_mesh_inputs(geometry: SupportGeometry) -> str:
+    """Hashes the supports below the slab and the column stiffness factors, the inputs the rundown changes that affect the mesh."""
+    sha = hashlib.sha256()
+    columns = geometry.structure_columns
+    _update_hash(sha, np.array(columns.keys, dtype=np.float64).reshape(-1, 2), columns.b, columns.d, columns.height, columns.fc, columns.i_factors)
+    walls = geometry.structure_walls
+    _update_hash(sha, np.array(walls.keys, dtype=np.float64).reshape(-1, 4), walls.thickness, walls.height)
+    return sha.hexdigest()
+
+
+def hash_transfer_loads(floor_above_level_loads: dict, transfer_layers: dict[str, list[tuple[str, str, list | None]]]) -> str:
+    """
+    Hashes the transfer loads written from `floor_above_level_loads`, the same rounded values
+    `add_loads` and `sync_loads` put on each transfer loading layer.
+
+    Args:
+    - floor_above_level_loads (dict): level_loads of the floor above.
+    - transfer_layers (dict): (load case, loading layer name, load types) of each transfer layer, by support type.
+    """
+    sha = hashlib.sha256()
+    for support_type, layers in transfer_layers.items():
+        for lc_name, layer_name, load_types in layers:
+            sha.update(f"{support_type}|{lc_name}|{layer_name}|{load_types}".encode())
+            _update_transfer_layer_hash(sha, floor_above_level_loads[support_type][lc_name], support_type, load_types)
+    return sha.hexdigest()
+
+
+def _update_transfer_layer_hash(sha, reactions, support_type: str, load_types: list | None):
+    if support_type == 'COLUMNS':
+        _update_hash(sha, reactions.xy, *(loads for _, loads in get_column_transfer_loads(reactions, load_types)))
+    else:
+        _update_hash(sha, reactions.segments, get_wall_transfer_loads(reactions))
+
+
+def transfer_layer_key(support_type: str, layer_name: str, load_types: list | None) -> str:
+    """Identifies the loads of `support_type` on a transfer loading layer, written with `load_types`."""
+    return f"{support_type}|{layer_name}|{load_types}"
+
+
+def hash_transfer_layer(reactions, support_type: str, load_types: list | None) -> str:
+    """Hashes the transfer loads `add_loads` and `sync_loads` write on one loading layer from `reactions`."""
+    sha = hashlib.sha256()
+    _update_transfer_layer_hash(sha, reactions, support_type, load_types)
+    return sha.hexdigest()
+
+
+class SolveFingerprint:
+    """
+    Tracks whether the mesh and the calculation results in a CPT are current, so an unchanged
+    model is not meshed or calculated again.
+
+    A sidecar next to the CPT (`<file>.cpt.solve.json`) records the hash of the CPT as the rundown
+    saved it, the fingerprint of the mesh inputs when the mesh was generated and the fingerprint
+    of the mesh inputs and transfer loads when the model was calculated. If the CPT has been
+    edited since, e.g. in RAM Concept, nothing is trusted and the model is meshed and calculated
+    as before.
+
+    It also records the hash of the transfer loads written on each transfer loading layer (see
+    `transfer_layer_key`), so `sync_loads` can skip a layer whose incoming loads are unchanged.
+    With `track_solves` False, only the transfer layers are tracked.
+    """
+
+    def __init__(self, filepath: str, geometry: SupportGeometry, logger: Logger = None, track_solves: bool = True):
+        self.filepath = filepath
+        self.sidecar_path = filepath + SOLVE_FINGERPRINT_SUFFIX
+        self.geometry = geometry
+        self.logger = logger
+        self.track_solves = track_solves
+        self.mesh_fingerprint = None
+        self.solve_fingerprint = None
+        # True if the CPT is as the rundown last saved it, so its transfer layers hold only loads the rundown wrote
+        self.is_saved_by_rundown = False
+        self.transfer_layer_hashes: dict[str, str] = {}
+        self._written_transfer_layer_hashes: dict[str, str] = {}
+
+        stored = self._read()
+        if stored is not None and stored.get('cpt_hash') == hash_file(filepath):
+            self.is_saved_by_rundown = True
+            if track_solves:
+                self.mesh_fingerprint = stored.get('mesh_fingerprint')
+                self.solve_fingerprint = stored.get('solve_fingerprint')
+            self.transfer_layer_hashes = stored.get('transfer_layer_hashes', {})
+
+    def _read(self) -> dict | None:
+        if not os.path.isfile(self.sidecar_path):
+            return None
+        try:
+            with open(self.sidecar_path) as file:
+                return json.load(file)
+        except (OSError, ValueError) as exc:
+            if self.logger:
+                self.logger.warning(f"Could not read solve fingerprint {self.sidecar_path}: {exc}")
+            return None
+
+    def _solve_hash(self, transfer_loads_hash: str | None) -> str:
+        return hashlib.sha256(f"{hash_mesh_inputs(self.geometry)}|{transfer_loads_hash}".encode()).hexdigest()
+
+    def mesh_is_current(self) -> bool:
+        return self.mesh_fingerprint is not None and self.mesh_fingerprint == hash_mesh_inputs(self.geometry)
+
+    def results_are_current(self, transfer_loads_hash: str | None) -> bool:
+        return self.solve_fingerprint is not None and self.solve_fingerprint == self._solve_hash(transfer_loads_hash)
+
+    def mesh_generated(self):
+        """Call after `model.generate_mesh()`, which also discards the calculation results."""
+        self.mesh_fingerprint = hash_mesh_inputs(self.geometry) if self.track_solves else None
+        self.solve_fingerprint = None
+
+    def calculated(self, transfer_loads_hash: str | None):
+        """Call after `model.calc_all()` with the hash of the transfer loads the model was calculated with."""
+        self.solve_fingerprint = self._solve_hash(transfer_loads_hash) if self.track_solves else None
+
+    def transfer_layer_is_current(self, layer_key: str, layer_hash: str) -> bool:
+        """True if the layer already holds exactly these transfer loads, as the rundown last wrote them."""
+        return self.transfer_layer_hashes.get(layer_key) == layer_hash
+
+    def transfer_layer_written(self, layer_key: str, layer_hash: str):
+        """Call after writing, or skipping as current, the transfer loads of a layer. Layers not written this run are forgotten on save."""
+        self._written_transfer_layer_hashes[layer_key] = layer_hash
+
+    def save(self):
+        """Call after the model has been saved to `filepath`."""
+        sidecar = dict(
+            cpt_hash = hash_file(self.filepath),
+            mesh_fingerprint = self.mesh_fingerprint,
+            solve_fingerprint = self.solve_fingerprint,
+            transfer_layer_hashes = self._written_transfer_layer_hashes,
+        )
+        temp_path = self.sidecar_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(sidecar, file, indent=4)
+        os.replace(temp_path, self.sidecar_path)
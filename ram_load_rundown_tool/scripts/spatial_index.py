@@ -0,0 +1,122 @@
+from collections import defaultdict
+import numpy as np
+
+# Supports closer than this (m, in every coordinate) are the same support
+SUPPORT_MATCH_TOLERANCE = 0.001
+
+
+def key_coordinates(keys: list[tuple]) -> np.ndarray:
+    """
+    The coordinates of support location keys as an array, (n, 2) for column keys (x, y)
+    and (n, 4) for wall keys ((start x, start y), (end x, end y)).
+    """
+    if not keys:
+        return np.zeros((0, 2))
+    if isinstance(keys[0][0], tuple):
+        return np.array([(*start, *end) for start, end in keys], dtype=np.float64).reshape(-1, 4)
+    return np.array(keys, dtype=np.float64).reshape(-1, 2)
+
+
+class SupportMatch:
+    """
+    The result of matching wanted supports to existing supports.
+
+    - index: the existing row matched to each wanted row, -1 where none is within tolerance.
+    - unmatched: the wanted rows with no existing row within tolerance, or whose only candidates were taken.
+    - ambiguous: the wanted rows with more than one existing row within tolerance; the nearest is used.
+    - unused: the existing rows not matched to any wanted row.
+    """
+
+    __slots__ = ('index', 'unmatched', 'ambiguous', 'unused')
+
+    def __init__(self, index: np.ndarray, ambiguous: np.ndarray, n_existing: int):
+        self.index = index
+        self.unmatched = np.flatnonzero(index < 0)
+        self.ambiguous = ambiguous
+        is_used = np.zeros(n_existing, dtype=bool)
+        is_used[index[index >= 0]] = True
+        self.unused = np.flatnonzero(~is_used)
+
+    @property
+    def is_complete(self) -> bool:
+        return not len(self.unmatched)
+
+    def __repr__(self):
+        return f"SupportMatch({len(self.index) - len(self.unmatched)} matched, {len(self.unmatched)} unmatched, {len(self.ambiguous)} ambiguous, {len(self.unused)} unused)"
+
+
+class SpatialIndex:
+    """
+    A grid hash over support coordinates, points (n, 2) or wall segments (n, 4).
+
+    Rows are bucketed by the grid cell of their first point, with cells `tolerance` wide, so the
+    rows within tolerance of a query are in the 3 x 3 cells around it. Building the index and
+    matching n rows are both O(n) for supports that are further apart than the tolerance.
+    """
+
+    def __init__(self, coordinates: np.ndarray, tolerance: float = SUPPORT_MATCH_TOLERANCE):
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
+        self.tolerance = tolerance
+        self._cells = defaultdict(list)
+        for i, cell in enumerate(self._cell_of(self.coordinates)):
+            self._cells[cell].append(i)
+
+    def _cell_of(self, coordinates: np.ndarray) -> list[tuple]:
+        if self.tolerance <= 0:
+            return [tuple(row) for row in coordinates[:, :2].tolist()]
+        return [tuple(row) for row in np.floor(coordinates[:, :2] / self.tolerance).astype(np.int64).tolist()]
+
+    def candidates(self, row: np.ndarray, cell: tuple) -> list[tuple[float, int]]:
+        """(distance, index) of the indexed rows within tolerance of `row`, nearest first."""
+        if self.tolerance <= 0:
+            nearby = [i for i in self._cells.get(cell, ()) if np.array_equal(self.coordinates[i], row)]
+            return [(0.0, i) for i in nearby]
+
+        cx, cy = cell
+        nearby = [i for dx in (-1, 0, 1) for dy in (-1, 0, 1) for i in self._cells.get((cx + dx, cy + dy), ())]
+        if not nearby:
+            return []
+        distance = np.max(np.abs(self.coordinates[nearby] - row), axis=1)
+        return sorted((float(d), i) for d, i in zip(distance, nearby) if d <= self.tolerance)
+
+    def match(self, coordinates: np.ndarray, allow_reversed: bool = False) -> SupportMatch:
+        """
+        Matches each row of `coordinates` to the nearest unused indexed row within tolerance.
+
+        With `allow_reversed`, a wall segment also matches an indexed segment drawn in the
+        opposite direction.
+        """
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        index = np.full(len(coordinates), -1, dtype=np.int64)
+        ambiguous = []
+        if not len(coordinates) or not len(self.coordinates):
+            return SupportMatch(index, np.array(ambiguous, dtype=np.int64), len(self.coordinates))
+
+        queries = [coordinates]
+        if allow_reversed and coordinates.shape[1] == 4:
+            queries.append(coordinates[:, [2, 3, 0, 1]])
+
+        candidates = [[] for _ in range(len(coordinates))]
+        for query in queries:
+            for i, (row, cell) in enumerate(zip(query, self._cell_of(query))):
+                candidates[i].extend(self.candidates(row, cell))
+
+        used = np.zeros(len(self.coordinates), dtype=bool)
+        # Closest pairs first, so a support is not taken by a worse match that happens to come earlier
+        order = sorted(range(len(coordinates)), key=lambda i: min(candidates[i])[0] if candidates[i] else np.inf)
+        for i in order:
+            rows = {j for _, j in candidates[i]}
+            if len(rows) > 1:
+                ambiguous.append(i)
+            for _, j in sorted(candidates[i]):
+                if not used[j]:
+                    used[j] = True
+                    index[i] = j
+                    break
+
+        return SupportMatch(index, np.array(sorted(ambiguous), dtype=np.int64), len(self.coordinates))
+
+
+def match_supports(wanted: np.ndarray, existing: np.ndarray, tolerance: float = SUPPORT_MATCH_TOLERANCE, allow_reversed: bool = False) -> SupportMatch:
+    """Matches wanted support coordinates to existing ones, see `SpatialIndex.match`."""
+    return SpatialIndex(existing, tolerance).match(wanted, allow_reversed=allow_reversed)
@@ -0,0 +1,158 @@
+from .default_settings import SettingsDict
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from logging import Logger
+import json
+import os
+import time
+
+TRACE_FILENAME_PREFIX = 'rundown_trace'
+
+
+class StageTimer:
+    """
+    Times the stages of a rundown (open_file, generate_mesh, calc_all, ...) on each floor.
+
+    Every timed stage, and every floor as a whole, is appended as one JSON line to the trace file,
+    so a crashed run still leaves its timings behind. Counters (e.g. transfer load edits) are kept
+    for the run and for the current floor, and written with the floor's record.
+
+        with timer.floor(e, filename):
+            with timer.stage('generate_mesh'):
+                model.generate_mesh()
+    """
+
+    def __init__(self, trace_path: str = None, logger: Logger = None):
+        self.trace_path = trace_path
+        self.logger = logger
+        self.run_id = datetime.now().strftime('%Y_%m_%d@%H_%M_%S')
+        self.records: list[dict] = []
+        self.counters: dict[str, int] = defaultdict(int)
+        self._floor = None
+
+    @classmethod
+    def from_settings(cls, settings: SettingsDict, logger: Logger = None) -> 'StageTimer':
+        """A timer writing to `<ROOT_DIRECTORY>/logs/rundown_trace_<time>.jsonl`, or only timing in memory if STAGE_TIMING is off."""
+        timer = cls(logger=logger)
+        if settings['STAGE_TIMING'] and settings['ROOT_DIRECTORY']:
+            log_folder = os.path.join(settings['ROOT_DIRECTORY'], 'logs')
+            if not os.path.isdir(log_folder):
+                os.makedirs(log_folder)
+            timer.trace_path = os.path.join(log_folder, f"{TRACE_FILENAME_PREFIX}_{timer.run_id}.jsonl")
+        return timer
+
+    def _write(self, record: dict):
+        record = dict(run_id=self.run_id, **record)
+        self.records.append(record)
+        if not self.trace_path:
+            return
+        try:
+            with open(self.trace_path, 'a') as file:
+                file.write(json.dumps(record) + '\n')
+        except OSError as exc:
+            if self.logger:
+                self.logger.warning(f"Could not write stage timing to {self.trace_path}: {exc}")
+            self.trace_path = None
+
+    @contextmanager
+    def floor(self, index: int, filename: str):
+        """Times a whole floor; stages and counts inside it are recorded against the floor."""
+        outer_floor = self._floor
+        self._floor = dict(index=index, filename=filename, counters=defaultdict(int))
+        started = datetime.now().isoformat(timespec='seconds')
+        start = time.perf_counter()
+        is_ok = False
+        try:
+            yield
+            is_ok = True
+        finally:
+            floor = self._floor
+            self._floor = outer_floor
+            self._write(dict(
+                floor_index = floor['index'],
+                filename = floor['filename'],
+                stage = 'floor',
+                started = started,
+                seconds = time.perf_counter() - start,
+                ok = is_ok,
+                counters = dict(floor['counters']),
+            ))
+
+    @contextmanager
+    def stage(self, name: str, **fields):
+        """Times one stage. `fields` (e.g. support_type='COLUMNS') are added to its record."""
+        started = datetime.now().isoformat(timespec='seconds')
+        start = time.perf_counter()
+        is_ok = False
+        try:
+            yield
+            is_ok = True
+        finally:
+            self._write(dict(
+                floor_index = self._floor['index'] if self._floor else None,
+                filename = self._floor['filename'] if self._floor else None,
+                stage = name,
+                started = started,
+                seconds = time.perf_counter() - start,
+                ok = is_ok,
+                **fields,
+            ))
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+        if self._floor is not None:
+            self._floor['counters'][name] += n
+
+    def summary(self, n_slowest: int = 5) -> str:
+        """The slowest floors, with their slowest stages, and the total time of each stage."""
+        floors = [record for record in self.records if record['stage'] == 'floor']
+        stages = [record for record in self.records if record['stage'] != 'floor']
+
+        stage_seconds_by_floor = defaultdict(lambda: defaultdict(float))
+        for record in stages:
+            stage_seconds_by_floor[(record['floor_index'], record['filename'])][record['stage']] += record['seconds']
+
+        lines = [f"Rundown timing: {len(floors)} floors in {_format_seconds(sum(record['seconds'] for record in floors))}"]
+
+        if floors:
+            lines.append("Slowest floors:")
+            for record in sorted(floors, key=lambda record: record['seconds'], reverse=True)[:n_slowest]:
+                floor_stages = stage_seconds_by_floor[(record['floor_index'], record['filename'])]
+                slowest_stages = ', '.join(f"{name} {_format_seconds(seconds)}" for name, seconds in sorted(floor_stages.items(), key=lambda item: item[1], reverse=True)[:3])
+                status = '' if record['ok'] else ' (failed)'
+                lines.append(f"  {record['filename']:<30} {_format_seconds(record['seconds']):>10}{status}  {slowest_stages}")
+
+        if stages:
+            totals = defaultdict(list)
+            for record in stages:
+                totals[record['stage']].append(record['seconds'])
+            lines.append("Stages:")
+            lines.append(f"  {'Stage':<30} {'Total':>10} {'Count':>6} {'Mean':>10} {'Max':>10}")
+            for name, seconds in sorted(totals.items(), key=lambda item: sum(item[1]), reverse=True):
+                lines.append(f"  {name:<30} {_format_seconds(sum(seconds)):>10} {len(seconds):>6} {_format_seconds(sum(seconds)/len(seconds)):>10} {_format_seconds(max(seconds)):>10}")
+
+        if self.counters:
+            lines.append("Counters: " + ', '.join(f"{name} {value}" for name, value in sorted(self.counters.items())))
+
+        return '\n'.join(lines)
+
+    def log_summary(self, n_slowest: int = 5):
+        if not self.logger:
+            return
+        for line in self.summary(n_slowest).splitlines():
+            self.logger.info(line)
+        if self.trace_path:
+            self.logger.info(f"Stage timings written to {self.trace_path}")
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 10:
+        return f"{seconds:.2f} s"
+    if seconds < 60:
+        return f"{seconds:.1f} s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
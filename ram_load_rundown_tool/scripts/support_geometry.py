@@ -0,0 +1,191 @@
+from ram_concept.model import Model
+from .RAM_geometry import wall_coordinates
+import numpy as np
+
+# Height assumed for the self weight of a wall group, as in `get_wall_group_reactions`
+WALL_SELF_WEIGHT_HEIGHT = 3
+
+
+def _sort_by_key(keys: list[tuple]) -> list[int]:
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+
+class ColumnGeometry:
+    """
+    The column elements below the slab, sorted by location key (x, y).
+
+    b, d are in mm, height in m, self_weight_volumes in m3 (b == 0 is a circular column of diameter d).
+    """
+
+    def __init__(self, elements: list, keys: list[tuple], names: list[str], b: list[float], d: list[float], height: list[float]):
+        order = _sort_by_key(keys)
+        self.elements = [elements[i] for i in order]
+        self.keys = [keys[i] for i in order]
+        self.names = [names[i] for i in order]
+        self.xy = np.array(self.keys, dtype=np.float64).reshape(-1, 2)
+        self.b = np.asarray(b, dtype=np.float64)[order]
+        self.d = np.asarray(d, dtype=np.float64)[order]
+        self.height = np.asarray(height, dtype=np.float64)[order]
+        self.areas = np.where(self.b == 0, np.pi * self.d**2 / 4, self.b * self.d)
+        self.self_weight_volumes = self.height * self.areas * 10**-6
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'ColumnGeometry':
+        elements = list(model.cad_manager.element_layer.column_elements_below)
+        keys, names, b, d, height = [], [], [], [], []
+        for column_element in elements:
+            location = column_element.location
+            keys.append((location.x, location.y))
+            names.append(column_element.name)
+            b.append(column_element.b)
+            d.append(column_element.d)
+            height.append(column_element.height)
+        return cls(elements, keys, names, b, d, height)
+
+
+class StructureColumnGeometry:
+    """
+    The structure layer columns below the slab, sorted by location key, with what the stiffness
+    update and the mesh fingerprint need. `i_factors` is kept in step by `update_column_stiffness`.
+    """
+
+    def __init__(self, columns: list, keys: list[tuple], b: list[float], d: list[float], height: list[float], fc: list[float], i_factors: list[float]):
+        order = _sort_by_key(keys)
+        self.columns = [columns[i] for i in order]
+        self.keys = [keys[i] for i in order]
+        self.b = np.asarray(b, dtype=np.float64)[order]
+        self.d = np.asarray(d, dtype=np.float64)[order]
+        self.height = np.asarray(height, dtype=np.float64)[order]
+        self.fc = np.asarray(fc, dtype=np.float64)[order]
+        self.i_factors = np.asarray(i_factors, dtype=np.float64)[order]
+        self.areas = np.where(self.b == 0, np.pi * self.d**2 / 4, self.b * self.d)
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'StructureColumnGeometry':
+        columns = list(model.cad_manager.structure_layer.columns_below)
+        keys, b, d, height, fc, i_factors = [], [], [], [], [], []
+        for column in columns:
+            location = column.location
+            keys.append((location.x, location.y))
+            b.append(column.b)
+            d.append(column.d)
+            height.append(column.height)
+            fc.append(column.concrete.fc_final)
+            i_factors.append(column.i_factor)
+        return cls(columns, keys, b, d, height, fc, i_factors)
+
+
+class StructureWallGeometry:
+    """The structure layer walls below the slab, sorted by wall line."""
+
+    def __init__(self, walls: list, keys: list[tuple], thickness: list[float], height: list[float]):
+        order = _sort_by_key(keys)
+        self.walls = [walls[i] for i in order]
+        self.keys = [keys[i] for i in order]
+        self.thickness = np.asarray(thickness, dtype=np.float64)[order]
+        self.height = np.asarray(height, dtype=np.float64)[order]
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'StructureWallGeometry':
+        walls = list(model.cad_manager.structure_layer.walls_below)
+        keys, thickness, height = [], [], []
+        for wall in walls:
+            location = wall.location
+            keys.append(((location.start_point.x, location.start_point.y), (location.end_point.x, location.end_point.y)))
+            thickness.append(wall.thickness)
+            height.append(wall.height)
+        return cls(walls, keys, thickness, height)
+
+
+class WallGeometry:
+    """
+    The wall element groups below the slab, sorted by location key ((start x, start y), (end x, end y)).
+
+    xy is the centroid of each group, total_areas are in mm2 and self_weight_volumes in m3.
+    """
+
+    def __init__(self, elements: list, keys: list[tuple], centroids: list, total_lengths: list[float], total_areas: list[float]):
+        order = _sort_by_key(keys)
+        self.elements = [elements[i] for i in order]
+        self.keys = [keys[i] for i in order]
+        self.names = None
+        self.xy = np.asarray(centroids, dtype=np.float64).reshape(-1, 2)[order]
+        self.segments = np.array([(*start, *end) for start, end in self.keys], dtype=np.float64).reshape(-1, 4)
+        self.lengths = np.hypot(self.segments[:, 2] - self.segments[:, 0], self.segments[:, 3] - self.segments[:, 1])
+        self.total_lengths = np.asarray(total_lengths, dtype=np.float64)[order]
+        self.total_areas = np.asarray(total_areas, dtype=np.float64)[order]
+        self.self_weight_volumes = WALL_SELF_WEIGHT_HEIGHT * self.total_areas * 10**-6
+
+    @classmethod
+    def from_model(cls, model: Model) -> 'WallGeometry':
+        elements = list(model.cad_manager.element_layer.wall_element_groups_below)
+        keys, centroids, total_lengths, total_areas = [], [], [], []
+        for wall_element in elements:
+            total_length = wall_element.total_length
+            centroid = wall_element.centroid
+            location = wall_coordinates(centroid, wall_element.reaction_angle, total_length)
+            keys.append(((location._start_point.x, location._start_point.y), (location._end_point.x, location._end_point.y)))
+            centroids.append((centroid.x, centroid.y))
+            total_lengths.append(total_length)
+            total_areas.append(wall_element.total_area)
+        return cls(elements, keys, centroids, total_lengths, total_areas)
+
+
+class SupportGeometry:
+    """
+    A snapshot of the supports of one open model, read from the API once and shared by the
+    reaction harvester, `get_column_reactions`, `get_wall_group_reactions`,
+    `update_column_stiffness` and the solve fingerprint.
+
+    The element layer parts need a mesh, so they are read on first use after mesh generation;
+    call `invalidate_elements` after regenerating the mesh. Changing column stiffnesses does
+    not move or resize supports, so the structure layer columns are kept; call `invalidate`
+    after anything that does.
+    """
+
+    def __init__(self, model: Model):
+        self.model = model
+        self._columns = None
+        self._structure_columns = None
+        self._structure_walls = None
+        self._walls = None
+
+    @property
+    def columns(self) -> ColumnGeometry:
+        if self._columns is None:
+            self._columns = ColumnGeometry.from_model(self.model)
+        return self._columns
+
+    @property
+    def structure_columns(self) -> StructureColumnGeometry:
+        if self._structure_columns is None:
+            self._structure_columns = StructureColumnGeometry.from_model(self.model)
+        return self._structure_columns
+
+    @property
+    def structure_walls(self) -> StructureWallGeometry:
+        if self._structure_walls is None:
+            self._structure_walls = StructureWallGeometry.from_model(self.model)
+        return self._structure_walls
+
+    @property
+    def walls(self) -> WallGeometry:
+        if self._walls is None:
+            self._walls = WallGeometry.from_model(self.model)
+        return self._walls
+
+    def supports(self, support_type: str) -> ColumnGeometry | WallGeometry:
+        if support_type == 'COLUMNS':
+            return self.columns
+        elif support_type == 'WALLS':
+            return self.walls
+        raise Exception('support_type must be COLUMNS or WALLS')
+
+    def invalidate_elements(self):
+        self._columns = None
+        self._walls = None
+
+    def invalidate(self):
+        self.invalidate_elements()
+        self._structure_columns = None
+        self._structure_walls = None
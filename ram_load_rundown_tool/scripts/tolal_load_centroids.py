@@ -3,37 +3,24 @@ from ram_concept.point_2D import Point2D
 from .column_reactions import ColumnReactions
 from .wall_reactions import WallReactions
 from .default_settings import SettingsDict 
+from .reaction_table import ReactionTable
+from .spatial_index import SUPPORT_MATCH_TOLERANCE
 from logging import Logger
 
 class LoadCentroid(ColumnReactions):
     pass
 
 from typing import TypedDict
-import copy
+import numpy as np
 
-def calculate_weighted_centroid(column_reactions: dict[tuple,ColumnReactions], wall_reactions: dict[tuple,WallReactions]) -> LoadCentroid:
-    total_load = 0
-    weighted_sum_x = 0
-    weighted_sum_y = 0
-        
-    for reaction in column_reactions.values():
-        load = reaction['Fz']
+def weighted_sum(column_reactions: ReactionTable, wall_reactions: ReactionTable) -> np.ndarray:
+    """(ΣFz, ΣFz·x, ΣFz·y) of the reactions, columns act at their location and wall groups at their centroid."""
+    loads = np.concatenate((column_reactions.component('Fz'), wall_reactions.component('Fz')))
+    xy = np.concatenate((column_reactions.xy, wall_reactions.xy))
+    return np.array([loads.sum(), *(loads @ xy)])
 
-        x = reaction['location']._x
-        y = reaction['location']._y
-        
-        total_load += load
-        weighted_sum_x += load * x
-        weighted_sum_y += load * y
-    
-    for reaction in wall_reactions.values():
-        load = reaction['Fz']
-        x = reaction['centroid']._x
-        y = reaction['centroid']._y
-        
-        total_load += load
-        weighted_sum_x += load * x
-        weighted_sum_y += load * y
+def centroid_from_weighted_sum(sums: np.ndarray) -> LoadCentroid:
+    total_load, weighted_sum_x, weighted_sum_y = sums
 
     if total_load == 0:
         print("Total load is zero, cannot calculate centroid")
@@ -42,7 +29,34 @@ def calculate_weighted_centroid(column_reactions: dict[tuple,ColumnReactions], w
     centroid_x = weighted_sum_x / total_load
     centroid_y = weighted_sum_y / total_load
 
-    return LoadCentroid(Fz=total_load, location = Point2D(centroid_x,centroid_y))
+    return LoadCentroid(Fz=float(total_load), location = Point2D(float(centroid_x),float(centroid_y)))
+
+def calculate_weighted_centroid(column_reactions: ReactionTable, wall_reactions: ReactionTable) -> LoadCentroid:
+    return centroid_from_weighted_sum(weighted_sum(column_reactions, wall_reactions))
+
+
+class FloorWeightedSums:
+    """
+    The weighted sums (ΣFz, ΣFz·x, ΣFz·y) of each load case of one floor.
+
+    Each load case is summed once, in O(elements), and the centroids of a floor are combinations
+    of these sums, e.g. Floor_ALL_DL is ALL_DEAD_LC - TRANSFER_DEAD, so no reactions are copied.
+    """
+
+    def __init__(self, floor_level_loads: dict):
+        self.floor_level_loads = floor_level_loads
+        self._sums = dict()
+
+    def __getitem__(self, load_case: str) -> np.ndarray:
+        if load_case not in self._sums:
+            self._sums[load_case] = weighted_sum(self.floor_level_loads['COLUMNS'][load_case], self.floor_level_loads['WALLS'][load_case])
+        return self._sums[load_case]
+
+    def centroid(self, load_case: str, less_load_case: str = None) -> LoadCentroid:
+        sums = self[load_case]
+        if less_load_case:
+            sums = sums - self[less_load_case]
+        return centroid_from_weighted_sum(sums)
 
 def weighted_centroid_of_multiple(load_centroids: list[LoadCentroid], multipliers: list[float] = None) -> LoadCentroid:
     if not multipliers:
@@ -73,13 +87,8 @@ def weighted_centroid_of_multiple(load_centroids: list[LoadCentroid], multiplier
         Fz = total_combined_load
     )
 
-def reduce_all_reactions_by_loading_reactions(all_reactions, loading_reactions):
-    copy_of_all_reactions = copy.deepcopy(all_reactions)
-
-    for location, reaction in loading_reactions.items():
-        if location in copy_of_all_reactions:
-            copy_of_all_reactions[location]['Fz'] -= reaction['Fz']
-    return copy_of_all_reactions
+def reduce_all_reactions_by_loading_reactions(all_reactions: ReactionTable, loading_reactions: ReactionTable, tolerance: float = SUPPORT_MATCH_TOLERANCE) -> ReactionTable:
+    return all_reactions.subtract(loading_reactions, components=('Fz',), tolerance=tolerance)
 
 
 class CentoidCacls(TypedDict):
@@ -120,27 +129,18 @@ def get_centroids(level_loads, current_level_filename, is_unreducible_live_load,
     EQ_LLR_factor = round_if_int(settings['EQ_FACTORS_LLR'])
     EQ_LLUR_factor = round_if_int(settings['EQ_FACTORS_LLUR'])
 
-    centroid_data['Accumulative_ALL_DL'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_DEAD_LC'], level_loads[current_level_filename]['WALLS']['ALL_DEAD_LC'])
-
-    this_all_dead_load_columns = reduce_all_reactions_by_loading_reactions(
-        level_loads[current_level_filename]['COLUMNS']['ALL_DEAD_LC'],
-        level_loads[current_level_filename]['COLUMNS']['TRANSFER_DEAD']
-    )
-    
-    this_all_dead_load_walls = reduce_all_reactions_by_loading_reactions(
-        level_loads[current_level_filename]['WALLS']['ALL_DEAD_LC'],
-        level_loads[current_level_filename]['WALLS']['TRANSFER_DEAD']
-    )
+    sums = FloorWeightedSums(level_loads[current_level_filename])
 
-    centroid_data['Floor_ALL_DL'] = calculate_weighted_centroid(this_all_dead_load_columns, this_all_dead_load_walls)
-    centroid_data['Floor_ALL_LL'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_FLOOR'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_FLOOR'])
-    centroid_data['Accumulative_ALL_LL'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS'])
+    centroid_data['Accumulative_ALL_DL'] = sums.centroid('ALL_DEAD_LC')
+    centroid_data['Floor_ALL_DL'] = sums.centroid('ALL_DEAD_LC', 'TRANSFER_DEAD')
+    centroid_data['Floor_ALL_LL'] = sums.centroid('ALL_LIVE_LOADS_FLOOR')
+    centroid_data['Accumulative_ALL_LL'] = sums.centroid('ALL_LIVE_LOADS')
     
     if is_unreducible_live_load:
-        centroid_data['Accumulative_ALL_LLR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_REDUCIBLE'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_REDUCIBLE'])
-        centroid_data['Accumulative_ALL_LLUR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_UNREDUCIBLE'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_UNREDUCIBLE'])
-        centroid_data['Floor_ALL_LLR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
-        centroid_data['Floor_ALL_LLUR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR'])
+        centroid_data['Accumulative_ALL_LLR'] = sums.centroid('ALL_LIVE_LOADS_REDUCIBLE')
+        centroid_data['Accumulative_ALL_LLUR'] = sums.centroid('ALL_LIVE_LOADS_UNREDUCIBLE')
+        centroid_data['Floor_ALL_LLR'] = sums.centroid('ALL_LIVE_LOADS_REDUCIBLE_FLOOR')
+        centroid_data['Floor_ALL_LLUR'] = sums.centroid('ALL_LIVE_LOADS_UNREDUCIBLE_FLOOR')
 
 
         # this_all_llr_columns = reduce_all_reactions_by_loading_reactions(
@@ -171,12 +171,12 @@ def get_centroids(level_loads, current_level_filename, is_unreducible_live_load,
         _factors_list = [settings['EQ_FACTORS_DL'], settings['EQ_FACTORS_LLR'], settings['EQ_FACTORS_LLUR']]
 
         centroid_data[f'Acc_{_factors}'] = weighted_centroid_of_multiple([centroid_data['Accumulative_ALL_DL'], centroid_data['Accumulative_ALL_LLR'], centroid_data['Accumulative_ALL_LLUR']],_factors_list)
-        centroid_data[f'Floor_{_factors}'] = weighted_centroid_of_multiple([centroid_data['Floor_ALL_DL'], centroid_data['Floor_ALL_LLR'], centroid_data['Floor_ALL_LLUNR']], _factors_list)
+        centroid_data[f'Floor_{_factors}'] = weighted_centroid_of_multiple([centroid_data['Floor_ALL_DL'], centroid_data['Floor_ALL_LLR'], centroid_data['Floor_ALL_LLUR']], _factors_list)
         
     else:
 
-        centroid_data['Accumulative_ALL_LLR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS'])
-        centroid_data['Floor_ALL_LLR'] = calculate_weighted_centroid(level_loads[current_level_filename]['COLUMNS']['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'], level_loads[current_level_filename]['WALLS']['ALL_LIVE_LOADS_REDUCIBLE_FLOOR'])
+        centroid_data['Accumulative_ALL_LLR'] = sums.centroid('ALL_LIVE_LOADS')
+        centroid_data['Floor_ALL_LLR'] = sums.centroid('ALL_LIVE_LOADS_REDUCIBLE_FLOOR')
 
     #   # Using the new function for walls
     #     this_all_llr_columns= reduce_all_reactions_by_loading_reactions(
@@ -0,0 +1,178 @@
+from ram_concept.model import Model
+from ram_concept.force_loading_layer import ForceLoadingLayer
+from .add_loads_to_layer import get_column_transfer_loads, get_wall_transfer_loads, add_transfer_point_load, add_transfer_line_load
+from .reaction_table import ReactionTable
+from .spatial_index import SUPPORT_MATCH_TOLERANCE, match_supports
+import numpy as np
+
+# Transfer loads are rounded to 0.1 at most, so a smaller difference is the same load
+LOAD_VALUE_TOLERANCE = 1e-6
+
+# The load values `add_transfer_point_load` and `add_transfer_line_load` write; unless the layer
+# is known to hold only loads the rundown wrote with the same load types, all of them are synced,
+# those not transferred being 0, so a load type turned off or a load edited by hand is cleared
+LOAD_COMPONENTS = ('Fx', 'Fy', 'Fz', 'Mx', 'My')
+
+
+class TransferLoadEdits:
+    """Counts of the loads a sync added, removed and edited, and of those left as they were."""
+
+    def __init__(self, added: int = 0, removed: int = 0, edited: int = 0, unchanged: int = 0, ambiguous: int = 0, unchanged_layers: int = 0):
+        self.added = added
+        self.removed = removed
+        self.edited = edited
+        self.unchanged = unchanged
+        # Supports with more than one existing load within tolerance, matched to the nearest
+        self.ambiguous = ambiguous
+        # Layers skipped without reading their loads, as their incoming transfer loads are unchanged
+        self.unchanged_layers = unchanged_layers
+
+    @property
+    def total(self) -> int:
+        return self.added + self.removed + self.edited
+
+    def __iadd__(self, other: 'TransferLoadEdits') -> 'TransferLoadEdits':
+        self.added += other.added
+        self.removed += other.removed
+        self.edited += other.edited
+        self.unchanged += other.unchanged
+        self.ambiguous += other.ambiguous
+        self.unchanged_layers += other.unchanged_layers
+        return self
+
+    def __str__(self):
+        text = f"{self.total} edits ({self.added} added, {self.removed} removed, {self.edited} edited, {self.unchanged} unchanged)"
+        if self.unchanged_layers:
+            text += f", {self.unchanged_layers} unchanged layers skipped"
+        if self.ambiguous:
+            text += f", {self.ambiguous} supports matched more than one existing load"
+        return text
+
+
+def sync_point_loads(model: Model, column_data: ReactionTable, loading_layer: ForceLoadingLayer, load_types = None, tolerance: float = SUPPORT_MATCH_TOLERANCE, is_rundown_written: bool = False) -> TransferLoadEdits:
+    """
+    Makes the point loads on `loading_layer` match the transfer loads of `column_data`.
+
+    Existing loads are matched to columns by location within `tolerance`, see `match_supports`;
+    only the load values that changed are written, columns without a load get a new one and
+    unmatched loads are deleted. The result is the same as `delete_loadings` followed by
+    `_add_column_loads`.
+
+    Every component of LOAD_COMPONENTS and the elevation are compared, unless `is_rundown_written`:
+    the layer's loads were written by the rundown with the same `load_types` (see SolveFingerprint),
+    so only the transferred components can differ and only those are read.
+    """
+    if not isinstance(column_data, ReactionTable):
+        column_data = ReactionTable.from_rows(column_data, 'COLUMNS')
+
+    rounded_loads = get_column_transfer_loads(column_data, load_types)
+
+    existing_loads = list(loading_layer.point_loads)
+    existing_xy = np.zeros((len(existing_loads), 2))
+    for j, point_load in enumerate(existing_loads):
+        location = point_load.location
+        existing_xy[j] = (location.x, location.y)
+
+    match = match_supports(column_data.xy, existing_xy, tolerance)
+    edits = TransferLoadEdits(ambiguous = len(match.ambiguous))
+
+    default_point_load = model.cad_manager.default_point_load
+    default_point_load.elevation = 0
+
+    # As add_transfer_point_load leaves a new load: zeroed, then the transferred load types
+    compared_components = [load_type for load_type, _ in rounded_loads] if is_rundown_written else LOAD_COMPONENTS
+
+    for i, (x, y) in enumerate(column_data.xy):
+        loads = [(load_type, float(values[i])) for load_type, values in rounded_loads]
+
+        if match.index[i] < 0:
+            add_transfer_point_load(loading_layer, x, y, loads)
+            edits.added += 1
+            continue
+
+        expected = dict.fromkeys(compared_components, 0.0)
+        expected.update((load_type, load) for load_type, load in loads if load_type in expected)
+
+        point_load = existing_loads[match.index[i]]
+        is_edited = False
+        for load_type, load in expected.items():
+            if abs(getattr(point_load, load_type) - load) > LOAD_VALUE_TOLERANCE:
+                setattr(point_load, load_type, load)
+                is_edited = True
+        if not is_rundown_written and point_load.elevation != 0:
+            point_load.elevation = 0
+            is_edited = True
+
+        if is_edited:
+            edits.edited += 1
+        else:
+            edits.unchanged += 1
+
+    for j in match.unused:
+        existing_loads[j].delete()
+    edits.removed += len(match.unused)
+    return edits
+
+
+def sync_line_loads(model: Model, wall_over_data: ReactionTable, loading_layer: ForceLoadingLayer, tolerance: float = SUPPORT_MATCH_TOLERANCE, is_rundown_written: bool = False) -> TransferLoadEdits:
+    """
+    Makes the line loads on `loading_layer` match the transfer loads of `wall_over_data`.
+
+    As `sync_point_loads`, with Fz the only transferred component; a line load drawn in the
+    opposite direction still matches its wall.
+    """
+    if not isinstance(wall_over_data, ReactionTable):
+        wall_over_data = ReactionTable.from_rows(wall_over_data, 'WALLS')
+
+    loads_per_length = get_wall_transfer_loads(wall_over_data)
+
+    existing_loads = list(loading_layer.line_loads)
+    existing_segments = np.zeros((len(existing_loads), 4))
+    for j, line_load in enumerate(existing_loads):
+        location = line_load.location
+        existing_segments[j] = (location.start_point.x, location.start_point.y, location.end_point.x, location.end_point.y)
+
+    match = match_supports(wall_over_data.segments, existing_segments, tolerance, allow_reversed=True)
+    edits = TransferLoadEdits(ambiguous = len(match.ambiguous))
+
+    default_line_load = model.cad_manager.default_line_load
+    default_line_load.elevation = 0
+
+    for i, (segment, load_per_length) in enumerate(zip(wall_over_data.segments, loads_per_length)):
+        if match.index[i] < 0:
+            add_transfer_line_load(model, loading_layer, segment, load_per_length)
+            edits.added += 1
+            continue
+
+        # The values add_transfer_line_load sets, in set_load_values order
+        expected = (0.0, 0.0, float(load_per_length), 0.0, 0.0)
+        compared = [('Fz', expected[2])] if is_rundown_written else zip(LOAD_COMPONENTS, expected)
+
+        line_load = existing_loads[match.index[i]]
+        is_edited = False
+        if any(abs(getattr(line_load, component) - load) > LOAD_VALUE_TOLERANCE for component, load in compared):
+            line_load.set_load_values(*expected)
+            is_edited = True
+        if not is_rundown_written and line_load.elevation != 0:
+            line_load.elevation = 0
+            is_edited = True
+
+        if is_edited:
+            edits.edited += 1
+        else:
+            edits.unchanged += 1
+
+    for j in match.unused:
+        existing_loads[j].delete()
+    edits.removed += len(match.unused)
+    return edits
+
+
+def sync_loads(model: Model, level_loads: dict[str, dict[str, dict[str, ReactionTable]]], filename, lc_name: str, support_type: str, loading_layer: ForceLoadingLayer, load_types = None, tolerance: float = SUPPORT_MATCH_TOLERANCE, is_rundown_written: bool = False) -> TransferLoadEdits:
+    """The sync counterpart of `add_loads`, for a loading layer that may already hold last run's transfer loads."""
+    if support_type == 'COLUMNS':
+        return sync_point_loads(model, level_loads[filename]['COLUMNS'][lc_name], loading_layer, load_types = load_types, tolerance = tolerance, is_rundown_written = is_rundown_written)
+    elif support_type == 'WALLS':
+        return sync_line_loads(model, level_loads[filename]['WALLS'][lc_name], loading_layer, tolerance = tolerance, is_rundown_written = is_rundown_written)
+    else:
+        raise Exception('load_type must be COLUMNS or WALLS')
@@ -41,7 +41,6 @@ ALL_DEAD_LC = All Dead LC
 ALL_LIVE_LOADS = All live loads          
 """
 
-import tkinter.messagebox as messagebox
 from .error_handling import debug_exit
 import configparser
 import time
@@ -115,6 +114,20 @@ Please create a {settings_filename} file in the same directory as this script wi
     settings["EQ_FACTORS_LLR"] = config.getfloat('EQ COMBO FACTORS', 'EQ_FACTORS_LLR', fallback=settings["EQ_FACTORS_LLR"])
     settings["EQ_FACTORS_LLUR"] = config.getfloat('EQ COMBO FACTORS', 'EQ_FACTORS_LLUR', fallback=settings["EQ_FACTORS_LLUR"])
     settings['CREATE_BACKUP_FILES'] = config.getboolean('SETTINGS', 'CREATE_BACKUP_FILES', fallback=settings["CREATE_BACKUP_FILES"])
+    settings['CONCEPT_ENGINE_POOL_SIZE'] = config.getint('SETTINGS', 'CONCEPT_ENGINE_POOL_SIZE', fallback=settings["CONCEPT_ENGINE_POOL_SIZE"])
+    settings['RECYCLE_ENGINE_AFTER_N_MODELS'] = config.getint('SETTINGS', 'RECYCLE_ENGINE_AFTER_N_MODELS', fallback=settings["RECYCLE_ENGINE_AFTER_N_MODELS"])
+    settings['SOLVE_TYPICAL_FLOORS_ONCE'] = config.getboolean('RUN CALCS', 'SOLVE_TYPICAL_FLOORS_ONCE', fallback=settings["SOLVE_TYPICAL_FLOORS_ONCE"])
+    settings['INCREMENTAL_RUNDOWN'] = config.getboolean('RUN CALCS', 'INCREMENTAL_RUNDOWN', fallback=settings["INCREMENTAL_RUNDOWN"])
+    settings['INCREMENTAL_TRANSFER_TOLERANCE'] = config.getfloat('SETTINGS', 'INCREMENTAL_TRANSFER_TOLERANCE', fallback=settings["INCREMENTAL_TRANSFER_TOLERANCE"])
+    settings['SYNC_TRANSFER_LOADS'] = config.getboolean('SETTINGS', 'SYNC_TRANSFER_LOADS', fallback=settings["SYNC_TRANSFER_LOADS"])
+    settings['SKIP_UNCHANGED_SOLVES'] = config.getboolean('RUN CALCS', 'SKIP_UNCHANGED_SOLVES', fallback=settings["SKIP_UNCHANGED_SOLVES"])
+    settings['COLUMN_STIFFNESS_TOLERANCE'] = config.getfloat('SETTINGS', 'COLUMN_STIFFNESS_TOLERANCE', fallback=settings["COLUMN_STIFFNESS_TOLERANCE"])
+    settings['COLUMN_STIFFNESS_MAX_ITERATIONS'] = config.getint('SETTINGS', 'COLUMN_STIFFNESS_MAX_ITERATIONS', fallback=settings["COLUMN_STIFFNESS_MAX_ITERATIONS"])
+    settings['SUPPORT_MATCH_TOLERANCE'] = config.getfloat('SETTINGS', 'SUPPORT_MATCH_TOLERANCE', fallback=settings["SUPPORT_MATCH_TOLERANCE"])
+    settings['STAGE_TIMING'] = config.getboolean('SETTINGS', 'STAGE_TIMING', fallback=settings["STAGE_TIMING"])
+    settings['TRACE_CONCEPT_API'] = config.getboolean('SETTINGS', 'TRACE_CONCEPT_API', fallback=settings["TRACE_CONCEPT_API"])
+    settings['RECORD_CONCEPT_SESSION'] = config.getboolean('SETTINGS', 'RECORD_CONCEPT_SESSION', fallback=settings["RECORD_CONCEPT_SESSION"])
+    settings['OPEN_CENTROID_EXCEL'] = config.getboolean('SETTINGS', 'OPEN_CENTROID_EXCEL', fallback=settings["OPEN_CENTROID_EXCEL"])
 
     _files_in = config.get('PROJECT_INPUTS', 'FILES', fallback="")
     _typicals_in = config.get('PROJECT_INPUTS', 'TYPICAL', fallback="")
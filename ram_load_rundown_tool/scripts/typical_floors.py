@@ -0,0 +1,133 @@
+from .default_settings import SettingsDict
+from .validate_inputs import get_template_has_llur
+from .reaction_table import ReactionTable, AXIAL_COMPONENTS, REACTION_COMPONENTS
+from .add_loads_to_layer import round_transfer_loads, get_wall_transfer_loads
+from .load_cases import FloorLoadCases
+
+_FZ = REACTION_COMPONENTS.index('Fz')
+_FZ_PER_M = REACTION_COMPONENTS.index('Fz_per_m')
+
+# Load cases that accumulate the loads from the floors above, mapped to the transfer
+# loadings that carry those loads into the floor.
+def get_accumulated_load_cases(settings: SettingsDict) -> dict[str, list[str]]:
+    template_has_llur = get_template_has_llur(settings)
+
+    live_transfers = ['TRANSFER_LL_REDUCIBLE', 'TRANSFER_LL_UNREDUCIBLE'] if template_has_llur else ['TRANSFER_LL_REDUCIBLE']
+
+    accumulated = {
+        'ALL_DEAD_LC': ['TRANSFER_DEAD'],
+        'ALL_LIVE_LOADS_REDUCIBLE': ['TRANSFER_LL_REDUCIBLE'],
+        'ALL_LIVE_LOADS': live_transfers,
+    }
+    if template_has_llur:
+        accumulated['ALL_LIVE_LOADS_UNREDUCIBLE'] = ['TRANSFER_LL_UNREDUCIBLE']
+    if settings['ALL_LIVE_LOADS_LC']:
+        accumulated['ALL_LIVE_LOADS_LC'] = live_transfers
+
+    return accumulated
+
+# Each transfer loading is written from this accumulated load case of the storey above, see `get_transfer_layers`
+TRANSFER_SOURCE_LOAD_CASES = {
+    'TRANSFER_DEAD': 'ALL_DEAD_LC',
+    'TRANSFER_LL_REDUCIBLE': 'ALL_LIVE_LOADS_REDUCIBLE',
+    'TRANSFER_LL_UNREDUCIBLE': 'ALL_LIVE_LOADS_UNREDUCIBLE',
+}
+
+def _own_contribution(support_loads: dict[str, ReactionTable], load_case: str, transfer_cases: list[str], tolerance: float) -> ReactionTable:
+    own = support_loads[load_case]
+    for transfer_case in transfer_cases:
+        if transfer_case in support_loads:
+            own = own.subtract(support_loads[transfer_case], components=AXIAL_COMPONENTS, tolerance=tolerance)
+    return own
+
+def _written_transfer_loads(reactions: ReactionTable) -> ReactionTable:
+    """The transfer loading the storey below receives for `reactions`, rounded as `add_loads` writes it."""
+    written = reactions.copy()
+    if reactions.support_type == 'WALLS':
+        loads_per_length = get_wall_transfer_loads(reactions)
+        written.data[:, _FZ] = loads_per_length * reactions.segment_lengths()
+        written.data[:, _FZ_PER_M] = loads_per_length
+    else:
+        written.data[:, _FZ] = round_transfer_loads(reactions.component('Fz'))
+    return written
+
+def derive_typical_level_loads(first_level_loads: dict[str, FloorLoadCases], storeys_below_first: int, settings: SettingsDict) -> dict[str, FloorLoadCases]:
+    """
+    Derives the reactions of a repeated typical floor from the first solved floor of its stack.
+
+    Every storey of a typical stack is the same CPT with the same supports, so the only thing
+    that changes from one storey to the next is the transfer load arriving from the storey
+    above: the storey above's accumulated load (its own contribution plus its transfer load),
+    rounded up as `add_loads` writes it. The transfer load cases are stepped down the stack
+    from the first storey that way, `storeys_below_first` times, and by superposition the
+    accumulated load cases are
+        first accumulated + (derived transfer - first transfer)
+    while the floor-only load cases (LLR/LLUR plans and *_FLOOR) are unchanged.
+
+    Only Fz and Fz_per_m are superposed, as in `add_sub_reactions`; moments are carried over
+    from the first storey, and the unchanged load cases share the first storey's tables.
+    Derived load cases (see `get_derived_load_cases`) are re-evaluated from the grown
+    transfer load cases, which gives the same result by superposition.
+
+    Args:
+    - first_level_loads (dict): level_loads entry of the first solved storey of the stack.
+    - storeys_below_first (int): 1 for the storey directly below the first one, and so on.
+    - settings (dict): The dictionary containing all the settings.
+
+    Returns:
+    - dict: A level_loads entry for the derived storey.
+    """
+
+    accumulated_cases = get_accumulated_load_cases(settings)
+    tolerance = settings['SUPPORT_MATCH_TOLERANCE']
+    derived_level_loads = dict()
+
+    for support_type, support_loads in first_level_loads.items():
+
+        own_contributions = {
+            load_case: _own_contribution(support_loads, load_case, transfer_cases, tolerance)
+            for load_case, transfer_cases in accumulated_cases.items()
+            if load_case in support_loads
+        }
+
+        transfer_loads = {
+            transfer_case: support_loads[transfer_case]
+            for transfer_case, source_case in TRANSFER_SOURCE_LOAD_CASES.items()
+            if transfer_case in support_loads and source_case in own_contributions
+        }
+        for _ in range(storeys_below_first):
+            transfer_loads = {
+                transfer_case: _written_transfer_loads(reactions.add(own_contributions[TRANSFER_SOURCE_LOAD_CASES[transfer_case]], AXIAL_COMPONENTS, tolerance=tolerance))
+                for transfer_case, reactions in transfer_loads.items()
+            }
+
+        grown_load_cases = dict(transfer_loads)
+        for load_case, transfer_cases in accumulated_cases.items():
+            if load_case not in own_contributions or support_loads.is_derived(load_case):
+                # Derived load cases follow the transfer load cases they are built from
+                continue
+            grown = support_loads[load_case].copy()
+            for transfer_case in transfer_cases:
+                if transfer_case in transfer_loads:
+                    grown.add_inplace(transfer_loads[transfer_case], AXIAL_COMPONENTS, tolerance=tolerance)
+                    grown.add_inplace(support_loads[transfer_case], AXIAL_COMPONENTS, factor=-1, tolerance=tolerance)
+            grown_load_cases[load_case] = grown
+
+        derived_level_loads[support_type] = support_loads.with_load_cases(grown_load_cases)
+
+    return derived_level_loads
+
+def expand_typical_files(files: list[dict]) -> list[dict]:
+    """Repeats each file dict `typical` times, tagging each repeat with its position in the stack."""
+    expanded_files = []
+    for file_dict in files:
+        typical_count = int(file_dict['typical'])
+        for typical_index in range(typical_count):
+            expanded_files.append(dict(file_dict, typical_index=typical_index, typical_count=typical_count))
+    return expanded_files
+
+def is_derived_typical_floor(file_dict: dict, settings: SettingsDict) -> bool:
+    """True for the storeys between the first and last of a typical stack, which are not solved in RAM Concept."""
+    if not settings['SOLVE_TYPICAL_FLOORS_ONCE']:
+        return False
+    return 0 < file_dict.get('typical_index', 0) < file_dict.get('typical_count', 1) - 1
@@ -1,4 +1,3 @@
-from tkinter import messagebox
 from logging import Logger
 from .default_settings import SettingsDict
 from .error_handling import debug_exit
@@ -77,6 +76,8 @@ def validate_inputs(settings: SettingsDict, logger: Logger = None):
         check_is_error(validate_number(settings['MAX_COLUMN_STIFFNESS_RATIO'], 0, 1, False, True,"Max Column Stiffness Ratio",logger=logger))
         check_is_error(validate_number(settings['MIN_COLUMN_STIFFNESS_RATIO'], 0, 1, False, True,"Min Column Stiffness Ratio",logger=logger))
         check_is_error(vaidate_max_min_column_stiffness(settings, logger = logger))
+        check_is_error(validate_number(settings['COLUMN_STIFFNESS_TOLERANCE'], 0, 1, False, True,"Column Stiffness Tolerance",logger=logger))
+        check_is_error(validate_number(settings['COLUMN_STIFFNESS_MAX_ITERATIONS'], 1, None, True, True,"Column Stiffness Max Iterations",logger=logger))
         
     
     if do_centroid:
@@ -9,6 +9,9 @@ import math
 from .geometry_fns import d2_line_to_length, centroid
 from ram_concept.force_loading_layer import ForceLoadingLayer
 from ram_concept.load_combo_layer import LoadComboLayer
+from .reaction_table import ReactionTable
+from .reaction_harvester import harvest_layers
+from .support_geometry import SupportGeometry
 
 
 class WallReactions(TypedDict):
@@ -164,44 +167,21 @@ def get_wall_reactions(model: Model, settings: SettingsDict) -> List[WallReactio
 
 #     return wall_reactions
 
-def get_wall_group_reactions(model: Model,loading_layer: ForceLoadingLayer|LoadComboLayer,self_weight_concrete_density = 0) -> List[WallReactions]:
+def get_wall_group_reactions(model: Model,loading_layer: ForceLoadingLayer|LoadComboLayer,self_weight_concrete_density = 0, geometry: SupportGeometry = None) -> ReactionTable:
     """
     Fetches the reactions for each wall group in the model.
     
     Args:
     - model (Model): The RAM Concept model.
-    - settings (dict): The dictionary containing all the settings.
+    - loading_layer: The loading or load combination layer to read.
+    - self_weight_concrete_density (float): Added to Fz for the self weight of a 3 m high wall below.
+    - geometry (SupportGeometry): The model's support snapshot, read from the model when not given.
 
     Returns:
-    - List[WallReactions]: A list of reactions for each wall group.
+    - ReactionTable: The reactions of each wall group, keyed by the end points of the wall line.
     """
 
-    cad_manager = model.cad_manager
-    element_layer = cad_manager.element_layer
-
-    wall_reactions: dict[tuple,WallReactions] = dict()
-
-    for wall_element in element_layer.wall_element_groups_below:
-        
-        Fz = loading_layer.wall_group_reaction(
-            wall_element, ReactionContext.STANDARD
-        ).z
-        
-        total_length = wall_element.total_length
-        height = 3
-        total_area = wall_element.total_area*10**-6
-        centroid = wall_element.centroid
-        reaction_anlge = wall_element.reaction_angle
-        location = wall_coordinates(centroid, reaction_anlge, total_length)
-        wall_self_weight = self_weight_concrete_density * height * total_area
-
-        Fz += wall_self_weight
+    if geometry is None:
+        geometry = SupportGeometry(model)
 
-        wall_reactions[((location._start_point.x,location._start_point.y),(location._end_point.x,location._end_point.y))] = dict(
-                location=location,
-                centroid=centroid,
-                Fz  = Fz,
-            )
-        
-    
-    return wall_reactions
\ No newline at end of file
+    return harvest_layers(geometry, 'WALLS', [('WALLS', loading_layer, self_weight_concrete_density)])['WALLS']